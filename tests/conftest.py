@@ -0,0 +1,84 @@
+import tempfile
+import time
+import sys
+import os
+
+import pytest
+
+HOU_STUB_PATH = os.path.join(os.path.dirname(__file__), "hou_stub")
+
+try:
+    import hou
+except ImportError:
+    sys.path.insert(0, HOU_STUB_PATH)
+
+    # Preferences and the library index live in the Houdini user folder, a
+    # temporary home keeps the tests away from the real one.
+    os.environ["HOME"] = tempfile.mkdtemp(prefix="vex-manager-tests-")
+
+    import hou
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PySide6 import QtWidgets
+except ImportError:
+    from PySide2 import QtWidgets
+
+
+FILE_EXTENSION = ".vfl"
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QtWidgets.QApplication:
+    app = QtWidgets.QApplication.instance()
+
+    if not app:
+        app = QtWidgets.QApplication(sys.argv[:1])
+
+    return app
+
+
+@pytest.fixture
+def wait_until(qapp):
+    def wait_until(condition, timeout: float = 5.0) -> bool:
+        end_time = time.monotonic() + timeout
+
+        while time.monotonic() < end_time:
+            qapp.processEvents()
+
+            if condition():
+                return True
+
+            time.sleep(0.005)
+
+        return condition()
+
+    return wait_until
+
+
+@pytest.fixture
+def hou_stub():
+    if not hasattr(hou, "stub"):
+        pytest.skip("Running inside Houdini.")
+
+    hou.stub.reset()
+
+    yield hou.stub
+
+    hou.stub.reset()
+
+
+@pytest.fixture
+def library_path(tmp_path) -> str:
+    library_path = tmp_path / "library"
+
+    for folder_name in ("", "points", "volumes"):
+        folder_path = library_path / folder_name
+        folder_path.mkdir(parents=True, exist_ok=True)
+
+        for i in range(3):
+            vex_file_path = folder_path / f"VEX{i + 1:02}{FILE_EXTENSION}"
+            vex_file_path.write_text(f"@P.y += {i};\n")
+
+    return str(library_path)
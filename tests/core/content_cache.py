@@ -0,0 +1,55 @@
+import time
+import os
+
+import vex_manager.core.content_cache as content_cache
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_vex_library() -> str:
+    home_path = os.path.expanduser("~")
+    folder_path = os.path.join(home_path, "vex-manager-test", "library")
+
+    os.makedirs(folder_path, exist_ok=True)
+
+    for i in range(5):
+        vex_file_path = os.path.join(folder_path, f"VEX{i + 1:02}{FILE_EXTENSION}")
+
+        if not os.path.exists(vex_file_path):
+            with open(vex_file_path, "w") as file_to_write:
+                file_to_write.write(f"@P.y += {i};")
+
+    return folder_path
+
+
+def read_vex_file() -> None:
+    folder_path = create_vex_library()
+    vex_file_path = os.path.join(folder_path, f"VEX01{FILE_EXTENSION}")
+
+    cache = content_cache.ContentCache()
+
+    start_time = time.perf_counter()
+    cache.read(vex_file_path)
+    print(f"Read from disk in {time.perf_counter() - start_time:.6f} seconds.")
+
+    start_time = time.perf_counter()
+    cache.read(vex_file_path)
+    print(f"Read from cache in {time.perf_counter() - start_time:.6f} seconds.")
+
+
+def eviction() -> None:
+    folder_path = create_vex_library()
+
+    cache = content_cache.ContentCache(max_size=64)
+
+    for file_name in sorted(os.listdir(folder_path)):
+        if file_name.endswith(FILE_EXTENSION):
+            cache.read(os.path.join(folder_path, file_name))
+
+    print(f"{len(cache)} files cached.")
+
+
+if __name__ == "__main__":
+    read_vex_file()
+    eviction()
@@ -59,8 +59,22 @@ def rename_vex_file() -> None:
     # file_manager.rename_vex_file(vex_file_path, 'VEX02')
 
 
+def save_vex_file() -> None:
+    folder_path = create_vex_library()
+    vex_file_path = os.path.join(folder_path, f"VEX03{FILE_EXTENSION}")
+
+    file_manager.save_vex_file(vex_file_path, "int a = 1;\n")
+    modified_time = os.path.getmtime(vex_file_path)
+
+    # Same content, the file is not rewritten.
+    file_manager.save_vex_file(vex_file_path, "int a = 1;\n")
+
+    print(os.path.getmtime(vex_file_path) == modified_time)
+
+
 if __name__ == "__main__":
     create_new_file()
     delete_file()
     rename_vex_file()
+    save_vex_file()
     get_vex_files()
@@ -0,0 +1,32 @@
+import os
+
+from vex_manager.core.fuzzy_matcher import FuzzyMatcher
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_fuzzy_matcher() -> FuzzyMatcher:
+    library_path = os.path.join(os.path.expanduser("~"), "vex-manager-test", "library")
+
+    file_paths = [
+        os.path.join(library_path, "points", f"scatter_points{FILE_EXTENSION}"),
+        os.path.join(library_path, "points", f"point_normals{FILE_EXTENSION}"),
+        os.path.join(library_path, "volumes", f"sdf_from_points{FILE_EXTENSION}"),
+        os.path.join(library_path, f"color_by_curvature{FILE_EXTENSION}"),
+    ]
+
+    return FuzzyMatcher(library_path, file_paths)
+
+
+def match() -> None:
+    fuzzy_matcher = create_fuzzy_matcher()
+
+    print(fuzzy_matcher.match("pts"))
+    print(fuzzy_matcher.match("ptsn"))
+    print(fuzzy_matcher.match("vol/sdf"))
+    print(fuzzy_matcher.match("curv"))
+
+
+if __name__ == "__main__":
+    match()
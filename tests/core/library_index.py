@@ -0,0 +1,58 @@
+import os
+
+import vex_manager.core.library_index as library_index
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_vex_library() -> str:
+    home_path = os.path.expanduser("~")
+    folder_path = os.path.join(home_path, "vex-manager-test", "library")
+
+    for folder_name in ("", "points", "volumes"):
+        os.makedirs(os.path.join(folder_path, folder_name), exist_ok=True)
+
+        for i in range(5):
+            vex_file_path = os.path.join(
+                folder_path, folder_name, f"VEX{i + 1:02}{FILE_EXTENSION}"
+            )
+
+            if not os.path.exists(vex_file_path):
+                with open(vex_file_path, "w") as file_to_write:
+                    file_to_write.write(f"@P.y += {i};")
+
+    return folder_path
+
+
+def update() -> None:
+    folder_path = create_vex_library()
+    index = library_index.get_library_index(folder_path)
+
+    print(f"First update {len(index.update())} changes.")
+    print(f"Second update {len(index.update())} changes.")
+
+
+def get_vex_files() -> None:
+    folder_path = create_vex_library()
+    index = library_index.get_library_index(folder_path)
+    index.update()
+
+    print(index.get_folders(folder_path))
+    print(index.get_vex_files(folder_path))
+    print(index.get_vex_files(folder_path, recursive=True))
+
+
+def find_vex_file() -> None:
+    folder_path = create_vex_library()
+    index = library_index.get_library_index(folder_path)
+    index.update()
+
+    print(index.find_vex_file(folder_path, "VEX01"))
+    print(index.get_file_record(os.path.join(folder_path, f"VEX01{FILE_EXTENSION}")))
+
+
+if __name__ == "__main__":
+    update()
+    get_vex_files()
+    find_vex_file()
@@ -0,0 +1,47 @@
+import time
+import os
+
+import vex_manager.core.library_watcher as library_watcher
+import vex_manager.core.library_index as library_index
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_vex_library() -> str:
+    home_path = os.path.expanduser("~")
+    folder_path = os.path.join(home_path, "vex-manager-test", "library")
+
+    os.makedirs(folder_path, exist_ok=True)
+
+    return folder_path
+
+
+def watch_library() -> None:
+    folder_path = create_vex_library()
+    index = library_index.get_library_index(folder_path)
+    index.add_callback(
+        lambda file_path, content: print(
+            f"{file_path!r} {'removed' if content is None else 'changed'}"
+        )
+    )
+
+    print(library_watcher.get_file_system_type(folder_path))
+
+    library_watcher.watch_library(folder_path)
+    time.sleep(1)
+
+    vex_file_path = os.path.join(folder_path, f"watched{FILE_EXTENSION}")
+
+    with open(vex_file_path, "w") as file_to_write:
+        file_to_write.write("@P.y += 1;")
+
+    time.sleep(1)
+
+    os.remove(vex_file_path)
+
+    time.sleep(1)
+
+
+if __name__ == "__main__":
+    watch_library()
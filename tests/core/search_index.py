@@ -0,0 +1,42 @@
+import os
+
+import vex_manager.core.search_index as search_index
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_vex_library() -> str:
+    home_path = os.path.expanduser("~")
+    folder_path = os.path.join(home_path, "vex-manager-test", "library")
+    os.makedirs(folder_path, exist_ok=True)
+
+    vex_codes = [
+        "int pts[] = pcfind(0, 'P', @P, 1, 10);",
+        "@Cd = set(1, 0, 0);",
+        "float dist = xyzdist(1, @P);",
+    ]
+
+    for i, vex_code in enumerate(vex_codes):
+        vex_file_path = os.path.join(folder_path, f"VEX{i + 1:02}{FILE_EXTENSION}")
+
+        with open(vex_file_path, "w") as file_to_write:
+            file_to_write.write(vex_code)
+
+    return folder_path
+
+
+def search() -> None:
+    folder_path = create_vex_library()
+
+    index = search_index.get_search_index(folder_path)
+    index.library_index.update()
+    index.build()
+
+    print(index.search("pcfind("))
+    print(index.search("@Cd"))
+    print(index.search("@P"))
+
+
+if __name__ == "__main__":
+    search()
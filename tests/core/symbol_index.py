@@ -0,0 +1,47 @@
+import os
+
+import vex_manager.core.symbol_index as symbol_index
+
+
+FILE_EXTENSION = ".vfl"
+
+
+def create_vex_library() -> str:
+    home_path = os.path.expanduser("~")
+    folder_path = os.path.join(home_path, "vex-manager-test", "library")
+    os.makedirs(folder_path, exist_ok=True)
+
+    vex_codes = [
+        "int pts[] = pcfind(0, 'P', @P, 1, 10);",
+        "v@N = normalize(v@N);\ni@id++;",
+        "float dist = xyzdist(1, @P);\n@P += v@N * dist;",
+    ]
+
+    for i, vex_code in enumerate(vex_codes):
+        vex_file_path = os.path.join(folder_path, f"VEX{i + 1:02}{FILE_EXTENSION}")
+
+        with open(vex_file_path, "w") as file_to_write:
+            file_to_write.write(vex_code)
+
+    return folder_path
+
+
+def get_symbols() -> None:
+    print(symbol_index.get_symbols("v@N = normalize(v@N); // @Cd = 1;"))
+
+
+def find_vex_files() -> None:
+    folder_path = create_vex_library()
+
+    index = symbol_index.get_symbol_index(folder_path)
+    index.library_index.update()
+    index.update()
+
+    print(index.find_vex_files(functions=["xyzdist"], attributes_written=["@P"]))
+    print(index.find_vex_files(attributes_read=["v@N"]))
+    print(index.find_vex_files(attributes_written=["i@id"]))
+
+
+if __name__ == "__main__":
+    get_symbols()
+    find_vex_files()
@@ -0,0 +1,47 @@
+import vex_manager.core.completion_trie as completion_trie
+import vex_manager.core.vex_lexer as vex_lexer
+
+
+def test_add_and_remove():
+    trie = completion_trie.CompletionTrie([("pos", "identifier")])
+
+    assert trie.get_words("p") == (("pos", "identifier"),)
+
+    # Counted, removing one of two declarations keeps the name.
+    trie.add("pos", "identifier")
+    trie.add("position", "identifier")
+    trie.remove("pos")
+
+    assert sorted(trie.get_words("p")) == [
+        ("pos", "identifier"),
+        ("position", "identifier"),
+    ]
+
+    trie.remove("pos")
+    trie.remove("position")
+
+    assert trie.get_words("p") == ()
+    assert len(trie) == 0
+    assert "pos" not in trie
+
+
+def test_vex_syntaxis_trie():
+    trie = completion_trie.get_vex_syntaxis_trie()
+
+    assert trie is completion_trie.get_vex_syntaxis_trie()
+    assert trie.get_kind("float") == vex_lexer.TYPE
+    assert trie.get_kind("foreach") == vex_lexer.KEYWORD
+    assert trie.get_kind("pointattrib") == vex_lexer.FUNCTION
+
+
+def test_get_declared_words():
+    assert completion_trie.get_declared_words(
+        "struct piece { float weight; }\nint count = i@count;\nv@P += v@N;"
+    ) == {
+        ("piece", vex_lexer.TYPE): 1,
+        ("weight", vex_lexer.IDENTIFIER): 1,
+        ("count", vex_lexer.IDENTIFIER): 1,
+        ("@count", vex_lexer.ATTRIBUTE): 1,
+        ("@P", vex_lexer.ATTRIBUTE): 1,
+        ("@N", vex_lexer.ATTRIBUTE): 1,
+    }
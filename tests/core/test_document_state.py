@@ -0,0 +1,31 @@
+import vex_manager.core.document_state as document_state
+
+
+def test_save_and_load_document_state(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+
+    assert document_state.load_document_state(file_path) is None
+    assert document_state.save_document_state(file_path, 3, 1, 20, "@P.y += 1;")
+
+    state = document_state.load_document_state(file_path)
+
+    assert state["cursor_position"] == 3
+    assert state["anchor_position"] == 1
+    assert state["scroll_value"] == 20
+    assert state["content"] == "@P.y += 1;"
+
+    document_state.remove_document_state(file_path)
+
+    assert document_state.load_document_state(file_path) is None
+
+
+def test_rename_document_state(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+    new_file_path = str(tmp_path / "VEX04.vfl")
+
+    document_state.save_document_state(file_path, 2)
+    document_state.rename_document_state(file_path, new_file_path)
+
+    assert document_state.load_document_state(file_path) is None
+    assert document_state.load_document_state(new_file_path)["content"] is None
+    assert document_state.load_document_state(new_file_path)["cursor_position"] == 2
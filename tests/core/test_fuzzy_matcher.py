@@ -0,0 +1,22 @@
+import os
+
+import vex_manager.core.fuzzy_matcher as fuzzy_matcher
+
+
+def test_match_late_name():
+    library_path = os.path.join(os.sep, "lib")
+
+    # Every path holds the query characters, the best match sorts last.
+    file_paths = [
+        os.path.join(library_path, f"a{index:04d}", f"points_to_surface_{index}.vfl")
+        for index in range(fuzzy_matcher.MAX_CANDIDATES + 500)
+    ]
+    late_file_path = os.path.join(library_path, "zz", "zz_scatter_pts.vfl")
+    file_paths.append(late_file_path)
+
+    matcher = fuzzy_matcher.FuzzyMatcher(library_path, file_paths)
+
+    assert matcher.match("pts")[0] == late_file_path
+    assert matcher.match("scatter")[0] == late_file_path
+    assert matcher.match("zz/pts") == [late_file_path]
+    assert matcher.match("a0001/pts")[0] == file_paths[1]
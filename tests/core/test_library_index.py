@@ -0,0 +1,76 @@
+import os
+
+import vex_manager.core.library_index as library_index
+
+
+def test_update(library_path):
+    index = library_index.LibraryIndex(library_path)
+
+    changes = index.update()
+
+    assert len(changes) == 9
+    assert index.update() == []
+    assert index.get_folders() == [
+        os.path.join(library_path, "points"),
+        os.path.join(library_path, "volumes"),
+    ]
+
+
+def test_update_paths(library_path):
+    index = library_index.LibraryIndex(library_path)
+    index.update()
+
+    changes = []
+    index.add_callback(lambda file_path, content: changes.append(file_path))
+
+    new_file_path = os.path.join(library_path, "points", "new.vfl")
+
+    with open(new_file_path, "w") as file_to_write:
+        file_to_write.write("@Cd = 1;")
+
+    removed_file_path = os.path.join(library_path, "VEX01.vfl")
+    os.remove(removed_file_path)
+
+    index.update_paths([new_file_path, removed_file_path])
+
+    assert sorted(changes) == sorted([new_file_path, removed_file_path])
+    assert index.exists(new_file_path)
+    assert not index.exists(removed_file_path)
+
+
+def test_find_vex_files_containing(library_path):
+    index = library_index.LibraryIndex(library_path)
+    index.update()
+
+    file_paths = index.find_vex_files_containing("+= 2")
+
+    assert [os.path.basename(file_path) for file_path in file_paths] == [
+        "VEX03.vfl",
+        "VEX03.vfl",
+        "VEX03.vfl",
+    ]
+    assert (
+        index.find_vex_files_containing("+=", limit=2)
+        == sorted(index.find_vex_files_containing("+="))[:2]
+    )
+    assert len(index.find_vex_files_containing("+=", file_ids=[1, 2, 3], limit=2)) == 2
+
+
+def test_update_file_edited_in_place(library_path):
+    index = library_index.LibraryIndex(library_path)
+    index.update()
+
+    vex_file_path = os.path.join(library_path, "points", "VEX01.vfl")
+    folder_mtime = os.stat(os.path.dirname(vex_file_path)).st_mtime
+
+    with open(vex_file_path, "w") as file_to_write:
+        file_to_write.write("int handle = pcfind(0, 'P', @P, 1, 8);")
+
+    # Saved in place, the folder keeps its mtime.
+    os.utime(os.path.dirname(vex_file_path), (folder_mtime, folder_mtime))
+    os.utime(vex_file_path, (folder_mtime + 10, folder_mtime + 10))
+
+    # Folders that did not change are skipped, the deep update finds it.
+    assert index.update() == []
+    assert index.update(deep=True) == [vex_file_path]
+    assert index.find_vex_files_containing("pcfind") == [vex_file_path]
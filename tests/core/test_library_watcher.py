@@ -0,0 +1,133 @@
+import threading
+import time
+import os
+
+import vex_manager.core.library_watcher as library_watcher
+
+
+def _wait_until(condition, timeout: float = 5.0) -> bool:
+    end_time = time.monotonic() + timeout
+
+    while time.monotonic() < end_time:
+        if condition():
+            return True
+
+        time.sleep(0.01)
+
+    return condition()
+
+
+def test_watch_library_stops_previous_watcher(tmp_path):
+    first_library_path = tmp_path / "first"
+    second_library_path = tmp_path / "second"
+    first_library_path.mkdir()
+    second_library_path.mkdir()
+
+    first_library_watcher = library_watcher.watch_library(str(first_library_path))
+
+    assert first_library_watcher.is_running()
+
+    second_library_watcher = library_watcher.watch_library(str(second_library_path))
+
+    assert _wait_until(lambda: not first_library_watcher.is_running())
+    assert second_library_watcher.is_running()
+
+    # Watched again, the stopped watcher starts over.
+    assert library_watcher.watch_library(str(first_library_path)).is_running()
+    assert _wait_until(lambda: not second_library_watcher.is_running())
+
+    first_library_watcher.stop()
+
+
+def test_start_does_not_wait_for_stopped_run(tmp_path, monkeypatch):
+    library_path = tmp_path / "library"
+    library_path.mkdir()
+
+    watcher = library_watcher.LibraryWatcher(
+        library_watcher.library_index.LibraryIndex(str(library_path))
+    )
+
+    # The first deep update of a slow network library.
+    update_event = threading.Event()
+    monkeypatch.setattr(
+        watcher.library_index, "update", lambda deep=False: update_event.wait() and []
+    )
+
+    watcher.start()
+    watcher.stop()
+
+    start_time = time.monotonic()
+    watcher.start()
+
+    assert time.monotonic() - start_time < 1.0
+    assert watcher.is_running()
+
+    watcher.stop()
+    update_event.set()
+
+    assert _wait_until(lambda: not watcher.is_running())
+
+
+class FakeInotify:
+
+    def __init__(self, stop_event: threading.Event) -> None:
+        self.stop_event = stop_event
+        # Always readable, events are only read when select says so.
+        self.file_descriptor, self.write_file_descriptor = os.pipe()
+        os.write(self.write_file_descriptor, b"\0")
+
+        self.watched_paths = []
+        self.events = [(-1, library_watcher.IN_Q_OVERFLOW, "")]
+
+    def add_watch(self, path: str, mask: int) -> int:
+        self.watched_paths.append(path)
+
+        return len(self.watched_paths)
+
+    def remove_watch(self, watch_descriptor: int) -> None:
+        pass
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        if not self.events:
+            self.stop_event.set()
+
+        events = self.events
+        self.events = []
+
+        return events
+
+    def close(self) -> None:
+        os.close(self.file_descriptor)
+        os.close(self.write_file_descriptor)
+
+
+def test_watch_overflow(tmp_path, monkeypatch):
+    library_path = tmp_path / "library"
+    library_path.mkdir()
+
+    index = library_watcher.library_index.LibraryIndex(str(library_path))
+    index.update()
+
+    watcher = library_watcher.LibraryWatcher(index)
+    stop_event = threading.Event()
+    inotify = FakeInotify(stop_event)
+    watches = library_watcher.InotifyWatches(inotify, index)
+
+    # Created while the events were dropped.
+    new_folder_path = library_path / "points"
+    new_folder_path.mkdir()
+
+    assert watcher._watch(watches, stop_event)
+    assert str(new_folder_path) in inotify.watched_paths
+
+    # An index that can not be updated does not stop the watch.
+    def update(deep: bool = False) -> list[str]:
+        raise OSError("Stale file handle")
+
+    monkeypatch.setattr(index, "update", update)
+    inotify.events = [(-1, library_watcher.IN_Q_OVERFLOW, "")]
+    stop_event.clear()
+
+    assert watcher._watch(watches, stop_event)
+
+    watches.close()
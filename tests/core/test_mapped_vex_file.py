@@ -0,0 +1,62 @@
+import vex_manager.core.mapped_vex_file as mapped_vex_file
+
+
+def _write_lines(tmp_path, lines):
+    file_path = tmp_path / "generated.vfl"
+    file_path.write_text("\n".join(lines))
+
+    return str(file_path)
+
+
+def test_get_lines(tmp_path):
+    lines = [f"float value{i} = {i};" for i in range(1000)]
+    file_path = _write_lines(tmp_path, lines)
+
+    vex_file = mapped_vex_file.MappedVEXFile(file_path)
+
+    assert vex_file.open()
+
+    vex_file.build_index()
+
+    assert vex_file.is_indexed
+    assert vex_file.line_count == 1000
+    assert [text for text, _ in vex_file.get_lines(0, 3)] == lines[:3]
+    assert [text for text, _ in vex_file.get_lines(998, 10)] == lines[998:]
+    assert vex_file.get_lines(1000, 1) == []
+    assert vex_file.get_text(130, 131) == "\n".join(lines[130:132])
+
+    vex_file.close()
+
+
+def test_get_lines_states(tmp_path):
+    # The comment opened above the indexed line is still open below it.
+    lines = ["/*"] + ["comment"] * 100 + ["*/", "int i = 0;"]
+    file_path = _write_lines(tmp_path, lines)
+
+    vex_file = mapped_vex_file.MappedVEXFile(file_path)
+    vex_file.open()
+    vex_file.build_index()
+
+    (_, comment_state), (_, end_state), (_, default_state) = vex_file.get_lines(100, 3)
+
+    assert comment_state == end_state != default_state
+
+    vex_file.close()
+
+
+def test_long_line(tmp_path):
+    file_path = _write_lines(tmp_path, ["1," * mapped_vex_file.MAX_LINE_LENGTH])
+
+    vex_file = mapped_vex_file.MappedVEXFile(file_path)
+    vex_file.open()
+    vex_file.build_index()
+
+    text, _ = vex_file.get_lines(0, 1)[0]
+
+    assert text.endswith(f"({2 * mapped_vex_file.MAX_LINE_LENGTH} bytes)")
+
+    vex_file.close()
+
+
+def test_open_missing_file(tmp_path):
+    assert mapped_vex_file.open_mapped_vex_file(str(tmp_path / "missing.vfl")) is None
@@ -0,0 +1,56 @@
+import json
+
+import vex_manager.core.node_type_registry as node_type_registry
+
+
+def test_wrangle_snippet_parm(hou_stub):
+    registry = node_type_registry.NodeTypeRegistry()
+
+    assert registry.get_snippet_parm_name(hou_stub.create_wrangle_node()) == "snippet"
+    assert registry.get_snippet_parm_name(hou_stub.create_wrangle_node("snippet")) == (
+        "code"
+    )
+
+
+def test_discover_hda_snippet_parm(hou_stub):
+    registry = node_type_registry.NodeTypeRegistry()
+
+    node = hou_stub.create_wrangle_node("studio::deformer::1.0")
+    node.addParm("label", "")
+    node.addParm("vex_code", "", {"editor": "1", "editorlang": "VEX"})
+
+    assert registry.is_vex_node(node)
+    assert registry.get_snippet_parm(node).name() == "vex_code"
+
+
+def test_memoized_per_node_type(hou_stub):
+    registry = node_type_registry.NodeTypeRegistry()
+
+    node = hou_stub.create_wrangle_node("studio::mover::1.0")
+    other_node = hou_stub.create_wrangle_node("studio::mover::1.0")
+
+    assert not registry.is_vex_node(node)
+
+    # Looked for on the first node of the type only.
+    other_node.addParm("code", "", {"editorlang": "vex"})
+
+    assert not registry.is_vex_node(other_node)
+    assert registry.get_snippet_parm(other_node) is None
+
+
+def test_load(hou_stub, tmp_path):
+    config_path = tmp_path / "vexmanagernodetypes.json"
+    config_path.write_text(
+        json.dumps({"studio::scatter::2.0": "vex", "attribwrangle": ""})
+    )
+
+    registry = node_type_registry.NodeTypeRegistry()
+
+    node = hou_stub.create_wrangle_node("studio::scatter::2.0")
+    node.addParm("vex", "")
+
+    assert registry.load(str(config_path))
+    assert registry.get_snippet_parm(node).name() == "vex"
+    assert not registry.is_vex_node(hou_stub.create_wrangle_node())
+
+    assert not registry.load(str(tmp_path / "missing.json"))
@@ -0,0 +1,118 @@
+import subprocess
+import json
+import sys
+import os
+
+import vex_manager.core.recovery_journal as recovery_journal
+import vex_manager.core.document_state as document_state
+
+
+def test_get_delta():
+    assert recovery_journal.get_delta("@P.y += 1;", "@P.y += 2;") == (8, 1, "2")
+    assert recovery_journal.get_delta("aaa", "aaaa") == (3, 0, "a")
+    assert recovery_journal.get_delta("abc", "") == (0, 3, "")
+
+
+def test_write_and_read(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+    journal_path = recovery_journal.get_recovery_journal_path(file_path)
+
+    journal = recovery_journal.RecoveryJournal(file_path)
+
+    for text in ("@P.y += 1;", "@P.y += 10;", "int i;\n@P.y += 10;", "int i;"):
+        assert journal.write(text)
+
+    # The owner, a snapshot and three deltas.
+    with open(journal_path) as file_for_read:
+        assert len(file_for_read.read().splitlines()) == 5
+
+    assert journal_path in recovery_journal.get_recovery_journal_paths()
+    assert recovery_journal.read_recovery_journal(journal_path) == (
+        os.path.normpath(file_path),
+        "int i;",
+    )
+
+    journal.remove()
+
+    assert not os.path.exists(journal_path)
+
+
+def test_read_cut_journal(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+    journal_path = recovery_journal.get_recovery_journal_path(file_path)
+
+    journal = recovery_journal.RecoveryJournal(file_path)
+    journal.write("@P.y += 1;")
+    journal.write("@P.y += 12;")
+
+    with open(journal_path, "a") as file_to_write:
+        file_to_write.write('[3, 1, "')
+
+    assert recovery_journal.read_recovery_journal(journal_path)[1] == "@P.y += 12;"
+
+    journal.remove()
+
+
+def test_restore_recovery_journal(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+    journal_path = recovery_journal.get_recovery_journal_path(file_path)
+
+    recovery_journal.RecoveryJournal(file_path).write("@Cd = 1;")
+
+    assert recovery_journal.restore_recovery_journal(journal_path) == file_path
+    assert not os.path.exists(journal_path)
+    assert document_state.load_document_state(file_path)["content"] == "@Cd = 1;"
+
+    document_state.remove_document_state(file_path)
+
+
+def test_orphaned_recovery_journals(tmp_path):
+    file_path = str(tmp_path / "VEX01.vfl")
+    journal_path = recovery_journal.get_recovery_journal_path(file_path)
+
+    journal = recovery_journal.RecoveryJournal(file_path)
+    journal.write("@Cd = 1;")
+
+    # Journals of this session and of sessions still running are live.
+    host_name, pid = recovery_journal.get_owner()
+
+    assert recovery_journal.read_recovery_journal_owner(journal_path) == (
+        host_name,
+        pid,
+    )
+    assert recovery_journal.get_orphaned_recovery_journal_paths() == []
+
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+
+    with open(journal_path) as file_for_read:
+        lines = file_for_read.read().splitlines()
+
+    orphaned_journal_path = os.path.join(
+        os.path.dirname(journal_path), f"orphaned{recovery_journal.JOURNAL_EXTENSION}"
+    )
+    other_host_journal_path = os.path.join(
+        os.path.dirname(journal_path), f"other{recovery_journal.JOURNAL_EXTENSION}"
+    )
+
+    for path, owner in (
+        (orphaned_journal_path, {"host_name": host_name, "pid": process.pid}),
+        (other_host_journal_path, {"host_name": f"{host_name}-other", "pid": 1}),
+    ):
+        header = json.loads(lines[0])
+        header.update(owner)
+
+        with open(path, "w") as file_to_write:
+            file_to_write.write("\n".join([json.dumps(header)] + lines[1:]))
+
+    assert not recovery_journal.is_process_running(process.pid)
+    assert recovery_journal.get_orphaned_recovery_journal_paths() == [
+        orphaned_journal_path
+    ]
+    assert recovery_journal.read_recovery_journal(orphaned_journal_path)[1] == (
+        "@Cd = 1;"
+    )
+
+    journal.remove()
+    recovery_journal.remove_recovery_journal(orphaned_journal_path)
+    recovery_journal.remove_recovery_journal(other_host_journal_path)
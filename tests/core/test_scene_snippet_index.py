@@ -0,0 +1,87 @@
+import hou
+
+import vex_manager.core.scene_snippet_index as scene_snippet_index
+
+
+def test_normalize_vex_code():
+    assert scene_snippet_index.normalize_vex_code(
+        "// Lift.\n@P.y  +=\n\t1; /* up */\n"
+    ) == scene_snippet_index.normalize_vex_code("@P.y += 1;")
+    assert scene_snippet_index.normalize_vex_code(
+        's = "//";'
+    ) != scene_snippet_index.normalize_vex_code('s = "";')
+    assert scene_snippet_index.normalize_vex_code("// Nothing.\n") == ""
+
+
+def test_find_nodes(hou_stub):
+    node = hou_stub.create_wrangle_node(snippet="// Lift.\n@P.y += 1;")
+    other_node = hou_stub.create_wrangle_node(snippet="@Cd = 0;\n\n@P.y += 1;")
+    hou_stub.create_wrangle_node(snippet="@P.y += 10;")
+    hou.node("/obj").createNode("geo")
+
+    index = scene_snippet_index.SceneSnippetIndex()
+
+    assert index.find_nodes("@P.y += 1;") == [node]
+    assert index.find_nodes("@P.y += 1;", inserted=True) == [node, other_node]
+    assert index.find_nodes("@Cd = 0;", inserted=True) == [other_node]
+    assert index.find_nodes("@Cd = 1;", inserted=True) == []
+
+    index.clear()
+
+
+def test_node_events(hou_stub):
+    node = hou_stub.create_wrangle_node(snippet="@P.y += 1;")
+
+    index = scene_snippet_index.SceneSnippetIndex()
+
+    assert index.find_nodes("@P.y += 1;") == [node]
+
+    # Edited, created and deleted without building the index again.
+    node.parm("snippet").set("@P.y += 2;")
+    new_node = hou_stub.create_wrangle_node("volumewrangle", "@P.y += 1;")
+    other_node = node.parent().createNode("attribwrangle")
+    other_node.parm("snippet").set("@P.y += 2;")
+
+    assert index.find_nodes("@P.y += 1;") == [new_node]
+    assert index.find_nodes("@P.y += 2;") == [node, other_node]
+
+    new_node.parent().destroy()
+
+    assert index.find_nodes("@P.y += 1;") == []
+    assert not any(
+        network_node.sessionId() in index._networks
+        for network_node in (new_node, new_node.parent())
+    )
+
+    index.clear()
+
+
+def test_expression_snippet(hou_stub):
+    # An HDA promoting the snippet parm of the wrangle it wraps.
+    geometry_node = hou.node("/obj").createNode("geo")
+    hda_node = geometry_node.createNode("studio::lifter::1.0")
+    hda_node.addParm("snippet", "@P.y += 1;", {"editorlang": "vex"})
+    node = hda_node.createNode("attribwrangle")
+    node.parm("snippet").setExpression('chs("../snippet")')
+
+    index = scene_snippet_index.SceneSnippetIndex()
+
+    assert index.find_nodes("@P.y += 1;") == [hda_node, node]
+
+    hda_node.parm("snippet").set("@P.y += 2;")
+
+    assert index.find_nodes("@P.y += 2;") == [hda_node, node]
+
+    index.clear()
+
+
+def test_select_nodes_using_vex_code(hou_stub):
+    node = hou_stub.create_wrangle_node(snippet="@P.y += 1;")
+    hou_stub.create_wrangle_node(snippet="@P.y += 2;").setSelected(True)
+
+    assert scene_snippet_index.select_nodes_using_vex_code("@P.y += 1;") == 1
+    assert hou.selectedNodes() == (node,)
+
+    hou.hipFile.clear()
+
+    assert not scene_snippet_index.get_scene_snippet_index().is_built
@@ -0,0 +1,93 @@
+import zipfile
+import os
+
+import vex_manager.core.signature_index as signature_index
+
+POINT_HELP = '''\
+= point =
+
+#type: vex
+#context: all
+
+"""Reads a point attribute
+value from a geometry."""
+
+:usage: `<type> point(<geometry>geometry, string attribute_name, int pointnumber)`
+:usage: `<type>[] point(<geometry>geometry, string attribute_name, int pointnumber)`
+'''
+
+FIT_HELP = '''\
+= fit =
+
+"""Takes the value in one range and shifts it to the corresponding value in a new range."""
+
+:usage: `float fit(float value, float omin, float omax, float nmin, float nmax)`
+'''
+
+
+def create_help_archive(folder_path: str) -> str:
+    help_path = os.path.join(folder_path, "vex.zip")
+
+    with zipfile.ZipFile(help_path, "w") as help_archive:
+        help_archive.writestr("functions/point.txt", POINT_HELP)
+        help_archive.writestr("functions/fit.txt", FIT_HELP)
+        help_archive.writestr("functions/_index.txt", "= Functions =")
+        help_archive.writestr("contexts/cvex.txt", '"""Not a function."""')
+
+    return help_path
+
+
+def test_parse_function_help():
+    assert signature_index.parse_function_help(POINT_HELP) == (
+        "Reads a point attribute value from a geometry.",
+        (
+            "<type> point(<geometry>geometry, string attribute_name, int pointnumber)",
+            "<type>[] point(<geometry>geometry, string attribute_name, int pointnumber)",
+        ),
+    )
+
+
+def test_get_signature(tmp_path):
+    help_path = create_help_archive(str(tmp_path))
+    index_path = str(tmp_path / "signatures.idx")
+
+    assert signature_index.build_signature_index(help_path, index_path) == 2
+
+    index = signature_index.SignatureIndex(index_path)
+
+    assert len(index) == 2
+    assert index.get_signature("fit") == (
+        "Takes the value in one range and shifts it to the corresponding value "
+        "in a new range.",
+        ("float fit(float value, float omin, float omax, float nmin, float nmax)",),
+    )
+    assert "point" in index
+    assert "cvex" not in index
+    assert index.get_signature("fi") is None
+
+    index.close()
+
+
+def test_build_when_stale(tmp_path):
+    help_path = create_help_archive(str(tmp_path))
+    index_path = str(tmp_path / "signatures.idx")
+
+    index = signature_index.SignatureIndex(index_path, help_path)
+
+    assert "fit" not in index
+
+    index.build()
+
+    assert "fit" in index
+
+    index.close()
+
+
+def test_invalid_index(tmp_path):
+    index_path = tmp_path / "signatures.idx"
+    index_path.write_bytes(b"not an index")
+
+    index = signature_index.SignatureIndex(str(index_path))
+
+    assert index.get_signature("fit") is None
+    assert len(index) == 0
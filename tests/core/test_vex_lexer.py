@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import os
+
+import pytest
+
+import vex_manager.core.vex_lexer as vex_lexer
+
+
+def get_tokens(vex_code: str, state: int = vex_lexer.DEFAULT_STATE) -> list:
+    tokens, _ = vex_lexer.tokenize(vex_code, state)
+
+    return [(vex_code[start : start + length], kind) for start, length, kind in tokens]
+
+
+def test_tokenize():
+    assert get_tokens("vector n = normalize(v@N) * 2.5e-1;") == [
+        ("vector", vex_lexer.TYPE),
+        ("n", vex_lexer.IDENTIFIER),
+        ("=", vex_lexer.OPERATOR),
+        ("normalize", vex_lexer.FUNCTION),
+        ("(", vex_lexer.PUNCTUATION),
+        ("v@N", vex_lexer.ATTRIBUTE),
+        (")", vex_lexer.PUNCTUATION),
+        ("*", vex_lexer.OPERATOR),
+        ("2.5e-1", vex_lexer.NUMBER),
+        (";", vex_lexer.PUNCTUATION),
+    ]
+
+
+@pytest.mark.parametrize(
+    "vex_code, expected_tokens",
+    [
+        ('s@name = "// @P";', [("s@name", "attribute"), ("=", "operator")]),
+        ("i[]@pts += 1;", [("i[]@pts", "attribute"), ("+=", "operator")]),
+        ("@P-1", [("@P", "attribute"), ("-", "operator"), ("1", "number")]),
+        ("// if (@P)", [("// if (@P)", "comment")]),
+    ],
+)
+def test_token_boundaries(vex_code, expected_tokens):
+    assert get_tokens(vex_code)[: len(expected_tokens)] == expected_tokens
+
+
+def test_resume_from_state():
+    vex_code = "int a; /* one\ntwo @P\nthree */ if"
+
+    tokens, state = vex_lexer.tokenize(vex_code)
+
+    assert state == vex_lexer.DEFAULT_STATE
+
+    # Lexing line by line from the saved states gives the same tokens.
+    lines = list(vex_lexer.iter_lines(vex_code))
+
+    assert [state for _, _, state in lines] == [
+        vex_lexer.MULTI_LINE_COMMENT_STATE,
+        vex_lexer.MULTI_LINE_COMMENT_STATE,
+        vex_lexer.DEFAULT_STATE,
+    ]
+    assert get_tokens("two @P", vex_lexer.MULTI_LINE_COMMENT_STATE) == [
+        ("two @P", vex_lexer.MULTI_LINE_COMMENT)
+    ]
+    assert get_tokens("three */ if", vex_lexer.MULTI_LINE_COMMENT_STATE) == [
+        ("three */", vex_lexer.MULTI_LINE_COMMENT),
+        ("if", vex_lexer.KEYWORD),
+    ]
+    assert len(tokens) == 5
+
+
+def test_import_without_qt_and_hou():
+    # Batch tools import the lexer and parser outside of Houdini.
+    code = (
+        "import sys\n"
+        "for name in ('hou', 'PySide2', 'PySide6'):\n"
+        "    sys.modules[name] = None\n"
+        "import vex_manager.core as core\n"
+        "print(len(core.parse('int a = 1;').children))\n"
+    )
+
+    root_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root_path,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=root_path),
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "1"
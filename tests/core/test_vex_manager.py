@@ -0,0 +1,86 @@
+import hou
+
+import vex_manager.core as core
+
+
+def test_replace_code(hou_stub):
+    node = hou_stub.create_wrangle_node(snippet="@P.y = 0;")
+    node.setSelected(True)
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;")
+
+    assert node.parm("snippet").eval() == "@P.y += 1;"
+
+
+def test_insert_code(hou_stub):
+    node = hou_stub.create_wrangle_node(snippet="@P.y = 0;")
+    node.setSelected(True)
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;", insert=True)
+
+    assert node.parm("snippet").eval() == "@P.y = 0;\n\n@P.y += 1;"
+
+
+def test_snippet_node_code_parm(hou_stub):
+    node = hou_stub.create_wrangle_node("snippet")
+    node.setSelected(True)
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;")
+
+    assert node.parm("code").eval() == "@P.y += 1;"
+
+
+def test_last_selected_node(hou_stub):
+    first_node = hou_stub.create_wrangle_node()
+    last_node = hou_stub.create_wrangle_node()
+    first_node.setSelected(True)
+    last_node.setSelected(True)
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;")
+
+    assert first_node.parm("snippet").eval() == ""
+    assert last_node.parm("snippet").eval() == "@P.y += 1;"
+
+
+def test_not_a_wrangle_node(hou_stub):
+    node = hou.node("/obj").createNode("geo")
+    node.setSelected(True)
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;")
+
+    assert hou_stub.parm_set_count == 0
+
+
+def test_no_selected_node(hou_stub):
+    node = hou_stub.create_wrangle_node()
+
+    core.set_vex_code_in_selected_wrangle_node("@P.y += 1;")
+
+    assert node.parm("snippet").eval() == ""
+
+
+def test_apply_to_selected_nodes(hou_stub):
+    nodes = [hou_stub.create_wrangle_node(snippet="@P.y = 0;") for i in range(3)]
+    geometry_node = hou.node("/obj").createNode("geo")
+
+    for node in nodes + [geometry_node]:
+        node.setSelected(True)
+
+    count = core.set_vex_code_in_selected_wrangle_nodes("@P.y += 1;", insert=True)
+
+    assert count == 3
+    assert hou_stub.undo_groups == ["VEX Manager: Apply Code"]
+
+    for node in nodes:
+        assert node.parm("snippet").eval() == "@P.y = 0;\n\n@P.y += 1;"
+
+
+def test_apply_to_nodes(hou_stub):
+    nodes = [
+        hou_stub.create_wrangle_node(node_type_name)
+        for node_type_name in ("attribwrangle", "snippet", "volumewrangle")
+    ]
+
+    assert core.set_vex_code_in_wrangle_nodes(nodes, "@P.y += 1;") == 3
+    assert nodes[1].parm("code").eval() == "@P.y += 1;"
+    assert len(hou_stub.undo_groups) == 1
@@ -0,0 +1,115 @@
+import vex_manager.core.vex_outline_table as vex_outline_table
+import vex_manager.core.vex_parser as vex_parser
+
+VEX_CODE = """\
+struct piece {
+    float weight;
+};
+
+piece make(float weight) {
+    piece result = piece(weight);
+
+    return result;
+}
+
+/* int hidden() {
+} */
+int total = 0;
+
+foreach (int pt; array(1, 2)) {
+    if (pt) {
+        total += pt;
+    }
+}
+"""
+
+
+def get_outline(item: vex_parser.VEXOutlineItem) -> list[tuple]:
+    return [
+        (child.kind, child.type_name, child.name, child.line, get_outline(child))
+        for child in item.children
+    ]
+
+
+def get_parsed_outline(vex_code: str) -> list[tuple]:
+    # The outline of the whole text parsed at once, without declarations,
+    # attributes and plain scopes.
+    def get_items(item: vex_parser.VEXOutlineItem) -> list[tuple]:
+        items = []
+
+        for child in item.children:
+            if child.kind not in vex_outline_table.OUTLINE_KINDS:
+                continue
+
+            if child.kind == vex_parser.BLOCK and not child.name:
+                items.extend(get_items(child))
+            else:
+                items.append(
+                    (
+                        child.kind,
+                        child.type_name,
+                        child.name,
+                        child.line,
+                        get_items(child),
+                    )
+                )
+
+        return items
+
+    return get_items(vex_parser.parse(vex_code))
+
+
+def test_update():
+    outline_table = vex_outline_table.VEXOutlineTable()
+
+    assert get_outline(outline_table.update(VEX_CODE)) == [
+        ("struct", "", "piece", 1, []),
+        ("function", "piece", "make", 5, []),
+        ("block", "", "foreach", 15, [("block", "", "if", 16, [])]),
+    ]
+
+
+def test_update_after_edits():
+    outline_table = vex_outline_table.VEXOutlineTable()
+    vex_code = "".join(
+        VEX_CODE.replace("piece", f"piece{i}").replace("make", f"make{i}")
+        for i in range(40)
+    )
+
+    outline_table.update(vex_code)
+
+    for position in (0, len(vex_code) // 3, len(vex_code) // 2, len(vex_code)):
+        vex_code = f"{vex_code[:position]}\nvoid f() {{\n}}\n{vex_code[position:]}"
+
+        assert get_outline(outline_table.update(vex_code)) == get_parsed_outline(
+            vex_code
+        )
+
+    vex_code = vex_code.replace("/* int hidden", "int hidden", 1)
+
+    assert get_outline(outline_table.update(vex_code)) == get_parsed_outline(vex_code)
+
+
+def test_update_reuses_segments():
+    outline_table = vex_outline_table.VEXOutlineTable()
+    vex_code = "".join(f"int f{i}() {{\n    return {i};\n}}\n" for i in range(100))
+
+    outline_table.update(vex_code)
+    segments = dict(outline_table._segments)
+
+    outline_table.update(f"int g() {{\n}}\n{vex_code}")
+
+    assert len(outline_table._segments) == len(segments) + 1
+    assert all(
+        outline_table._segments[key] is segment for key, segment in segments.items()
+    )
+
+
+def test_item_positions():
+    outline_table = vex_outline_table.VEXOutlineTable()
+    vex_code = f"int a = 1;\n{VEX_CODE}"
+    item = outline_table.update(vex_code).children[1]
+
+    assert vex_code[item.start : item.end].startswith("piece make")
+    assert vex_code[item.start : item.end].endswith("}")
+    assert item.end_line == 10
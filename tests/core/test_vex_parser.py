@@ -0,0 +1,108 @@
+import pytest
+
+import vex_manager.core.vex_parser as vex_parser
+
+VEX_CODE = """\
+struct piece {
+    float weight = 1, scale;
+}
+
+function vector[] offsets(int count; float radius) {
+    vector result[];
+
+    for (int i = 0; i < count; i++) {
+        append(result, set(radius, 0, 0));
+    }
+
+    return result;
+}
+
+int pts[] = {1, 2}, total = len(pts);
+
+foreach (int pt; pts) {
+    v@Cd = point(0, "Cd", pt);
+    i[]@neighbours[0] = pt;
+}
+"""
+
+
+def get_outline(item: vex_parser.VEXOutlineItem) -> list[tuple]:
+    return [
+        (child.kind, child.type_name, child.name, child.line, get_outline(child))
+        for child in item.children
+    ]
+
+
+def test_parse():
+    assert get_outline(vex_parser.parse(VEX_CODE)) == [
+        (
+            "struct",
+            "",
+            "piece",
+            1,
+            [
+                ("declaration", "float", "weight", 2, []),
+                ("declaration", "float", "scale", 2, []),
+            ],
+        ),
+        (
+            "function",
+            "vector[]",
+            "offsets",
+            5,
+            [
+                ("declaration", "int", "count", 5, []),
+                ("declaration", "float", "radius", 5, []),
+                ("declaration", "vector", "result", 6, []),
+                ("block", "", "for", 8, [("declaration", "int", "i", 8, [])]),
+            ],
+        ),
+        ("declaration", "int", "pts", 15, []),
+        ("declaration", "int", "total", 15, []),
+        (
+            "block",
+            "",
+            "foreach",
+            17,
+            [
+                ("declaration", "int", "pt", 17, []),
+                ("attribute_write", "vector", "Cd", 18, []),
+                ("attribute_write", "int[]", "neighbours", 19, []),
+            ],
+        ),
+    ]
+
+
+def test_block_lines():
+    root = vex_parser.parse(VEX_CODE)
+    (function,) = [item for item in root.walk() if item.kind == "function"]
+
+    assert (function.line, function.end_line) == (5, 13)
+
+
+def test_attribute_types():
+    root = vex_parser.parse("@P.y += @pscale; f@mass = 1; @group_a = s@name == '';")
+
+    assert {(item.kind, item.name, item.type_name) for item in root.walk()} == {
+        ("attribute_write", "P", "vector"),
+        ("attribute_read", "pscale", "float"),
+        ("attribute_write", "mass", "float"),
+        ("attribute_write", "group_a", "int"),
+        ("attribute_read", "name", "string"),
+    }
+
+
+@pytest.mark.parametrize(
+    "vex_code, expected_call",
+    [
+        ("fit(x, 0, 1", ("fit", 2)),
+        ('v@P = point(0, "P, ", ', ("point", 2)),
+        ("f(a(b, c), ", ("f", 1)),
+        ("if (len(a", ("len", 0)),
+        ("fit(x) + 1", ("", 0)),
+        ("fit(x, // 0, 1", ("", 0)),
+        ("for (int i = 0; i < ", ("", 0)),
+    ],
+)
+def test_get_call_argument(vex_code, expected_call):
+    assert vex_parser.get_call_argument(vex_code) == expected_call
@@ -0,0 +1,25 @@
+from PySide2 import QtWidgets
+
+import sys
+import os
+
+from vex_manager.gui.library_tree_model import LibraryTreeModel
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+
+    library_path = os.path.join(os.path.expanduser("~"), "vex-manager-test")
+
+    library_tree_model = LibraryTreeModel()
+    library_tree_model.set_library_path(library_path)
+
+    tree_view = QtWidgets.QTreeView()
+    tree_view.setModel(library_tree_model)
+    tree_view.show()
+
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+from PySide2 import QtWidgets
+
+import sys
+
+from vex_manager.gui.quick_open_ui import QuickOpenUI
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+
+    QuickOpenUI.display()
+
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+
+from vex_manager.gui.file_explorer_widget import FileExplorerWidget
+
+
+def get_search_results(file_explorer_widget: FileExplorerWidget) -> list[str]:
+    list_widget = file_explorer_widget.search_results_list_widget
+
+    return [list_widget.item(row).text() for row in range(list_widget.count())]
+
+
+def test_search(qapp, wait_until, library_path):
+    file_explorer_widget = FileExplorerWidget()
+    file_explorer_widget.set_library_path(library_path)
+
+    # Too short to search, nothing is read.
+    file_explorer_widget.search_line_edit.setText("+=")
+
+    assert get_search_results(file_explorer_widget) == ["Type at least 3 characters"]
+
+    file_explorer_widget.search_line_edit.setText("+= 2")
+
+    assert wait_until(
+        lambda: get_search_results(file_explorer_widget)
+        == [
+            "VEX03.vfl",
+            os.path.join("points", "VEX03.vfl"),
+            os.path.join("volumes", "VEX03.vfl"),
+        ]
+    )
@@ -0,0 +1,49 @@
+try:
+    from PySide6 import QtCore
+except ImportError:
+    from PySide2 import QtCore
+
+import os
+
+from vex_manager.gui.library_tree_model import LibraryTreeModel
+import vex_manager.core as core
+
+
+def get_names(library_tree_model: LibraryTreeModel) -> list[str]:
+    return [
+        library_tree_model.index(row, 0).data()
+        for row in range(library_tree_model.rowCount())
+    ]
+
+
+def test_file_operations(qapp, wait_until, library_path):
+    library_tree_model = LibraryTreeModel()
+    library_tree_model.set_library_path(library_path)
+
+    # Listed once the library is found to exist, away from the GUI thread.
+    assert wait_until(
+        lambda: get_names(library_tree_model)
+        == ["points", "volumes", "VEX01.vfl", "VEX02.vfl", "VEX03.vfl"]
+    )
+
+    folder_path = os.path.join(library_path, "lines")
+    library_tree_model.mkdir(QtCore.QModelIndex(), "lines")
+
+    assert wait_until(lambda: library_tree_model.index_from_path(folder_path).isValid())
+    assert os.path.isdir(folder_path)
+    assert core.get_library_index(library_path).exists(folder_path)
+
+    file_path = os.path.join(library_path, "VEX01.vfl")
+    library_tree_model.remove(library_tree_model.index_from_path(file_path))
+    library_tree_model.remove(library_tree_model.index_from_path(folder_path))
+
+    assert wait_until(
+        lambda: get_names(library_tree_model)
+        == ["points", "volumes", "VEX02.vfl", "VEX03.vfl"]
+    )
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(folder_path)
+
+    library_tree_model.set_library_path(os.path.join(library_path, "missing"))
+
+    assert wait_until(lambda: not library_tree_model.hasChildren())
@@ -0,0 +1,36 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+from vex_manager.gui.quick_open_ui import QuickOpenUI
+import vex_manager.core as core
+
+
+def press_return(widget: QtWidgets.QWidget, modifiers=QtCore.Qt.NoModifier) -> None:
+    event = QtGui.QKeyEvent(QtCore.QEvent.KeyPress, QtCore.Qt.Key_Return, modifiers)
+    QtWidgets.QApplication.sendEvent(widget, event)
+
+
+def test_apply_keys(qapp, hou_stub, library_path):
+    node = hou_stub.create_wrangle_node(snippet="@P.y = 0;")
+    node.setSelected(True)
+
+    core.get_library_index(library_path).update(deep=True)
+
+    quick_open_ui = QuickOpenUI()
+    quick_open_ui._set_library_path(library_path)
+    quick_open_ui.search_line_edit.setText("VEX01")
+
+    # Enter alone replaces the code, Shift+Enter inserts it.
+    press_return(quick_open_ui.search_line_edit)
+
+    assert node.parm("snippet").eval() == "@P.y += 0;\n"
+
+    press_return(quick_open_ui.search_line_edit, QtCore.Qt.ShiftModifier)
+
+    assert node.parm("snippet").eval() == "@P.y += 0;\n\n\n@P.y += 0;\n"
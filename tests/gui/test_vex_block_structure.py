@@ -0,0 +1,154 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtGui
+
+from vex_manager.gui.vex_block_structure import VEXBlockStructure
+from vex_manager.gui.vex_syntax_highlighter import VEXSyntaxHighlighter
+from vex_manager.gui.vex_plain_text_edit import VEXPlainTextEdit
+
+VEX_CODE = """\
+int f(int a) {
+    if (a) {
+        s = "}";
+        // }
+        /* {
+        */ a = (1 + [2][0]);
+    }
+
+    return a;
+}
+"""
+
+# Documents are kept for the whole session. Garbage collecting one together
+# with its highlighter and block data crashes PySide in a later test.
+_text_documents = []
+
+
+def create_vex_block_structure(vex_code: str) -> VEXBlockStructure:
+    document = QtGui.QTextDocument()
+    document.setDocumentLayout(QtWidgets.QPlainTextDocumentLayout(document))
+    document.setPlainText(vex_code)
+    _text_documents.append(document)
+
+    # Keeps the document alive with the structure.
+    VEXSyntaxHighlighter(document)
+
+    return VEXBlockStructure(document)
+
+
+def get_visible_blocks(vex_block_structure: VEXBlockStructure) -> list[bool]:
+    document = vex_block_structure.text_document
+
+    return [
+        document.findBlockByNumber(i).isVisible() for i in range(document.blockCount())
+    ]
+
+
+def test_find_matching_bracket(qapp):
+    vex_block_structure = create_vex_block_structure(VEX_CODE)
+
+    function_brace = VEX_CODE.index("{")
+    if_brace = VEX_CODE.index("{", function_brace + 1)
+    last_brace = VEX_CODE.rindex("}")
+
+    # Brackets in strings and comments are left out.
+    assert vex_block_structure.find_matching_bracket(function_brace) == last_brace
+    assert vex_block_structure.find_matching_bracket(last_brace) == function_brace
+    assert (
+        vex_block_structure.find_matching_bracket(if_brace)
+        == VEX_CODE.index("    }\n") + 4
+    )
+    assert vex_block_structure.find_matching_bracket(
+        VEX_CODE.index("[")
+    ) == VEX_CODE.index("]")
+    assert vex_block_structure.find_matching_bracket(VEX_CODE.index("int")) == -1
+
+
+def test_update_edited_blocks(qapp):
+    vex_block_structure = create_vex_block_structure(VEX_CODE)
+    document = vex_block_structure.text_document
+
+    assert vex_block_structure.find_matching_bracket(VEX_CODE.index("{")) >= 0
+
+    # Closing the if block early leaves the function brace unmatched.
+    text_cursor = QtGui.QTextCursor(document)
+    text_cursor.setPosition(VEX_CODE.index("return"))
+    text_cursor.insertText("}")
+
+    assert vex_block_structure.find_matching_bracket(VEX_CODE.index("{")) == (
+        VEX_CODE.index("return")
+    )
+
+
+def test_fold(qapp):
+    vex_block_structure = create_vex_block_structure(VEX_CODE)
+    document = vex_block_structure.text_document
+
+    if_block = document.findBlockByNumber(1)
+
+    assert vex_block_structure.fold(if_block)
+    assert get_visible_blocks(vex_block_structure) == [
+        True,
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+    # Folding the function hides the folded if block too.
+    assert vex_block_structure.fold_at(VEX_CODE.index("return"))
+    assert get_visible_blocks(vex_block_structure) == [True] + [False] * 8 + [True] * 2
+
+    assert vex_block_structure.unfold_at(0)
+    assert all(get_visible_blocks(vex_block_structure))
+    assert not vex_block_structure.is_folded(if_block)
+
+    assert not vex_block_structure.fold(document.findBlockByNumber(8))
+
+
+def test_edit_folded_header(qapp):
+    vex_block_structure = create_vex_block_structure(VEX_CODE)
+    document = vex_block_structure.text_document
+
+    vex_block_structure.fold(document.firstBlock())
+
+    text_cursor = QtGui.QTextCursor(document)
+    text_cursor.insertText("export ")
+
+    assert all(get_visible_blocks(vex_block_structure))
+
+
+def test_highlight_matching_brackets(qapp):
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_plain_text_edit.setPlainText(VEX_CODE)
+
+    text_cursor = vex_plain_text_edit.textCursor()
+    text_cursor.setPosition(VEX_CODE.index("{") + 1)
+    vex_plain_text_edit.setTextCursor(text_cursor)
+
+    assert [
+        selection.cursor.selectionStart()
+        for selection in vex_plain_text_edit.extraSelections()[1:]
+    ] == [VEX_CODE.index("{"), VEX_CODE.rindex("}")]
+
+
+def test_unfold_at_cursor(qapp):
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_plain_text_edit.setPlainText(VEX_CODE)
+
+    assert vex_plain_text_edit.fold()
+
+    text_cursor = vex_plain_text_edit.textCursor()
+    text_cursor.setPosition(VEX_CODE.index("return"))
+    vex_plain_text_edit.setTextCursor(text_cursor)
+
+    assert all(get_visible_blocks(vex_plain_text_edit.vex_block_structure))
@@ -0,0 +1,92 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtGui
+
+import os
+
+from vex_manager.gui.vex_document_cache import VEXDocumentCache
+from vex_manager.gui.vex_document_cache import VEXDocument
+from vex_manager.gui.vex_document_cache import BYTES_PER_CHARACTER
+from vex_manager.gui.vex_file_worker import VEXJournalWriter
+import vex_manager.core.recovery_journal as recovery_journal
+import vex_manager.core as core
+
+
+def create_vex_document(file_path: str, text: str = "") -> VEXDocument:
+    text_document = QtGui.QTextDocument()
+    text_document.setDocumentLayout(QtWidgets.QPlainTextDocumentLayout(text_document))
+    text_document.setPlainText(text)
+
+    return VEXDocument(file_path, text_document)
+
+
+def test_evict_least_recently_used(qapp, tmp_path):
+    vex_document_cache = VEXDocumentCache(max_documents=2)
+    file_paths = [str(tmp_path / f"VEX0{i}.vfl") for i in range(3)]
+
+    for file_path in file_paths[:2]:
+        vex_document_cache.add(create_vex_document(file_path))
+
+    assert vex_document_cache.get(file_paths[0])
+
+    vex_document_cache.add(create_vex_document(file_paths[2]))
+
+    assert len(vex_document_cache) == 2
+    assert file_paths[1] not in vex_document_cache
+    assert file_paths[0] in vex_document_cache
+
+
+def test_evict_to_disk(qapp, tmp_path):
+    vex_document_cache = VEXDocumentCache(max_documents=1)
+    file_path = os.path.join(str(tmp_path), "VEX01.vfl")
+
+    vex_document = create_vex_document(file_path, "@P.y += 1;")
+    vex_document.text_document.setModified(True)
+    vex_document.text_cursor.setPosition(4)
+
+    # Queued before the release, it must not leave a journal behind.
+    vex_document_cache.thread_pool.start(
+        VEXJournalWriter(vex_document.recovery_journal, "@P.y += 1;")
+    )
+
+    vex_document_cache.add(vex_document)
+    vex_document_cache.add(create_vex_document(str(tmp_path / "VEX02.vfl")))
+
+    # Read back before it is written, the edits are never missing.
+    assert vex_document_cache.load_state(file_path)["content"] == "@P.y += 1;"
+
+    vex_document_cache.thread_pool.waitForDone()
+    state = core.load_document_state(file_path)
+
+    assert state["content"] == "@P.y += 1;"
+    assert state["cursor_position"] == 4
+    assert not os.path.exists(
+        recovery_journal.get_recovery_journal_path(vex_document.file_path)
+    )
+
+    vex_document_cache.remove_state(file_path)
+
+    assert vex_document_cache.load_state(file_path) is None
+
+    vex_document_cache.thread_pool.waitForDone()
+
+    assert core.load_document_state(file_path) is None
+
+
+def test_evict_over_size(qapp, tmp_path):
+    text = "@P.y += 1;\n" * 100
+    vex_document_cache = VEXDocumentCache(
+        max_size=(len(text) + 1) * BYTES_PER_CHARACTER
+    )
+
+    vex_document_cache.add(create_vex_document(str(tmp_path / "VEX01.vfl"), text))
+    vex_document_cache.add(create_vex_document(str(tmp_path / "VEX02.vfl"), text))
+
+    # The most recent one stays, even alone over the limit.
+    vex_document_cache.add(create_vex_document(str(tmp_path / "VEX03.vfl"), text * 2))
+
+    assert len(vex_document_cache) == 1
+    assert str(tmp_path / "VEX03.vfl") in vex_document_cache
@@ -0,0 +1,204 @@
+try:
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtGui
+
+import os
+
+from vex_manager.gui.vex_editor_widget import VEXEditorWidget
+from vex_manager.gui.vex_file_worker import LARGE_FILE_SIZE
+import vex_manager.core as core
+
+
+def test_display_code(qapp, wait_until, library_path):
+    vex_editor_widget = VEXEditorWidget()
+    vex_editor_widget.set_file_path(os.path.join(library_path, "VEX02.vfl"))
+    vex_editor_widget.display_code()
+
+    assert vex_editor_widget.vex_plain_text_editor.isReadOnly()
+    assert wait_until(lambda: not vex_editor_widget.vex_plain_text_editor.isReadOnly())
+    assert vex_editor_widget.vex_plain_text_editor.toPlainText() == "@P.y += 1;\n"
+    assert not vex_editor_widget.is_modified()
+
+
+def test_display_missing_code(qapp, wait_until, library_path):
+    vex_editor_widget = VEXEditorWidget()
+    vex_editor_widget.set_file_path(os.path.join(library_path, "missing.vfl"))
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: not vex_editor_widget.vex_plain_text_editor.isReadOnly())
+    assert vex_editor_widget.name_line_edit.text() == ""
+
+
+def test_save_file(qapp, wait_until, library_path):
+    vex_file_path = os.path.join(library_path, "VEX01.vfl")
+
+    vex_editor_widget = VEXEditorWidget()
+    vex_editor_widget.set_file_path(vex_file_path)
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: not vex_editor_widget.vex_plain_text_editor.isReadOnly())
+
+    vex_editor_widget.vex_plain_text_editor.setPlainText("@Cd = 1;")
+    vex_editor_widget.vex_plain_text_editor.document().setModified(True)
+    vex_editor_widget.save_changes_push_button.click()
+
+    assert wait_until(lambda: not vex_editor_widget._pending_saves)
+
+    with open(vex_file_path) as file_for_read:
+        assert file_for_read.read() == "@Cd = 1;"
+
+
+def test_outline(qapp, wait_until):
+    vex_editor_widget = VEXEditorWidget()
+    vex_plain_text_editor = vex_editor_widget.vex_plain_text_editor
+    outline_tree_widget = vex_editor_widget.vex_outline_widget.outline_tree_widget
+
+    vex_plain_text_editor.setPlainText("int f() {\n}\n\nforeach (int pt; pts) {\n}\n")
+    vex_editor_widget.vex_outline_widget.update_outline()
+
+    assert wait_until(lambda: outline_tree_widget.topLevelItemCount() == 2)
+    assert outline_tree_widget.topLevelItem(0).text(0) == "int f()"
+
+    item = outline_tree_widget.topLevelItem(1)
+
+    assert item.text(0) == "foreach"
+
+    outline_tree_widget.itemClicked.emit(item, 0)
+
+    assert vex_plain_text_editor.textCursor().blockNumber() == 3
+
+    # Edits are outlined after a pause.
+    vex_plain_text_editor.moveCursor(QtGui.QTextCursor.End)
+    vex_plain_text_editor.textCursor().insertText("struct piece {\n};\n")
+
+    assert wait_until(lambda: outline_tree_widget.topLevelItemCount() == 3)
+    assert outline_tree_widget.topLevelItem(2).text(0) == "struct piece"
+
+
+def test_tabs(qapp, wait_until, library_path):
+    vex_editor_widget = VEXEditorWidget()
+    vex_plain_text_editor = vex_editor_widget.vex_plain_text_editor
+    file_paths = [os.path.join(library_path, f"VEX0{i}.vfl") for i in (1, 2)]
+
+    for file_path in file_paths:
+        vex_editor_widget.set_file_path(file_path)
+        vex_editor_widget.display_code()
+
+        assert wait_until(lambda: not vex_plain_text_editor.isReadOnly())
+
+    assert vex_editor_widget.tab_bar.count() == 2
+
+    vex_plain_text_editor.moveCursor(QtGui.QTextCursor.End)
+    vex_plain_text_editor.textCursor().insertText("@Cd = 1;")
+
+    assert vex_editor_widget.tab_bar.tabText(1) == "VEX02*"
+
+    # Shown right away, edits and undo history kept.
+    vex_editor_widget.tab_bar.setCurrentIndex(0)
+
+    assert vex_editor_widget.get_current_file_path() == file_paths[0]
+    assert not vex_plain_text_editor.isReadOnly()
+    assert vex_plain_text_editor.toPlainText() == "@P.y += 0;\n"
+
+    vex_editor_widget.tab_bar.setCurrentIndex(1)
+
+    assert vex_plain_text_editor.toPlainText() == "@P.y += 1;\n@Cd = 1;"
+    assert vex_editor_widget.is_modified()
+
+    vex_plain_text_editor.undo()
+
+    assert vex_plain_text_editor.toPlainText() == "@P.y += 1;\n"
+
+    vex_editor_widget.tab_bar.tabCloseRequested.emit(1)
+
+    assert vex_editor_widget.tab_bar.count() == 1
+    assert vex_editor_widget.get_current_file_path() == file_paths[0]
+
+
+def test_evicted_tab(qapp, wait_until, library_path):
+    vex_editor_widget = VEXEditorWidget()
+    vex_editor_widget.vex_document_cache.set_limits(1)
+    vex_plain_text_editor = vex_editor_widget.vex_plain_text_editor
+    file_paths = [os.path.join(library_path, f"VEX0{i}.vfl") for i in (1, 2)]
+
+    vex_editor_widget.set_file_path(file_paths[0])
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: not vex_plain_text_editor.isReadOnly())
+
+    vex_plain_text_editor.moveCursor(QtGui.QTextCursor.End)
+    vex_plain_text_editor.textCursor().insertText("@Cd = 1;")
+
+    vex_editor_widget.set_file_path(file_paths[1])
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: not vex_plain_text_editor.isReadOnly())
+    assert file_paths[0] not in vex_editor_widget.vex_document_cache
+
+    # Unsaved edits come back from disk.
+    vex_editor_widget.tab_bar.setCurrentIndex(0)
+
+    assert vex_plain_text_editor.toPlainText() == "@P.y += 0;\n@Cd = 1;"
+    assert vex_editor_widget.is_modified()
+    assert vex_plain_text_editor.textCursor().position() == len("@P.y += 0;\n@Cd = 1;")
+
+    vex_editor_widget.save_changes_push_button.click()
+
+    assert wait_until(lambda: not vex_editor_widget._pending_saves)
+
+    vex_editor_widget.journal_thread_pool.waitForDone()
+
+    assert core.load_document_state(file_paths[0]) is None
+
+
+def test_large_file(qapp, wait_until, library_path):
+    vex_file_path = os.path.join(library_path, "VEX01.vfl")
+
+    vex_editor_widget = VEXEditorWidget()
+    vex_large_file_viewer = vex_editor_widget.vex_large_file_viewer
+
+    with open(vex_file_path, "w") as file_for_write:
+        file_for_write.write("@P.y += 1;\n" * (LARGE_FILE_SIZE // 10))
+
+    vex_editor_widget.set_file_path(vex_file_path)
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: vex_editor_widget._is_large_file_shown())
+    assert not vex_editor_widget.replace_code_push_button.isEnabled()
+    assert wait_until(lambda: vex_large_file_viewer.mapped_vex_file.is_indexed)
+    assert vex_large_file_viewer.mapped_vex_file.get_lines(0, 1)[0][0] == "@P.y += 1;"
+
+    vex_editor_widget.edit_anyway_push_button.click()
+
+    assert vex_large_file_viewer.mapped_vex_file is None
+    assert wait_until(lambda: not vex_editor_widget.vex_plain_text_editor.isReadOnly())
+    assert not vex_editor_widget._is_large_file_shown()
+    assert vex_editor_widget.vex_plain_text_editor.document().blockCount() > 1000
+
+
+def test_recovery_journal(qapp, wait_until, library_path):
+    vex_file_path = os.path.join(library_path, "VEX01.vfl")
+    journal_path = core.recovery_journal.get_recovery_journal_path(vex_file_path)
+
+    vex_editor_widget = VEXEditorWidget()
+    vex_editor_widget._journal_timer.setInterval(0)
+    vex_plain_text_editor = vex_editor_widget.vex_plain_text_editor
+
+    vex_editor_widget.set_file_path(vex_file_path)
+    vex_editor_widget.display_code()
+
+    assert wait_until(lambda: not vex_plain_text_editor.isReadOnly())
+
+    vex_plain_text_editor.moveCursor(QtGui.QTextCursor.End)
+    vex_plain_text_editor.insertPlainText("@Cd = 1;")
+
+    assert wait_until(lambda: os.path.exists(journal_path))
+    assert wait_until(
+        lambda: core.recovery_journal.read_recovery_journal(journal_path)[1]
+        == "@P.y += 0;\n@Cd = 1;"
+    )
+
+    vex_editor_widget.save_changes_push_button.click()
+
+    assert wait_until(lambda: not os.path.exists(journal_path))
@@ -0,0 +1,203 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+import pytest
+
+from vex_manager.gui.vex_plain_text_edit import VEXPlainTextEdit
+import vex_manager.core.signature_index as signature_index
+
+
+def press_key(
+    widget: QtWidgets.QWidget,
+    key: int,
+    text: str = "",
+    modifiers: QtCore.Qt.KeyboardModifier = QtCore.Qt.NoModifier,
+) -> None:
+
+    event = QtGui.QKeyEvent(QtCore.QEvent.KeyPress, key, modifiers, text)
+    QtWidgets.QApplication.sendEvent(widget, event)
+
+
+def create_vex_plain_text_edit(text: str, position: int = -1) -> VEXPlainTextEdit:
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_plain_text_edit.tab_size = 4
+    vex_plain_text_edit.setPlainText(text)
+
+    text_cursor = vex_plain_text_edit.textCursor()
+    text_cursor.setPosition(len(text) if position < 0 else position)
+    vex_plain_text_edit.setTextCursor(text_cursor)
+
+    return vex_plain_text_edit
+
+
+def get_text_and_position(vex_plain_text_edit: VEXPlainTextEdit) -> tuple[str, int]:
+    return (
+        vex_plain_text_edit.toPlainText(),
+        vex_plain_text_edit.textCursor().position(),
+    )
+
+
+def test_indent_after_bracket(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("  if (1) {}", 10)
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Return, "\r")
+
+    assert get_text_and_position(vex_plain_text_edit) == ("  if (1) {\n      \n  }", 17)
+
+    # The auto-edit is a single undo step.
+    vex_plain_text_edit.undo()
+
+    assert vex_plain_text_edit.toPlainText() == "  if (1) {}"
+
+
+def test_indent(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("    @P.y = 1;")
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Return, "\r")
+
+    assert get_text_and_position(vex_plain_text_edit) == ("    @P.y = 1;\n    ", 18)
+
+
+@pytest.mark.parametrize(
+    "key, text, expected_text, expected_position",
+    [
+        (QtCore.Qt.Key_ParenLeft, "(", "f()", 2),
+        (QtCore.Qt.Key_QuoteDbl, '"', 'f""', 2),
+    ],
+)
+def test_insert_matching_delimiter(qapp, key, text, expected_text, expected_position):
+    vex_plain_text_edit = create_vex_plain_text_edit("f")
+
+    press_key(vex_plain_text_edit, key, text)
+
+    assert get_text_and_position(vex_plain_text_edit) == (
+        expected_text,
+        expected_position,
+    )
+
+
+def test_skip_closing_delimiter(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("f()", 2)
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_ParenRight, ")")
+
+    assert get_text_and_position(vex_plain_text_edit) == ("f()", 3)
+
+
+def test_backspace_on_tab_space(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("{\n      ")
+    vex_plain_text_edit.backspace_on_tab_space = True
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Backspace)
+
+    assert vex_plain_text_edit.toPlainText() == "{\n    "
+
+
+def test_latency_metrics(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("")
+    vex_plain_text_edit.set_latency_metrics_enabled(True)
+
+    for char in "@P.y":
+        press_key(vex_plain_text_edit, ord(char.upper()), char)
+
+    assert vex_plain_text_edit.toPlainText() == "@P.y"
+    assert vex_plain_text_edit.get_latency_metrics()["key_press"]["count"] == 4
+
+
+def test_complete(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("float radius = 1;\n")
+    vex_plain_text_edit.vex_completer.update_document_words()
+
+    for char in "ra":
+        press_key(vex_plain_text_edit, ord(char.upper()), char)
+
+    vex_completer = vex_plain_text_edit.vex_completer
+
+    # Declared names come first.
+    assert vex_completer.popup().isVisible()
+    assert vex_completer.string_list_model.stringList()[0] == "radius"
+
+    vex_completer.activated[str].emit("radius")
+
+    assert vex_plain_text_edit.toPlainText() == "float radius = 1;\nradius"
+
+
+def test_complete_attribute(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("v@Cd = 1;\n")
+    vex_plain_text_edit.vex_completer.update_document_words()
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_At, "@")
+
+    assert vex_plain_text_edit.vex_completer.get_completions("@") == ["@Cd"]
+    assert vex_plain_text_edit.vex_completer.string_list_model.stringList() == [
+        "@Cd"
+    ]
+
+
+def test_no_completion_in_comments(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("/* point\n")
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_P, "p")
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_O, "o")
+
+    assert not vex_plain_text_edit.vex_completer.popup().isVisible()
+
+
+def test_signature_help(qapp, tmp_path):
+    index_path = str(tmp_path / "signatures.idx")
+    signature_index.write_signature_index(
+        index_path,
+        {"fit": ("Shifts a value to a new range.", ("float fit(float a, float b)",))},
+    )
+
+    vex_plain_text_edit = create_vex_plain_text_edit("x = fit(0")
+    vex_plain_text_edit.signature_index = signature_index.SignatureIndex(index_path)
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Comma, ",")
+
+    assert vex_plain_text_edit._is_signature_help_visible
+    assert QtWidgets.QToolTip.text() == (
+        "<code>float fit(float a,<b> float b</b>)</code><br>"
+        "Shifts a value to a new range."
+    )
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Semicolon, ";")
+
+    assert not vex_plain_text_edit._is_signature_help_visible
+
+
+def test_keys_without_modifiers(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("{\n    a\n}", 1)
+    point_size = vex_plain_text_edit.font.pointSize()
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Equal, "=")
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_BracketLeft, "[")
+
+    assert vex_plain_text_edit.font.pointSize() == point_size
+    assert vex_plain_text_edit.toPlainText() == "{=[]\n    a\n}"
+    assert vex_plain_text_edit.document().findBlockByNumber(1).isVisible()
+
+
+def test_keys_with_modifiers(qapp):
+    vex_plain_text_edit = create_vex_plain_text_edit("{\n    a\n}", 1)
+    point_size = vex_plain_text_edit.font.pointSize()
+
+    press_key(vex_plain_text_edit, QtCore.Qt.Key_Equal, "=", QtCore.Qt.ControlModifier)
+
+    assert vex_plain_text_edit.font.pointSize() == point_size + 1
+
+    press_key(
+        vex_plain_text_edit,
+        QtCore.Qt.Key_BracketLeft,
+        "[",
+        QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier,
+    )
+
+    assert vex_plain_text_edit.toPlainText() == "{\n    a\n}"
+    assert not vex_plain_text_edit.document().findBlockByNumber(1).isVisible()
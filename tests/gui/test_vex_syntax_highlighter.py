@@ -0,0 +1,152 @@
+try:
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtGui
+
+import pytest
+
+from vex_manager.gui.vex_syntax_highlighter import LARGE_DOCUMENT_BLOCK_COUNT
+from vex_manager.gui.vex_syntax_highlighter import VEXSyntaxHighlighter
+from vex_manager.gui.vex_plain_text_edit import VEXPlainTextEdit
+from vex_manager.config import ColorScheme
+
+COLOR_SCHEME = {item.value["name"]: item.value["color"] for item in ColorScheme}
+
+
+def get_tokens(vex_code: str) -> list[list[tuple[str, str]]]:
+    document = QtGui.QTextDocument()
+    document.setPlainText(vex_code)
+
+    vex_syntax_highlighter = VEXSyntaxHighlighter(document)
+    vex_syntax_highlighter.set_vex_systax_highlighter_colors(COLOR_SCHEME)
+
+    color_names = {
+        QtGui.QColor(*color).name(): name for name, color in COLOR_SCHEME.items()
+    }
+
+    blocks = []
+    block = document.begin()
+
+    while block.isValid():
+        tokens = []
+
+        for format_range in block.layout().formats():
+            name = color_names[format_range.format.foreground().color().name()]
+
+            if name != "plain":
+                text = block.text()[
+                    format_range.start : format_range.start + format_range.length
+                ]
+                tokens.append((text, name))
+
+        blocks.append(tokens)
+        block = block.next()
+
+    return blocks
+
+
+def test_tokens(qapp):
+    (tokens,) = get_tokens('vector n = normalize(v@N) * 2.5; // "not a string"')
+
+    assert tokens == [
+        ("vector", "types"),
+        ("normalize", "functions"),
+        ("v@N", "references"),
+        ("2.5", "numbers"),
+        ('// "not a string"', "comments"),
+    ]
+
+
+def test_strings_win_in_source_order(qapp):
+    (tokens,) = get_tokens('s@name = "// @P if";')
+
+    assert tokens == [("s@name", "references"), ('"// @P if"', "strings")]
+
+
+def test_identifiers_are_whole_words(qapp):
+    (tokens,) = get_tokens("float normalized = ifx + v2;")
+
+    assert tokens == [("float", "types")]
+
+
+@pytest.mark.parametrize(
+    "vex_code, expected_tokens",
+    [
+        (
+            "int a; /* one\ntwo @P\nthree */ if",
+            [
+                [("int", "types"), ("/* one", "comments")],
+                [("two @P", "comments")],
+                [("three */", "comments"), ("if", "keywords")],
+            ],
+        ),
+        (
+            "/* a */ return /* b",
+            [[("/* a */", "comments"), ("return", "keywords"), ("/* b", "comments")]],
+        ),
+    ],
+)
+def test_multi_line_comments(qapp, vex_code, expected_tokens):
+    assert get_tokens(vex_code) == expected_tokens
+
+
+def get_kinds(block: QtGui.QTextBlock) -> list[str]:
+    return [
+        format_range.format.foreground().color().name()
+        for format_range in block.layout().formats()
+    ]
+
+
+def test_large_document(qapp, wait_until):
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_plain_text_edit.resize(400, 300)
+    vex_plain_text_edit.show()
+
+    vex_syntax_highlighter = vex_plain_text_edit.vex_syntax_highlighter
+    comments_color = QtGui.QColor(*COLOR_SCHEME["comments"]).name()
+
+    vex_code = "@P.y += 1;\n" * LARGE_DOCUMENT_BLOCK_COUNT
+    vex_plain_text_edit.setPlainText(vex_code)
+
+    assert vex_syntax_highlighter.is_large_document()
+
+    document = vex_plain_text_edit.document()
+
+    # Highlighted in idle time, not while the text is set.
+    assert not document.lastBlock().previous().layout().formats()
+
+    assert wait_until(lambda: not vex_syntax_highlighter.is_highlighting())
+    assert document.lastBlock().previous().layout().formats()
+
+    # An edit in view is highlighted at once, the rest of the document after.
+    text_cursor = QtGui.QTextCursor(document.begin())
+    text_cursor.insertText("/* ")
+
+    assert comments_color in get_kinds(document.findBlockByNumber(5))
+    assert wait_until(lambda: not vex_syntax_highlighter.is_highlighting())
+    assert comments_color in get_kinds(document.lastBlock().previous())
+
+    vex_plain_text_edit.setPlainText(vex_code[:1000])
+
+    assert not vex_syntax_highlighter.is_large_document()
+    assert wait_until(lambda: document.begin().layout().formats())
+
+
+@pytest.mark.parametrize("block_count", [10, LARGE_DOCUMENT_BLOCK_COUNT])
+def test_theme_change_updates_cached_lines(qapp, wait_until, block_count):
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_syntax_highlighter = vex_plain_text_edit.vex_syntax_highlighter
+
+    vex_plain_text_edit.setPlainText("int pts[] = {};\n" * block_count)
+
+    color_scheme = dict(COLOR_SCHEME, types=(255, 0, 0))
+    vex_syntax_highlighter.set_vex_systax_highlighter_colors(color_scheme)
+
+    document = vex_plain_text_edit.document()
+    last_block = document.lastBlock().previous()
+
+    assert wait_until(
+        lambda: QtGui.QColor(255, 0, 0).name() in get_kinds(last_block)
+        and not vex_syntax_highlighter.is_highlighting()
+    )
+    assert QtGui.QColor(255, 0, 0).name() in get_kinds(document.begin())
@@ -0,0 +1,33 @@
+from PySide2 import QtWidgets
+from PySide2 import QtCore
+
+import threading
+import sys
+import os
+
+from vex_manager.gui.vex_file_worker import VEXFileWorkerSignals
+from vex_manager.gui.vex_file_worker import VEXFileLoader
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+
+    file_path = os.path.join(os.path.expanduser("~"), "vex-manager-test", "test.vfl")
+
+    vex_file_worker_signals = VEXFileWorkerSignals()
+    vex_file_worker_signals.loaded.connect(
+        lambda request_id, file_path, content, exists: print(
+            request_id, file_path, exists, content
+        )
+    )
+    vex_file_worker_signals.loaded.connect(app.quit)
+
+    QtCore.QThreadPool.globalInstance().start(
+        VEXFileLoader(1, file_path, threading.Event(), vex_file_worker_signals)
+    )
+
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+import time
+import sys
+
+from vex_manager.gui.vex_plain_text_edit import VEXPlainTextEdit
+
+VEX_CODE = """\
+int pts[] = nearpoints(0, @P, chf("radius"), chi("max_points"));
+foreach (int pt; pts) {
+    vector pos = point(0, "P", pt);
+}
+"""
+
+TYPED_CODE = 'if (len(pts) > 2) {\rf@density = point(0, "density", pts[0]);\r'
+
+KEYS = {
+    "\r": QtCore.Qt.Key_Return,
+    "{": QtCore.Qt.Key_BraceLeft,
+    "}": QtCore.Qt.Key_BraceRight,
+    "(": QtCore.Qt.Key_ParenLeft,
+    ")": QtCore.Qt.Key_ParenRight,
+    "[": QtCore.Qt.Key_BracketLeft,
+    "]": QtCore.Qt.Key_BracketRight,
+    '"': QtCore.Qt.Key_QuoteDbl,
+}
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv[:1])
+
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    vex_plain_text_edit = VEXPlainTextEdit()
+    vex_plain_text_edit.resize(800, 600)
+    vex_plain_text_edit.show()
+    vex_plain_text_edit.setPlainText(VEX_CODE * (line_count // 4))
+
+    # Types in the middle of the buffer, after the first paint.
+    text_cursor = vex_plain_text_edit.textCursor()
+    text_cursor.setPosition(vex_plain_text_edit.document().characterCount() // 2)
+    vex_plain_text_edit.setTextCursor(text_cursor)
+    vex_plain_text_edit.centerCursor()
+
+    app.processEvents()
+
+    vex_plain_text_edit.set_latency_metrics_enabled(True)
+
+    start_time = time.perf_counter()
+
+    for char in TYPED_CODE * 5:
+        key = KEYS.get(char, QtCore.Qt.Key_A)
+        event = QtGui.QKeyEvent(QtCore.QEvent.KeyPress, key, QtCore.Qt.NoModifier, char)
+
+        QtWidgets.QApplication.sendEvent(vex_plain_text_edit, event)
+        app.processEvents()
+
+    total_time = time.perf_counter() - start_time
+
+    block_count = vex_plain_text_edit.document().blockCount()
+
+    print(
+        f"{len(TYPED_CODE) * 5} keys typed in {block_count} blocks in {total_time:.3f} seconds."
+    )
+    print(vex_plain_text_edit.key_latency_metrics.get_report())
+    print(vex_plain_text_edit.key_to_paint_latency_metrics.get_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtGui
+
+import time
+import sys
+
+from vex_manager.gui.vex_syntax_highlighter import VEXSyntaxHighlighter
+from vex_manager.config import ColorScheme
+
+VEX_CODE = """\
+// Scatter points and orient them along the surface normal.
+int pts[] = nearpoints(0, @P, chf("radius"), chi("max_points"));
+float weight = 0.0;
+vector n = normalize(v@N);
+
+foreach (int pt; pts) {
+    vector pos = point(0, "P", pt);
+    float dist = distance(@P, pos);
+    weight += fit(dist, 0, ch("radius"), 1, 0);
+}
+
+if (weight > 0.5 && len(pts) > 2) {
+    f@density = weight / len(pts);
+    v@Cd = set(1.0, 0.25, 0.1) * weight;
+    i@group_dense = 1;
+} else {
+    removepoint(0, @ptnum);
+}
+
+matrix3 rot = dihedral({0, 1, 0}, n);
+p@orient = quaternion(rot);
+s@name = sprintf("piece_%d", @ptnum % 16);
+"""
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv[:1])
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = VEX_CODE * repeat
+
+    document = QtGui.QTextDocument()
+    document.setPlainText(text)
+
+    vex_syntax_highlighter = VEXSyntaxHighlighter(document)
+
+    color_scheme = {item.value["name"]: item.value["color"] for item in ColorScheme}
+
+    # Setting the colors rehighlights the whole document.
+    start_time = time.perf_counter()
+    vex_syntax_highlighter.set_vex_systax_highlighter_colors(color_scheme)
+    total_time = time.perf_counter() - start_time
+
+    block_count = document.blockCount()
+
+    print(f"{block_count} blocks highlighted in {total_time:.3f} seconds.")
+    print(f"{total_time / block_count * 1e6:.1f} microseconds per block.")
+
+    # Applying a theme again only reuses the cached tokens.
+    start_time = time.perf_counter()
+    vex_syntax_highlighter.set_vex_systax_highlighter_colors(color_scheme)
+    total_time = time.perf_counter() - start_time
+
+    print(f"{block_count} blocks rehighlighted in {total_time:.3f} seconds.")
+    print(f"{total_time / block_count * 1e6:.1f} microseconds per block.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+# Stand-in for the parts of Houdini's hou module used by VEX Manager. It is
+# only put on sys.path by tests/conftest.py when the real hou module can not
+# be imported, so the package can be tested and benchmarked on a plain Python
+# install. The stub object creates scenes and scripts the answers of dialogs.
+
+from typing import Optional
+import contextlib
+import os
+import re
+
+APPLICATION_VERSION = os.environ.get("VEX_MANAGER_HOUDINI_VERSION", "20.5.332")
+
+WRANGLE_SNIPPET_PARMS = {
+    "attribwrangle": "snippet",
+    "deformationwrangle": "snippet",
+    "kinefx::rigattribwrangle": "snippet",
+    "volumewrangle": "snippet",
+    "gasfieldwrangle": "snippet",
+    "geometrywrangle": "snippet",
+    "popwrangle": "snippet",
+    "wrangle": "snippet",
+    "channelwrangle": "snippet",
+    "snippet": "code",
+}
+
+
+# Tags Houdini puts on the string parms edited as VEX.
+VEX_EDITOR_TAGS = {"editor": "1", "editorlang": "vex"}
+
+# The only expression evaluated, the channel references HDAs use to promote
+# the snippet parm of the wrangle they wrap.
+CHANNEL_REFERENCE_REG_EXP = re.compile(r'^chs\(["\'](.+)["\']\)$')
+
+
+class OperationFailed(Exception):
+    pass
+
+
+class ObjectWasDeleted(Exception):
+    pass
+
+
+class confirmType:
+    OverwriteFile = "OverwriteFile"
+    NoConfirmType = "NoConfirmType"
+
+
+class fileType:
+    Any = "Any"
+    Directory = "Directory"
+
+
+class nodeEventType:
+    BeingDeleted = "BeingDeleted"
+    ChildCreated = "ChildCreated"
+    ParmTupleChanged = "ParmTupleChanged"
+
+
+class hipFileEventType:
+    AfterClear = "AfterClear"
+    AfterLoad = "AfterLoad"
+    AfterMerge = "AfterMerge"
+
+
+def applicationVersion() -> tuple[int, int, int]:
+    return tuple(int(number) for number in APPLICATION_VERSION.split("."))
+
+
+def applicationVersionString() -> str:
+    return APPLICATION_VERSION
+
+
+class NodeType:
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._instances = []
+
+    def name(self) -> str:
+        return self._name
+
+    def instances(self) -> tuple["Node", ...]:
+        return tuple(self._instances)
+
+    def __repr__(self) -> str:
+        return f"<hou.NodeType {self._name}>"
+
+
+# One per name, like Houdini's, so they can be compared and hashed.
+_node_types = {}
+
+
+def _get_node_type(name: str) -> NodeType:
+    node_type = _node_types.get(name)
+
+    if not node_type:
+        node_type = _node_types[name] = NodeType(name)
+
+    return node_type
+
+
+class NodeTypeCategory:
+
+    def name(self) -> str:
+        return "Sop"
+
+    def nodeTypes(self) -> dict[str, NodeType]:
+        # All types share one category, Houdini splits them by context.
+        return dict(_node_types)
+
+
+def nodeTypeCategories() -> dict[str, NodeTypeCategory]:
+    return {"Sop": NodeTypeCategory()}
+
+
+# Installed with Houdini, listed before any node of theirs is created.
+for _node_type_name in WRANGLE_SNIPPET_PARMS:
+    _get_node_type(_node_type_name)
+
+
+class ParmTemplate:
+
+    def __init__(self, name: str, tags: Optional[dict] = None) -> None:
+        self._name = name
+        self._tags = dict(tags or {})
+
+    def name(self) -> str:
+        return self._name
+
+    def tags(self) -> dict:
+        return dict(self._tags)
+
+
+class Parm:
+
+    def __init__(
+        self,
+        node: "Node",
+        name: str,
+        value: object = "",
+        tags: Optional[dict] = None,
+    ) -> None:
+
+        self._node = node
+        self._name = name
+        self._value = value
+        self._expression = None
+        self._parm_template = ParmTemplate(name, tags)
+
+    def name(self) -> str:
+        return self._name
+
+    def parmTemplate(self) -> ParmTemplate:
+        return self._parm_template
+
+    def node(self) -> "Node":
+        return self._node
+
+    def eval(self) -> object:
+        if self._expression is None:
+            return self._value
+
+        match = CHANNEL_REFERENCE_REG_EXP.match(self._expression)
+        parm_path = match.group(1) if match else ""
+        node_path, _, parm_name = parm_path.rpartition("/")
+        node = self._node.node(node_path or ".")
+        parm = node.parm(parm_name) if node else None
+
+        return parm.eval() if parm else ""
+
+    def evalAsString(self) -> str:
+        return str(self.eval())
+
+    def unexpandedString(self) -> str:
+        if self._expression is not None:
+            raise OperationFailed("The parameter has an expression.")
+
+        return str(self._value)
+
+    def expression(self) -> str:
+        if self._expression is None:
+            raise OperationFailed("The parameter has no expression.")
+
+        return self._expression
+
+    def set(self, value: object) -> None:
+        stub.parm_set_count += 1
+
+        self._value = value
+
+        self._node._send_event(nodeEventType.ParmTupleChanged, parm_tuple=self)
+
+    def setExpression(self, expression: str) -> None:
+        self._expression = expression
+
+        self._node._send_event(nodeEventType.ParmTupleChanged, parm_tuple=self)
+
+    def __repr__(self) -> str:
+        return f"<hou.Parm {self._name} in {self._node.path()}>"
+
+
+class Node:
+
+    def __init__(self, parent: Optional["Node"], name: str, type_name: str) -> None:
+        self._parent = parent
+        self._name = name
+        self._type = _get_node_type(type_name)
+        self._type._instances.append(self)
+        self._children = {}
+        self._parms = {}
+        self._event_callbacks = []
+
+        stub.session_id += 1
+        self._session_id = stub.session_id
+
+        snippet_parm_name = WRANGLE_SNIPPET_PARMS.get(type_name)
+
+        if snippet_parm_name:
+            self.addParm(snippet_parm_name, "", VEX_EDITOR_TAGS)
+
+    def name(self) -> str:
+        return self._name
+
+    def path(self) -> str:
+        if not self._parent:
+            return "/"
+
+        parent_path = self._parent.path().rstrip("/")
+
+        return f"{parent_path}/{self._name}"
+
+    def type(self) -> NodeType:
+        return self._type
+
+    def sessionId(self) -> int:
+        return self._session_id
+
+    def addEventCallback(self, event_types: tuple[str, ...], callback) -> None:
+        self._event_callbacks.append((tuple(event_types), callback))
+
+    def removeEventCallback(self, event_types: tuple[str, ...], callback) -> None:
+        self._event_callbacks = [
+            (callback_event_types, other_callback)
+            for callback_event_types, other_callback in self._event_callbacks
+            if other_callback != callback
+        ]
+
+    def _send_event(self, event_type: str, **kwargs) -> None:
+        for event_types, callback in list(self._event_callbacks):
+            if event_type in event_types:
+                callback(event_type=event_type, node=self, **kwargs)
+
+    def parent(self) -> Optional["Node"]:
+        return self._parent
+
+    def children(self) -> tuple["Node", ...]:
+        return tuple(self._children.values())
+
+    def allSubChildren(
+        self, top_down: bool = True, recurse_in_locked_nodes: bool = True
+    ) -> tuple["Node", ...]:
+
+        sub_children = []
+
+        for child in self.children():
+            sub_children.append(child)
+            sub_children.extend(child.allSubChildren(top_down, recurse_in_locked_nodes))
+
+        return tuple(sub_children)
+
+    def isNetwork(self) -> bool:
+        # The wrangles are the leaves of the stand-in scenes.
+        return self._type.name() not in WRANGLE_SNIPPET_PARMS
+
+    def isInsideLockedHDA(self) -> bool:
+        return False
+
+    def node(self, path: str) -> Optional["Node"]:
+        node = root if path.startswith("/") else self
+
+        for name in path.strip("/").split("/"):
+            if not name or name == ".":
+                continue
+
+            node = node._parent if name == ".." else node._children.get(name)
+
+            if node is None:
+                return None
+
+        return node
+
+    def createNode(
+        self, node_type_name: str, node_name: Optional[str] = None
+    ) -> "Node":
+
+        if not node_name:
+            base_name = node_type_name.split("::")[-1]
+            number = 1
+
+            while f"{base_name}{number}" in self._children:
+                number += 1
+
+            node_name = f"{base_name}{number}"
+
+        if node_name in self._children:
+            raise OperationFailed(f"Node {node_name!r} already exists.")
+
+        node = Node(self, node_name, node_type_name)
+        self._children[node_name] = node
+
+        self._send_event(nodeEventType.ChildCreated, child_node=node)
+
+        return node
+
+    def destroy(self) -> None:
+        for child in self.children():
+            child.destroy()
+
+        self._send_event(nodeEventType.BeingDeleted)
+        self._event_callbacks = []
+        self._type._instances.remove(self)
+
+        self.setSelected(False)
+
+        if self._parent:
+            self._parent._children.pop(self._name, None)
+
+    def parm(self, parm_name: str) -> Optional[Parm]:
+        return self._parms.get(parm_name)
+
+    def parms(self) -> tuple[Parm, ...]:
+        return tuple(self._parms.values())
+
+    def addParm(
+        self, parm_name: str, value: object = "", tags: Optional[dict] = None
+    ) -> Parm:
+
+        # Not part of hou, parm templates are out of scope for the stand-in.
+        parm = Parm(self, parm_name, value, tags)
+        self._parms[parm_name] = parm
+
+        return parm
+
+    def isSelected(self) -> bool:
+        return self in stub.selected_nodes
+
+    def setSelected(
+        self, on: bool, clear_all_selected: bool = False, show_asset_if_selected=False
+    ) -> None:
+
+        if clear_all_selected:
+            clearAllSelected()
+
+        if self in stub.selected_nodes:
+            stub.selected_nodes.remove(self)
+
+        if on:
+            stub.selected_nodes.append(self)
+
+    def __repr__(self) -> str:
+        return f"<hou.Node at {self.path()}>"
+
+
+def node(path: str) -> Optional[Node]:
+    return root.node(path)
+
+
+def selectedNodes() -> tuple[Node, ...]:
+    return tuple(stub.selected_nodes)
+
+
+def clearAllSelected() -> None:
+    stub.selected_nodes.clear()
+
+
+class _Undos:
+
+    @contextlib.contextmanager
+    def group(self, label: str):
+        stub.undo_groups.append(label)
+
+        yield
+
+    @contextlib.contextmanager
+    def disabler(self):
+        yield
+
+
+undos = _Undos()
+
+
+class _Desktop:
+
+    def displayHelpPath(self, help_path: str) -> None:
+        stub.help_paths.append(help_path)
+
+
+class _UI:
+
+    def _get_response(self, default: object) -> object:
+        if stub.ui_responses:
+            return stub.ui_responses.pop(0)
+
+        return default
+
+    def readInput(
+        self,
+        message: str,
+        buttons: tuple[str, ...] = ("OK",),
+        severity=None,
+        default_choice: int = 0,
+        close_choice: int = -1,
+        help: Optional[str] = None,
+        title: Optional[str] = None,
+        initial_contents: Optional[str] = None,
+    ) -> tuple[int, str]:
+
+        return self._get_response((close_choice, initial_contents or ""))
+
+    def displayCustomConfirmation(
+        self,
+        text: str,
+        buttons: tuple[str, ...] = ("OK",),
+        severity=None,
+        default_choice: int = 0,
+        close_choice: int = -1,
+        help: Optional[str] = None,
+        title: Optional[str] = None,
+        details: Optional[str] = None,
+        details_label: Optional[str] = None,
+        suppress=confirmType.OverwriteFile,
+    ) -> int:
+
+        return self._get_response(default_choice)
+
+    def selectFile(
+        self,
+        start_directory: Optional[str] = None,
+        title: Optional[str] = None,
+        collapse_sequences: bool = False,
+        file_type=fileType.Any,
+        pattern: Optional[str] = None,
+        default_value: Optional[str] = None,
+        multiple_select: bool = False,
+        image_chooser: bool = False,
+        chooser_mode=None,
+        width: int = 0,
+        height: int = 0,
+    ) -> str:
+
+        return self._get_response(default_value or "")
+
+    def displayMessage(self, text: str, *args, **kwargs) -> int:
+        return self._get_response(0)
+
+    def curDesktop(self) -> _Desktop:
+        return _Desktop()
+
+
+ui = _UI()
+
+
+class _HipFile:
+
+    def addEventCallback(self, callback) -> None:
+        stub.hip_file_callbacks.append(callback)
+
+    def removeEventCallback(self, callback) -> None:
+        stub.hip_file_callbacks.remove(callback)
+
+    def clear(self, suppress_save_prompt: bool = False) -> None:
+        for child in root.children():
+            for node in child.children():
+                node.destroy()
+
+        for callback in list(stub.hip_file_callbacks):
+            callback(hipFileEventType.AfterClear)
+
+
+hipFile = _HipFile()
+
+
+class _Text:
+
+    def expandString(self, text: str) -> str:
+        variables = dict(os.environ)
+        variables.update(stub.variables)
+
+        for name in sorted(variables, key=len, reverse=True):
+            text = text.replace(f"${{{name}}}", variables[name])
+            text = text.replace(f"${name}", variables[name])
+
+        return text
+
+
+text = _Text()
+
+
+class _Qt:
+
+    def mainWindow(self):
+        # There is no Houdini main window, the UIs become top level windows.
+        return None
+
+
+qt = _Qt()
+
+
+class _Stub:
+
+    def __init__(self) -> None:
+        self.session_id = 0
+        self.hip_file_callbacks = []
+
+        self.reset()
+
+    def reset(self) -> None:
+        self.selected_nodes = []
+        self.ui_responses = []
+        self.help_paths = []
+        self.undo_groups = []
+        self.parm_set_count = 0
+        self.variables = {"HIP": os.getcwd(), "JOB": os.getcwd()}
+
+        if "root" in globals():
+            for child in root.children():
+                child.destroy()
+
+            for name in ("obj", "out", "ch", "shop", "img", "mat", "stage", "tasks"):
+                root.createNode(name, name)
+
+    def push_ui_response(self, response: object) -> None:
+        self.ui_responses.append(response)
+
+    def create_wrangle_node(
+        self, node_type_name: str = "attribwrangle", snippet: str = ""
+    ) -> Node:
+
+        geometry_node = node("/obj").createNode("geo")
+        wrangle_node = geometry_node.createNode(node_type_name)
+
+        snippet_parm = wrangle_node.parm(
+            WRANGLE_SNIPPET_PARMS.get(node_type_name, "snippet")
+        )
+
+        if snippet_parm:
+            snippet_parm.set(snippet)
+
+        self.parm_set_count = 0
+
+        return wrangle_node
+
+
+stub = _Stub()
+root = Node(None, "", "root")
+stub.reset()
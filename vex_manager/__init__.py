@@ -1,8 +1,22 @@
+import importlib
 import logging
 
-from vex_manager.gui.vex_manager_ui import VEXManagerUI
-
-
 logging.basicConfig(format=f"%(levelname)s: [VEX Manager] %(message)s")
 logger = logging.getLogger("vex_manager")
 # logger.setLevel(logging.DEBUG)
+
+# The UIs need hou and PySide, they are imported when first used so the core
+# modules can be imported by tools running outside of Houdini.
+LAZY_ATTRIBUTES = {
+    "VEXManagerUI": "vex_manager.gui.vex_manager_ui",
+    "QuickOpenUI": "vex_manager.gui.quick_open_ui",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = LAZY_ATTRIBUTES.get(name)
+
+    if not module_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(module_name), name)
@@ -1,4 +1,77 @@
-from vex_manager.core.vex_manager import set_vex_code_in_selected_wrangle_node
+import importlib
 
 from vex_manager.core.file_manager import create_new_vex_file
 from vex_manager.core.file_manager import rename_vex_file
+from vex_manager.core.file_manager import save_vex_file
+from vex_manager.core.file_manager import get_vex_file_hash
+
+from vex_manager.core.completion_trie import CompletionTrie
+from vex_manager.core.completion_trie import get_declared_words
+from vex_manager.core.completion_trie import get_vex_syntaxis_trie
+
+from vex_manager.core.content_cache import ContentCache
+from vex_manager.core.content_cache import get_content_cache
+from vex_manager.core.content_cache import read_vex_file
+
+from vex_manager.core.document_state import load_document_state
+from vex_manager.core.document_state import remove_document_state
+from vex_manager.core.document_state import rename_document_state
+from vex_manager.core.document_state import save_document_state
+
+from vex_manager.core.library_index import LibraryIndex
+from vex_manager.core.library_index import find_library_index
+from vex_manager.core.library_index import get_library_index
+
+from vex_manager.core.library_watcher import LibraryWatcher
+from vex_manager.core.library_watcher import get_library_watcher
+from vex_manager.core.library_watcher import watch_library
+
+from vex_manager.core.mapped_vex_file import MappedVEXFile
+from vex_manager.core.mapped_vex_file import open_mapped_vex_file
+
+from vex_manager.core.recovery_journal import RecoveryJournal
+from vex_manager.core.recovery_journal import get_orphaned_recovery_journal_paths
+from vex_manager.core.recovery_journal import get_recovery_journal_paths
+from vex_manager.core.recovery_journal import remove_recovery_journal
+from vex_manager.core.recovery_journal import restore_recovery_journal
+
+from vex_manager.core.search_index import SearchIndex
+from vex_manager.core.search_index import get_search_index
+from vex_manager.core.search_index import search_vex_files
+
+from vex_manager.core.signature_index import SignatureIndex
+from vex_manager.core.signature_index import build_signature_index
+from vex_manager.core.signature_index import get_signature_index
+
+from vex_manager.core.symbol_index import SymbolIndex
+from vex_manager.core.symbol_index import get_symbol_index
+from vex_manager.core.symbol_index import get_symbols
+
+from vex_manager.core.vex_lexer import tokenize
+
+from vex_manager.core.vex_outline_table import VEXOutlineTable
+
+from vex_manager.core.vex_parser import VEXOutlineItem
+from vex_manager.core.vex_parser import parse
+
+# Needs hou, imported when first used so the rest of the package works
+# outside of Houdini.
+LAZY_ATTRIBUTES = {
+    "NodeTypeRegistry": "vex_manager.core.node_type_registry",
+    "get_node_type_registry": "vex_manager.core.node_type_registry",
+    "SceneSnippetIndex": "vex_manager.core.scene_snippet_index",
+    "get_scene_snippet_index": "vex_manager.core.scene_snippet_index",
+    "select_nodes_using_vex_code": "vex_manager.core.scene_snippet_index",
+    "set_vex_code_in_selected_wrangle_node": "vex_manager.core.vex_manager",
+    "set_vex_code_in_selected_wrangle_nodes": "vex_manager.core.vex_manager",
+    "set_vex_code_in_wrangle_nodes": "vex_manager.core.vex_manager",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = LAZY_ATTRIBUTES.get(name)
+
+    if not module_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(module_name), name)
@@ -0,0 +1,164 @@
+from collections import Counter
+from typing import Iterable
+from typing import Optional
+import threading
+import logging
+
+import vex_manager.core.vex_lexer as vex_lexer
+import vex_manager.core.vex_parser as vex_parser
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+DECLARED_WORD_KINDS = {
+    vex_parser.FUNCTION: vex_lexer.IDENTIFIER,
+    vex_parser.STRUCT: vex_lexer.TYPE,
+    vex_parser.DECLARATION: vex_lexer.IDENTIFIER,
+    vex_parser.ATTRIBUTE_READ: vex_lexer.ATTRIBUTE,
+    vex_parser.ATTRIBUTE_WRITE: vex_lexer.ATTRIBUTE,
+}
+
+_vex_syntaxis_trie = None
+_vex_syntaxis_trie_lock = threading.Lock()
+
+
+class TrieNode:
+    __slots__ = ("children", "kind", "count", "words")
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.kind = ""
+        self.count = 0
+
+        # Words below this node, built when first completed and dropped when
+        # a word below changes.
+        self.words = None
+
+
+class CompletionTrie:
+
+    def __init__(self, words: Iterable[tuple[str, str]] = ()) -> None:
+        self._root = TrieNode()
+        self._size = 0
+
+        for word, kind in words:
+            self.add(word, kind)
+
+    def _find_node(self, prefix: str) -> Optional[TrieNode]:
+        node = self._root
+
+        for char in prefix:
+            node = node.children.get(char)
+
+            if node is None:
+                return None
+
+        return node
+
+    def add(self, word: str, kind: str) -> None:
+        # Counted, the same name declared twice is removed twice.
+        node = self._root
+        node.words = None
+
+        for char in word:
+            node = node.children.setdefault(char, TrieNode())
+            node.words = None
+
+        if not node.count:
+            self._size += 1
+
+        node.kind = kind
+        node.count += 1
+
+    def remove(self, word: str) -> None:
+        path = [self._root]
+
+        for char in word:
+            node = path[-1].children.get(char)
+
+            if node is None:
+                return
+
+            path.append(node)
+
+        if not path[-1].count:
+            return
+
+        for node in path:
+            node.words = None
+
+        path[-1].count -= 1
+
+        if path[-1].count:
+            return
+
+        self._size -= 1
+
+        # Prunes the branches left without words.
+        for i in range(len(word), 0, -1):
+            if path[i].count or path[i].children:
+                break
+
+            del path[i - 1].children[word[i - 1]]
+
+    def get_kind(self, word: str) -> str:
+        node = self._find_node(word)
+
+        return node.kind if node and node.count else ""
+
+    def get_words(self, prefix: str) -> tuple[tuple[str, str], ...]:
+        node = self._find_node(prefix)
+
+        if node is None:
+            return ()
+
+        if node.words is None:
+            words = []
+            nodes = [(prefix, node)]
+
+            while nodes:
+                word, node_below = nodes.pop()
+
+                if node_below.count:
+                    words.append((word, node_below.kind))
+
+                nodes.extend(
+                    (word + char, child) for char, child in node_below.children.items()
+                )
+
+            node.words = tuple(words)
+
+        return node.words
+
+    def __contains__(self, word: str) -> bool:
+        return bool(self.get_kind(word))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def get_vex_syntaxis_trie() -> CompletionTrie:
+    global _vex_syntaxis_trie
+
+    # Built once, shared by every editor.
+    with _vex_syntaxis_trie_lock:
+        if _vex_syntaxis_trie is None:
+            _vex_syntaxis_trie = CompletionTrie(vex_lexer.IDENTIFIER_KINDS.items())
+
+    return _vex_syntaxis_trie
+
+
+def get_declared_words(vex_code: str) -> Counter:
+    # Attributes are completed after "@", they are stored with it.
+    words = Counter()
+
+    for item in vex_parser.parse(vex_code).walk():
+        kind = DECLARED_WORD_KINDS.get(item.kind)
+
+        if not kind or not item.name:
+            continue
+
+        word = f"@{item.name}" if kind == vex_lexer.ATTRIBUTE else item.name
+        words[(word, kind)] += 1
+
+    return words
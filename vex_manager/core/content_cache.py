@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from typing import Optional
+import threading
+import logging
+import os
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+MAX_CACHE_SIZE = 32 * 1024 * 1024
+
+_content_cache = None
+_content_cache_lock = threading.Lock()
+
+
+class ContentCache:
+
+    def __init__(self, max_size: int = MAX_CACHE_SIZE) -> None:
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def _remove(self, file_path: str) -> None:
+        entry = self._entries.pop(file_path, None)
+
+        if entry:
+            self._size -= entry[0]
+
+    def get(self, file_path: str) -> Optional[str]:
+        file_path = os.path.normpath(file_path)
+
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            with self._lock:
+                self._remove(file_path)
+
+            return None
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+
+            if not entry:
+                return None
+
+            # Changed on disk since it was cached.
+            if entry[:2] != (stat_result.st_size, stat_result.st_mtime_ns):
+                self._remove(file_path)
+
+                return None
+
+            self._entries.move_to_end(file_path)
+
+            return entry[2]
+
+    def put(
+        self,
+        file_path: str,
+        content: str,
+        stat_result: Optional[os.stat_result] = None,
+    ) -> None:
+
+        file_path = os.path.normpath(file_path)
+
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                return
+
+        size = stat_result.st_size
+
+        with self._lock:
+            self._remove(file_path)
+
+            if size > self.max_size // 4:
+                return
+
+            self._entries[file_path] = (size, stat_result.st_mtime_ns, content)
+            self._size += size
+
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def read(self, file_path: str) -> str:
+        content = self.get(file_path)
+
+        if content is None:
+            # Stat before reading, a file changed while read is read again.
+            stat_result = os.stat(file_path)
+
+            with open(file_path, "rb") as file_for_read:
+                content = file_for_read.read().decode("utf-8", errors="replace")
+
+            self.put(file_path, content, stat_result)
+
+        return content
+
+    def discard(self, file_path: str) -> None:
+        with self._lock:
+            self._remove(os.path.normpath(file_path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __contains__(self, file_path: str) -> bool:
+        with self._lock:
+            return os.path.normpath(file_path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_content_cache() -> ContentCache:
+    global _content_cache
+
+    with _content_cache_lock:
+        if _content_cache is None:
+            _content_cache = ContentCache()
+
+    return _content_cache
+
+
+def read_vex_file(file_path: str) -> str:
+    return get_content_cache().read(file_path)
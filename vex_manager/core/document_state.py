@@ -0,0 +1,112 @@
+from typing import Optional
+import tempfile
+import logging
+import json
+import os
+
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+
+def get_document_state_path(file_path: str) -> str:
+    # One small file per snippet, named after its path.
+    name = utils.get_content_hash(os.path.normpath(file_path).encode("utf-8"))
+
+    return os.path.join(utils.get_document_states_path(), f"{name}.json")
+
+
+def save_document_state(
+    file_path: str,
+    cursor_position: int = 0,
+    anchor_position: int = 0,
+    scroll_value: int = 0,
+    content: Optional[str] = None,
+) -> bool:
+
+    # The content is only kept when it has unsaved edits, the snippet on disk
+    # has the rest.
+    state = {
+        "file_path": os.path.normpath(file_path),
+        "cursor_position": cursor_position,
+        "anchor_position": anchor_position,
+        "scroll_value": scroll_value,
+        "content": content,
+    }
+
+    state_path = get_document_state_path(file_path)
+    folder_path = os.path.dirname(state_path)
+
+    try:
+        os.makedirs(folder_path, exist_ok=True)
+
+        file_descriptor, temp_file_path = tempfile.mkstemp(
+            prefix=".state.", suffix=".tmp", dir=folder_path
+        )
+    except OSError as error:
+        logger.error(f"Could not save the state of {file_path!r}: {error}")
+
+        return False
+
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file_to_write:
+            json.dump(state, file_to_write)
+
+        os.replace(temp_file_path, state_path)
+    except OSError as error:
+        logger.error(f"Could not save the state of {file_path!r}: {error}")
+
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+
+        return False
+
+    return True
+
+
+def load_document_state(file_path: str) -> Optional[dict]:
+    state_path = get_document_state_path(file_path)
+
+    if not os.path.exists(state_path):
+        return None
+
+    try:
+        with open(state_path, "r", encoding="utf-8") as file_for_read:
+            state = json.load(file_for_read)
+    except (OSError, ValueError) as error:
+        logger.error(f"Could not read the state of {file_path!r}: {error}")
+
+        return None
+
+    if state.get("file_path") != os.path.normpath(file_path):
+        return None
+
+    return state
+
+
+def remove_document_state(file_path: str) -> None:
+    try:
+        os.remove(get_document_state_path(file_path))
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        logger.error(f"Could not remove the state of {file_path!r}: {error}")
+
+
+def rename_document_state(file_path: str, new_file_path: str) -> None:
+    state = load_document_state(file_path)
+
+    if state is None:
+        return
+
+    remove_document_state(file_path)
+    save_document_state(
+        new_file_path,
+        state["cursor_position"],
+        state["anchor_position"],
+        state["scroll_value"],
+        state["content"],
+    )
@@ -1,30 +1,123 @@
-from pathlib import Path
+import tempfile
 import logging
-import glob
+import stat
 import os
 
+import vex_manager.core.library_index as library_index
+import vex_manager.core.content_cache as content_cache
 import vex_manager.utils as utils
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
-FILE_EXTENSION = ".vfl"
+FILE_EXTENSION = library_index.FILE_EXTENSION
+
+NEW_FILE_MODE = 0o644
 
 
 def create_new_vex_file(parent_path: str, name: str = "") -> str:
     vex_file_path = os.path.join(parent_path, f"{name}{FILE_EXTENSION}")
 
-    if os.path.exists(vex_file_path):
+    index = library_index.find_library_index(vex_file_path)
+
+    if index and index.exists(vex_file_path):
+        logger.warning(f"{name} already exists.")
+        return vex_file_path
+
+    try:
+        open(vex_file_path, "x").close()
+    except FileExistsError:
         logger.warning(f"{name} already exists.")
         return vex_file_path
 
-    open(vex_file_path, "w").close()
+    if index:
+        index.add_vex_file(vex_file_path, b"")
 
     logger.debug(f"{vex_file_path!r} created.")
 
     return vex_file_path
 
 
+def get_vex_file_hash(file_path: str) -> str:
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return ""
+
+    # The indexed hash is trusted while size and mtime still match the file.
+    index = library_index.find_library_index(file_path)
+    record = index.get_file_record(file_path) if index else None
+
+    if (
+        record
+        and record["size"] == stat_result.st_size
+        and record["mtime"] == stat_result.st_mtime
+    ):
+        return record["hash"]
+
+    try:
+        with open(file_path, "rb") as file_for_read:
+            return utils.get_content_hash(file_for_read.read())
+    except OSError:
+        return ""
+
+
+def save_vex_file(file_path: str, content: str) -> bool:
+    data = content.encode("utf-8")
+
+    if get_vex_file_hash(file_path) == utils.get_content_hash(data):
+        logger.debug(f"{file_path!r} is unchanged.")
+
+        return True
+
+    folder_path, file_name = os.path.split(file_path)
+
+    try:
+        file_mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        file_mode = NEW_FILE_MODE
+
+    # Written next to the target and renamed over it, a crash or a full disk
+    # never leaves a half-written snippet.
+    try:
+        file_descriptor, temp_file_path = tempfile.mkstemp(
+            prefix=f".{file_name}.", suffix=".tmp", dir=folder_path
+        )
+    except OSError as error:
+        logger.error(f"Could not save {file_path!r}: {error}")
+
+        return False
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as file_to_write:
+            file_to_write.write(data)
+            file_to_write.flush()
+            os.fsync(file_to_write.fileno())
+
+        os.chmod(temp_file_path, file_mode)
+        os.replace(temp_file_path, file_path)
+    except OSError as error:
+        logger.error(f"Could not save {file_path!r}: {error}")
+
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+
+        return False
+
+    content_cache.get_content_cache().put(file_path, content)
+
+    index = library_index.find_library_index(file_path)
+
+    if index:
+        index.add_vex_file(file_path, data)
+
+    logger.debug(f"{file_path!r} saved.")
+
+    return True
+
+
 def rename_vex_file(file_path: str, new_name: str) -> str:
     if not new_name.endswith(FILE_EXTENSION):
         new_name = f"{new_name}{FILE_EXTENSION}"
@@ -43,24 +136,26 @@ def rename_vex_file(file_path: str, new_name: str) -> str:
         logger.error(f"{file_path!r} is a directory.")
     else:
         library_path = os.path.dirname(file_path)
-
-        for file in glob.glob(os.path.join(library_path, "*")):
-            if new_name == Path(file).stem:
-                logger.error(f"{file_path!r} already exists.")
-
         new_file_path = os.path.join(library_path, new_name)
 
+        index = library_index.find_library_index(file_path)
+
         if os.path.normpath(new_file_path) == os.path.normpath(file_path):
             new_file_path = file_path
 
             logger.debug(f"{new_file_path!r} is the same name.")
-        elif os.path.exists(new_file_path):
-            new_file_path = file_path
-
+        elif (
+            index and index.find_vex_file(library_path, os.path.splitext(new_name)[0])
+        ) or os.path.exists(new_file_path):
             logger.error(f"{new_file_path!r} already exists.")
+
+            new_file_path = file_path
         else:
             os.rename(file_path, new_file_path)
 
+            if index:
+                index.rename_path(file_path, new_file_path)
+
             logger.debug(f"Renamed file {file_path!r} -> {new_file_path!r}")
 
     return new_file_path
@@ -0,0 +1,271 @@
+from typing import Iterable
+from typing import Optional
+import bisect
+import logging
+import time
+import os
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+MAX_CANDIDATES = 1000
+
+MAX_MATCH_TIME = 0.003
+
+NAME_GRAM_SIZE = 3
+
+
+def get_fuzzy_score(query: str, text: str, name_start: int) -> Optional[int]:
+    # Greedy subsequence match rewarding contiguous runs, word starts and
+    # matches inside the file name over matches in its folders.
+    score = 0
+    position = -1
+    run = 0
+
+    for char in query:
+        index = text.find(char, position + 1)
+
+        if index < 0:
+            return None
+
+        if index == position + 1:
+            run += 1
+            score += 4 * run
+        else:
+            run = 0
+
+        if index == 0 or not text[index - 1].isalnum():
+            score += 6
+
+        if index >= name_start:
+            score += 3
+
+        position = index
+
+    name = text[name_start:]
+
+    if name.startswith(query):
+        score += 100
+    elif query in name:
+        score += 50
+
+    return score - len(text) // 8
+
+
+class FuzzyMatcher:
+
+    def __init__(self, library_path: str, file_paths: Iterable[str]) -> None:
+        self.library_path = library_path
+
+        self.file_paths = []
+        self._texts = []
+        self._name_starts = []
+        self._names = []
+        self._char_indexes = {}
+
+        for index, file_path in enumerate(sorted(file_paths)):
+            relative_path = os.path.relpath(file_path, library_path)
+            text = os.path.splitext(relative_path)[0].replace(os.sep, "/").lower()
+            name_start = text.rfind("/") + 1
+
+            self.file_paths.append(file_path)
+            self._texts.append(text)
+            self._name_starts.append(name_start)
+            self._names.append(text[name_start:])
+
+            for char in set(text):
+                indexes = self._char_indexes.get(char)
+
+                if indexes is None:
+                    self._char_indexes[char] = {index}
+                else:
+                    indexes.add(index)
+
+        self._sorted_names = sorted(
+            (name, index) for index, name in enumerate(self._names)
+        )
+
+        # Shortest paths first, they score higher than longer ones holding the
+        # query the same way.
+        self._indexes_by_length = sorted(
+            range(len(self._texts)), key=lambda index: len(self._texts[index])
+        )
+
+        # Ranks in that order by the trigrams of the file names, the names
+        # holding the query are found without going through the library.
+        self._name_gram_ranks = {}
+
+        for rank, index in enumerate(self._indexes_by_length):
+            name = self._names[index]
+
+            for gram in {
+                name[position : position + NAME_GRAM_SIZE]
+                for position in range(len(name) - NAME_GRAM_SIZE + 1)
+            }:
+                ranks = self._name_gram_ranks.get(gram)
+
+                if ranks is None:
+                    self._name_gram_ranks[gram] = {rank}
+                else:
+                    ranks.add(rank)
+
+        self._last_query = ""
+        self._last_candidates = None
+
+    def _get_candidates(self, query: str) -> set[int]:
+        if self._last_candidates is not None and query.startswith(self._last_query):
+            # Typing narrows the previous result, so only new characters are
+            # intersected.
+            candidates = self._last_candidates
+            chars = set(query[len(self._last_query) :])
+        else:
+            candidates = None
+            chars = set(query)
+
+        for char in sorted(
+            chars, key=lambda char: len(self._char_indexes.get(char, ()))
+        ):
+            indexes = self._char_indexes.get(char)
+
+            if not indexes:
+                return set()
+
+            if candidates is None:
+                candidates = indexes
+            else:
+                candidates = candidates & indexes
+
+        return candidates
+
+    def _get_name_prefix_matches(
+        self, query: str, candidates: Optional[set[int]] = None
+    ) -> list[int]:
+
+        indexes = []
+
+        position = bisect.bisect_left(self._sorted_names, (query, -1))
+
+        while position < len(self._sorted_names) and len(indexes) < MAX_CANDIDATES:
+            name, index = self._sorted_names[position]
+
+            if not name.startswith(query):
+                break
+
+            if candidates is None or index in candidates:
+                indexes.append(index)
+
+            position += 1
+
+        return indexes
+
+    def _get_name_matches(
+        self, name_query: str, candidates: Optional[set[int]] = None
+    ) -> list[int]:
+
+        # Name prefix matches score highest, then the shortest paths whose
+        # name holds the query. Candidates narrow them to the folders queried.
+        indexes = self._get_name_prefix_matches(name_query, candidates)
+
+        if len(name_query) < NAME_GRAM_SIZE:
+            return indexes
+
+        grams = {
+            name_query[position : position + NAME_GRAM_SIZE]
+            for position in range(len(name_query) - NAME_GRAM_SIZE + 1)
+        }
+        ranks = None
+
+        for gram in sorted(
+            grams, key=lambda gram: len(self._name_gram_ranks.get(gram, ()))
+        ):
+            gram_ranks = self._name_gram_ranks.get(gram)
+
+            if not gram_ranks:
+                return indexes
+
+            if ranks is None:
+                ranks = gram_ranks
+            else:
+                ranks = ranks & gram_ranks
+
+        prefix_indexes = set(indexes)
+
+        for rank in sorted(ranks):
+            if len(indexes) >= MAX_CANDIDATES:
+                break
+
+            index = self._indexes_by_length[rank]
+
+            if index in prefix_indexes or (
+                candidates is not None and index not in candidates
+            ):
+                continue
+
+            # Names sharing the trigrams can still hold them apart.
+            if name_query in self._names[index]:
+                indexes.append(index)
+
+        return indexes
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    def match(self, query: str, limit: int = 50) -> list[str]:
+        query = query.lower().replace("\\", "/").replace(" ", "")
+
+        if not query:
+            self._last_query = ""
+            self._last_candidates = None
+
+            return self.file_paths[:limit]
+
+        end_time = time.perf_counter() + MAX_MATCH_TIME
+
+        name_query = query[query.rfind("/") + 1 :]
+
+        if name_query != query:
+            candidates = self._get_candidates(query)
+        else:
+            candidates = None
+
+        # Files whose name holds the query are scored first, wherever they sort
+        # in the library, the time budget never drops them.
+        name_indexes = self._get_name_matches(name_query, candidates)
+
+        scored_candidates = []
+        scored_indexes = set(name_indexes)
+
+        for index in name_indexes:
+            score = get_fuzzy_score(query, self._texts[index], self._name_starts[index])
+
+            if score is not None:
+                scored_candidates.append((-score, index))
+
+        # Candidates only share characters with the query, the score checks
+        # their order. They fill the rest within the time budget.
+        if candidates is None and len(scored_indexes) < MAX_CANDIDATES:
+            candidates = self._get_candidates(query)
+
+        self._last_query = query
+        self._last_candidates = candidates
+
+        for index in candidates or ():
+            if len(scored_indexes) >= MAX_CANDIDATES:
+                break
+
+            if not len(scored_indexes) % 64 and time.perf_counter() > end_time:
+                break
+
+            if index in scored_indexes:
+                continue
+
+            scored_indexes.add(index)
+
+            score = get_fuzzy_score(query, self._texts[index], self._name_starts[index])
+
+            if score is not None:
+                scored_candidates.append((-score, index))
+
+        scored_candidates.sort()
+
+        return [self.file_paths[index] for score, index in scored_candidates[:limit]]
@@ -0,0 +1,536 @@
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+import threading
+import logging
+import sqlite3
+import os
+
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+FILE_EXTENSION = ".vfl"
+
+SCHEMA_VERSION = 2
+
+MAX_CONTENT_SIZE = 1024 * 1024
+
+SQLITE_MAX_VARIABLES = 900
+
+_library_indexes = {}
+_library_indexes_lock = threading.Lock()
+
+
+class LibraryIndex:
+
+    def __init__(self, library_path: str, index_path: str = "") -> None:
+        self.library_path = os.path.normpath(library_path)
+        self.index_path = index_path or utils.get_library_index_path()
+
+        self._lock = threading.RLock()
+        self._callbacks = []
+
+        index_folder_path = os.path.dirname(self.index_path)
+
+        if index_folder_path and not os.path.exists(index_folder_path):
+            os.makedirs(index_folder_path)
+
+        self._connection = sqlite3.connect(
+            self.index_path, timeout=30, check_same_thread=False
+        )
+
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if version != SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS files")
+                self._connection.execute("DROP TABLE IF EXISTS folders")
+
+                logger.debug(f"Library index schema updated to {SCHEMA_VERSION}.")
+
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS folders ("
+                "path TEXT PRIMARY KEY, parent TEXT, mtime REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "id INTEGER PRIMARY KEY, path TEXT UNIQUE, folder TEXT, name TEXT, "
+                "size INTEGER, mtime REAL, hash TEXT, content TEXT)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS files_folder ON files (folder, name)"
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _notify(self, file_path: str, content: Optional[bytes]) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(file_path, content)
+            except Exception:
+                logger.exception(f"Library index callback failed for {file_path!r}.")
+
+    def _is_in_library(self, path: str) -> bool:
+        path = os.path.normpath(path)
+
+        return path == self.library_path or path.startswith(self.library_path + os.sep)
+
+    def _get_indexed_subtree(self, table: str, path: str) -> list:
+        prefix = path + os.sep
+
+        return self._connection.execute(
+            f"SELECT * FROM {table} WHERE path = ? OR substr(path, 1, ?) = ?",
+            (path, len(prefix), prefix),
+        ).fetchall()
+
+    def _index_file(
+        self,
+        file_path: str,
+        stat_result: os.stat_result,
+        content: Optional[bytes] = None,
+    ) -> bytes:
+
+        if content is None:
+            with open(file_path, "rb") as file_for_read:
+                content = file_for_read.read()
+
+        folder_path, file_name = os.path.split(file_path)
+
+        if len(content) <= MAX_CONTENT_SIZE:
+            text = content.decode("utf-8", errors="replace")
+        else:
+            text = None
+
+        self._connection.execute(
+            "INSERT INTO files (path, folder, name, size, mtime, hash, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (path) DO UPDATE SET "
+            "size = excluded.size, mtime = excluded.mtime, hash = excluded.hash, "
+            "content = excluded.content",
+            (
+                file_path,
+                folder_path,
+                os.path.splitext(file_name)[0],
+                stat_result.st_size,
+                stat_result.st_mtime,
+                utils.get_content_hash(content),
+                text,
+            ),
+        )
+
+        return content
+
+    def _index_folder(self, folder_path: str, mtime: float) -> None:
+        self._connection.execute(
+            "INSERT INTO folders (path, parent, mtime) VALUES (?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET mtime = excluded.mtime",
+            (folder_path, os.path.dirname(folder_path), mtime),
+        )
+
+    def _scan_folder(
+        self, folder_path: str
+    ) -> tuple[list[str], dict[str, Optional[bytes]]]:
+
+        changes = {}
+
+        indexed_files = {
+            path: (size, mtime)
+            for path, size, mtime in self._connection.execute(
+                "SELECT path, size, mtime FROM files WHERE folder = ?", (folder_path,)
+            )
+        }
+
+        folder_paths = []
+        file_paths = set()
+
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    folder_paths.append(os.path.normpath(entry.path))
+                elif entry.name.endswith(FILE_EXTENSION):
+                    file_path = os.path.normpath(entry.path)
+                    file_paths.add(file_path)
+
+                    try:
+                        stat_result = entry.stat()
+
+                        if indexed_files.get(file_path) == (
+                            stat_result.st_size,
+                            stat_result.st_mtime,
+                        ):
+                            continue
+
+                        changes[file_path] = self._index_file(file_path, stat_result)
+                    except OSError as error:
+                        logger.warning(f"Could not index {file_path!r}: {error}")
+
+        for file_path in set(indexed_files) - file_paths:
+            self._connection.execute("DELETE FROM files WHERE path = ?", (file_path,))
+            changes[file_path] = None
+
+        return folder_paths, changes
+
+    def add_callback(self, callback: Callable[[str, Optional[bytes]], None]) -> None:
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[str, Optional[bytes]], None]) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def _update_folder_tree(
+        self, root_path: str, deep: bool = False
+    ) -> dict[str, Optional[bytes]]:
+
+        changes = {}
+
+        indexed_folders = {
+            path: mtime
+            for path, parent, mtime in self._get_indexed_subtree("folders", root_path)
+        }
+
+        visited_folder_paths = set()
+        folder_paths = [root_path]
+
+        while folder_paths:
+            folder_path = folder_paths.pop()
+            visited_folder_paths.add(folder_path)
+
+            try:
+                mtime = os.stat(folder_path).st_mtime
+            except OSError:
+                continue
+
+            if not deep and indexed_folders.get(folder_path) == mtime:
+                # Nothing was added, removed or renamed inside this folder.
+                folder_paths.extend(
+                    path
+                    for (path,) in self._connection.execute(
+                        "SELECT path FROM folders WHERE parent = ?",
+                        (folder_path,),
+                    )
+                )
+
+                continue
+
+            child_folder_paths, folder_changes = self._scan_folder(folder_path)
+            folder_paths.extend(child_folder_paths)
+            changes.update(folder_changes)
+
+            self._index_folder(folder_path, mtime)
+
+            for (path,) in self._connection.execute(
+                "SELECT path FROM folders WHERE parent = ?", (folder_path,)
+            ).fetchall():
+                if path not in child_folder_paths:
+                    changes.update(self._remove_path(path))
+
+        for folder_path in set(indexed_folders) - visited_folder_paths:
+            changes.update(self._remove_path(folder_path))
+
+        return changes
+
+    def _update_file(self, file_path: str) -> dict[str, Optional[bytes]]:
+        try:
+            stat_result = os.stat(file_path)
+
+            row = self._connection.execute(
+                "SELECT size, mtime FROM files WHERE path = ?", (file_path,)
+            ).fetchone()
+
+            if row == (stat_result.st_size, stat_result.st_mtime):
+                return {}
+
+            return {file_path: self._index_file(file_path, stat_result)}
+        except OSError as error:
+            logger.warning(f"Could not index {file_path!r}: {error}")
+
+            return self._remove_path(file_path)
+
+    def update(self, deep: bool = False) -> list[str]:
+        if not os.path.isdir(self.library_path):
+            logger.error(f"Library path {self.library_path!r} does not exist.")
+
+            return []
+
+        with self._lock, self._connection:
+            changes = self._update_folder_tree(self.library_path, deep)
+
+        for file_path, content in changes.items():
+            self._notify(file_path, content)
+
+        logger.debug(f"Library index updated, {len(changes)} changes.")
+
+        return list(changes)
+
+    def update_paths(self, paths: Iterable[str]) -> list[str]:
+        changes = {}
+        updated_folder_paths = []
+
+        with self._lock, self._connection:
+            # Sorted, folders are updated before anything inside them.
+            for path in sorted({os.path.normpath(path) for path in paths}):
+                if not self._is_in_library(path):
+                    continue
+
+                if any(
+                    path.startswith(folder_path + os.sep)
+                    for folder_path in updated_folder_paths
+                ):
+                    continue
+
+                folder_path = os.path.dirname(path)
+
+                if os.path.isdir(path):
+                    changes.update(self._update_folder_tree(path, deep=True))
+                    updated_folder_paths.append(path)
+                elif not path.endswith(FILE_EXTENSION) or not os.path.exists(path):
+                    changes.update(self._remove_path(path))
+                elif not self._connection.execute(
+                    "SELECT 1 FROM folders WHERE path = ?", (folder_path,)
+                ).fetchone():
+                    # Unknown folder, indexed as a whole.
+                    changes.update(self._update_folder_tree(folder_path, deep=True))
+                    updated_folder_paths.append(folder_path)
+                else:
+                    changes.update(self._update_file(path))
+
+        for file_path, content in changes.items():
+            self._notify(file_path, content)
+
+        logger.debug(f"Library index paths updated, {len(changes)} changes.")
+
+        return list(changes)
+
+    def _remove_path(self, path: str) -> dict[str, None]:
+        changes = {}
+
+        for row in self._get_indexed_subtree("files", path):
+            changes[row[1]] = None
+
+        # Removed folders are reported after their files.
+        for row in self._get_indexed_subtree("folders", path):
+            changes[row[0]] = None
+
+        prefix = path + os.sep
+
+        for table in ("files", "folders"):
+            self._connection.execute(
+                f"DELETE FROM {table} WHERE path = ? OR substr(path, 1, ?) = ?",
+                (path, len(prefix), prefix),
+            )
+
+        return changes
+
+    def add_folder(self, folder_path: str) -> None:
+        folder_path = os.path.normpath(folder_path)
+
+        if not self._is_in_library(folder_path):
+            return
+
+        with self._lock, self._connection:
+            self._index_folder(folder_path, os.stat(folder_path).st_mtime)
+
+            parent_path = os.path.dirname(folder_path)
+
+            if self._is_in_library(parent_path):
+                self._index_folder(parent_path, os.stat(parent_path).st_mtime)
+
+    def add_vex_file(self, file_path: str, content: Optional[bytes] = None) -> None:
+        file_path = os.path.normpath(file_path)
+
+        if not self._is_in_library(file_path):
+            return
+
+        with self._lock, self._connection:
+            content = self._index_file(file_path, os.stat(file_path), content)
+
+            folder_path = os.path.dirname(file_path)
+            self._index_folder(folder_path, os.stat(folder_path).st_mtime)
+
+        self._notify(file_path, content)
+
+    def remove_path(self, path: str) -> None:
+        path = os.path.normpath(path)
+
+        with self._lock, self._connection:
+            changes = self._remove_path(path)
+
+            parent_path = os.path.dirname(path)
+
+            if self._is_in_library(parent_path) and os.path.exists(parent_path):
+                self._index_folder(parent_path, os.stat(parent_path).st_mtime)
+
+        for file_path in changes:
+            self._notify(file_path, None)
+
+    def rename_path(self, path: str, new_path: str) -> None:
+        self.remove_path(path)
+
+        if os.path.isdir(new_path):
+            self.add_folder(new_path)
+            self.update()
+        else:
+            self.add_vex_file(new_path)
+
+    def exists(self, path: str) -> bool:
+        path = os.path.normpath(path)
+
+        with self._lock:
+            for table in ("files", "folders"):
+                row = self._connection.execute(
+                    f"SELECT 1 FROM {table} WHERE path = ?", (path,)
+                ).fetchone()
+
+                if row:
+                    return True
+
+        return False
+
+    def find_vex_file(self, folder_path: str, name: str) -> str:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT path FROM files WHERE folder = ? AND name = ?",
+                (os.path.normpath(folder_path), name),
+            ).fetchone()
+
+        return row[0] if row else ""
+
+    def find_vex_files_containing(
+        self, text: str, file_ids: Optional[list[int]] = None, limit: int = 0
+    ) -> list[str]:
+
+        file_paths = []
+
+        with self._lock:
+            # SQLite stops reading once the limit is reached, -1 is no limit.
+            if file_ids is None:
+                prefix = self.library_path + os.sep
+                rows = self._connection.execute(
+                    "SELECT path FROM files WHERE substr(path, 1, ?) = ? "
+                    "AND instr(content, ?) ORDER BY path LIMIT ?",
+                    (len(prefix), prefix, text, limit or -1),
+                ).fetchall()
+                file_paths = [row[0] for row in rows]
+            else:
+                for i in range(0, len(file_ids), SQLITE_MAX_VARIABLES):
+                    chunk = file_ids[i : i + SQLITE_MAX_VARIABLES]
+                    rows = self._connection.execute(
+                        f"SELECT path FROM files WHERE id IN "
+                        f"({', '.join('?' * len(chunk))}) AND instr(content, ?) "
+                        f"LIMIT ?",
+                        (*chunk, text, limit - len(file_paths) if limit else -1),
+                    ).fetchall()
+                    file_paths.extend(row[0] for row in rows)
+
+                    if limit and len(file_paths) >= limit:
+                        break
+
+                file_paths.sort()
+
+        if limit:
+            file_paths = file_paths[:limit]
+
+        return file_paths
+
+    def get_contents(self) -> list[tuple[int, str]]:
+        prefix = self.library_path + os.sep
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, content FROM files WHERE substr(path, 1, ?) = ? "
+                "AND content IS NOT NULL",
+                (len(prefix), prefix),
+            ).fetchall()
+
+        return rows
+
+    def get_file_id(self, file_path: str) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id FROM files WHERE path = ?", (os.path.normpath(file_path),)
+            ).fetchone()
+
+        return row[0] if row else -1
+
+    def get_file_record(self, file_path: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT path, size, mtime, hash FROM files WHERE path = ?",
+                (os.path.normpath(file_path),),
+            ).fetchone()
+
+        if row:
+            return {"path": row[0], "size": row[1], "mtime": row[2], "hash": row[3]}
+
+        return None
+
+    def get_folders(self, folder_path: str = "", recursive: bool = False) -> list[str]:
+        folder_path = os.path.normpath(folder_path or self.library_path)
+
+        with self._lock:
+            if recursive:
+                rows = self._get_indexed_subtree("folders", folder_path)
+                folder_paths = sorted(row[0] for row in rows if row[0] != folder_path)
+            else:
+                rows = self._connection.execute(
+                    "SELECT path FROM folders WHERE parent = ? ORDER BY path",
+                    (folder_path,),
+                ).fetchall()
+                folder_paths = [row[0] for row in rows]
+
+        return folder_paths
+
+    def get_vex_files(
+        self, folder_path: str = "", recursive: bool = False
+    ) -> list[str]:
+        folder_path = os.path.normpath(folder_path or self.library_path)
+
+        with self._lock:
+            if recursive:
+                rows = self._get_indexed_subtree("files", folder_path)
+                file_paths = sorted(row[1] for row in rows)
+            else:
+                rows = self._connection.execute(
+                    "SELECT path FROM files WHERE folder = ? ORDER BY name",
+                    (folder_path,),
+                ).fetchall()
+                file_paths = [row[0] for row in rows]
+
+        return file_paths
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def get_library_index(library_path: str) -> LibraryIndex:
+    library_path = os.path.normpath(library_path)
+
+    with _library_indexes_lock:
+        library_index = _library_indexes.get(library_path)
+
+        if not library_index:
+            library_index = LibraryIndex(library_path)
+            _library_indexes[library_path] = library_index
+
+    return library_index
+
+
+def find_library_index(path: str) -> Optional[LibraryIndex]:
+    path = os.path.normpath(path)
+
+    with _library_indexes_lock:
+        library_indexes = list(_library_indexes.values())
+
+    for library_index in library_indexes:
+        if library_index._is_in_library(path):
+            return library_index
+
+    return None
@@ -0,0 +1,435 @@
+from typing import Optional
+import threading
+import logging
+import select
+import struct
+import ctypes
+import ctypes.util
+import errno
+import time
+import sys
+import os
+
+import vex_manager.core.library_index as library_index
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+# inotify only reports changes made by this machine, changes made by other
+# hosts on these file systems are polled.
+NETWORK_FILE_SYSTEMS = frozenset(
+    (
+        "9p",
+        "afs",
+        "ceph",
+        "cifs",
+        "fuse.sshfs",
+        "glusterfs",
+        "gpfs",
+        "lustre",
+        "ncpfs",
+        "nfs",
+        "nfs4",
+        "smb3",
+        "smbfs",
+    )
+)
+
+COALESCE_DELAY = 0.2
+MAX_COALESCE_DELAY = 2.0
+
+MIN_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 60.0
+DEEP_POLL_COUNT = 10
+
+_library_watchers = {}
+_library_watchers_lock = threading.Lock()
+
+
+def get_file_system_type(path: str) -> str:
+    if not sys.platform.startswith("linux"):
+        return ""
+
+    path = os.path.realpath(path)
+    mount_point = ""
+    file_system_type = ""
+
+    try:
+        with open("/proc/mounts", "r") as file_for_read:
+            for line in file_for_read:
+                fields = line.split()
+
+                if len(fields) < 3:
+                    continue
+
+                # Spaces in mount points are escaped as octal.
+                point = fields[1].replace("\\040", " ")
+
+                if (path == point or path.startswith(point.rstrip("/") + "/")) and len(
+                    point
+                ) >= len(mount_point):
+                    mount_point = point
+                    file_system_type = fields[2]
+    except OSError:
+        return ""
+
+    return file_system_type
+
+
+def is_network_file_system(path: str) -> bool:
+    return get_file_system_type(path) in NETWORK_FILE_SYSTEMS
+
+
+class Inotify:
+
+    def __init__(self) -> None:
+        library_path = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library_path, use_errno=True)
+
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.file_descriptor = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self.file_descriptor < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        watch_descriptor = self._libc.inotify_add_watch(
+            self.file_descriptor, os.fsencode(path), mask
+        )
+
+        if watch_descriptor < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number), path)
+
+        return watch_descriptor
+
+    def remove_watch(self, watch_descriptor: int) -> None:
+        self._libc.inotify_rm_watch(self.file_descriptor, watch_descriptor)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        try:
+            data = os.read(self.file_descriptor, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+
+        while offset + INOTIFY_EVENT.size <= len(data):
+            watch_descriptor, mask, cookie, length = INOTIFY_EVENT.unpack_from(
+                data, offset
+            )
+            offset += INOTIFY_EVENT.size
+
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            events.append((watch_descriptor, mask, os.fsdecode(name)))
+
+        return events
+
+    def close(self) -> None:
+        os.close(self.file_descriptor)
+
+
+class InotifyWatches:
+
+    def __init__(self, inotify: Inotify, index: library_index.LibraryIndex) -> None:
+        self.inotify = inotify
+        self.library_index = index
+
+        self.watched_paths = {}
+        self.watch_descriptors = {}
+
+    def add_watch(self, folder_path: str) -> bool:
+        if folder_path in self.watch_descriptors:
+            return True
+
+        try:
+            watch_descriptor = self.inotify.add_watch(folder_path, INOTIFY_MASK)
+        except OSError as error:
+            if error.errno == errno.ENOSPC:
+                logger.warning(
+                    f"Out of inotify watches, polling "
+                    f"{self.library_index.library_path!r} instead."
+                )
+
+                return False
+
+            # Removed before it could be watched, the next event reports it.
+            return True
+
+        self.watched_paths[watch_descriptor] = folder_path
+        self.watch_descriptors[folder_path] = watch_descriptor
+
+        return True
+
+    def add_watches(self, folder_path: str) -> bool:
+        folder_paths = [folder_path]
+        folder_paths.extend(self.library_index.get_folders(folder_path, recursive=True))
+
+        return all(self.add_watch(path) for path in folder_paths)
+
+    def remove_watch(self, watch_descriptor: int) -> None:
+        folder_path = self.watched_paths.pop(watch_descriptor, None)
+
+        if folder_path is not None:
+            self.watch_descriptors.pop(folder_path, None)
+
+    def remove_watches(self, folder_path: str) -> None:
+        # Moved folders keep their watches, they would report the old paths.
+        prefix = folder_path + os.sep
+
+        for path, watch_descriptor in list(self.watch_descriptors.items()):
+            if path == folder_path or path.startswith(prefix):
+                self.inotify.remove_watch(watch_descriptor)
+                self.remove_watch(watch_descriptor)
+
+    def close(self) -> None:
+        self.inotify.close()
+
+        self.watched_paths.clear()
+        self.watch_descriptors.clear()
+
+
+class LibraryWatcher:
+
+    def __init__(self, index: library_index.LibraryIndex) -> None:
+        self.library_index = index
+        self.library_path = index.library_path
+
+        # Each run has its own, a stopped run still updating the index ends
+        # on its own while a new one starts.
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _create_inotify(self) -> Optional[Inotify]:
+        if not sys.platform.startswith("linux"):
+            return None
+
+        if is_network_file_system(self.library_path):
+            logger.debug(f"{self.library_path!r} is a network file system.")
+
+            return None
+
+        try:
+            return Inotify()
+        except (OSError, AttributeError) as error:
+            logger.warning(f"Could not use inotify, polling instead: {error}")
+
+            return None
+
+    def _update(self, deep: bool = False) -> list[str]:
+        try:
+            return self.library_index.update(deep=deep)
+        except Exception:
+            logger.exception(f"Could not update {self.library_path!r}.")
+
+            return []
+
+    def _update_paths(self, paths: set[str]) -> None:
+        try:
+            self.library_index.update_paths(paths)
+        except Exception:
+            logger.exception(f"Could not update {self.library_path!r}.")
+
+    def _watch(self, watches: InotifyWatches, stop_event: threading.Event) -> bool:
+        if not watches.add_watches(self.library_path):
+            return False
+
+        changed_paths = set()
+        first_change_time = 0.0
+        last_change_time = 0.0
+
+        while not stop_event.is_set():
+            readable, _, _ = select.select(
+                [watches.inotify.file_descriptor], [], [], COALESCE_DELAY
+            )
+
+            if readable:
+                for watch_descriptor, mask, name in watches.inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        # Events were dropped, the index checks every folder
+                        # and the folders created meanwhile are watched.
+                        self._update(deep=True)
+
+                        if not watches.add_watches(self.library_path):
+                            return False
+
+                        continue
+
+                    if mask & IN_IGNORED:
+                        watches.remove_watch(watch_descriptor)
+
+                        continue
+
+                    folder_path = watches.watched_paths.get(watch_descriptor)
+
+                    if folder_path is None:
+                        continue
+
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        changed_paths.add(folder_path)
+                    elif mask & IN_ISDIR or name.endswith(library_index.FILE_EXTENSION):
+                        changed_paths.add(os.path.join(folder_path, name))
+                    else:
+                        continue
+
+                    last_change_time = time.monotonic()
+
+                    if not first_change_time:
+                        first_change_time = last_change_time
+
+            if not changed_paths:
+                continue
+
+            # Bursts of events, like copying a folder, are applied at once.
+            current_time = time.monotonic()
+
+            if (
+                current_time - last_change_time < COALESCE_DELAY
+                and current_time - first_change_time < MAX_COALESCE_DELAY
+            ):
+                continue
+
+            paths = changed_paths
+            changed_paths = set()
+            first_change_time = 0.0
+
+            self._update_paths(paths)
+
+            for path in paths:
+                if not os.path.isdir(path):
+                    watches.remove_watches(path)
+                elif not watches.add_watches(path):
+                    return False
+
+        return True
+
+    def _poll(self, stop_event: threading.Event) -> None:
+        poll_interval = MIN_POLL_INTERVAL
+        poll_count = 0
+
+        while not stop_event.wait(poll_interval):
+            poll_count += 1
+
+            # Folder mtimes miss snippets edited in place, every file is
+            # checked once in a while.
+            changes = self._update(deep=not poll_count % DEEP_POLL_COUNT)
+
+            if changes:
+                poll_interval = MIN_POLL_INTERVAL
+            else:
+                poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+
+    def _run(self, stop_event: threading.Event) -> None:
+        # Folders and files changed while nothing was watching, in any way.
+        self._update(deep=True)
+
+        if stop_event.is_set():
+            return
+
+        inotify = self._create_inotify()
+
+        if inotify:
+            watches = InotifyWatches(inotify, self.library_index)
+
+            try:
+                watching = self._watch(watches, stop_event)
+            except Exception:
+                logger.exception(f"Could not watch {self.library_path!r}.")
+
+                watching = False
+            finally:
+                watches.close()
+
+            if watching:
+                return
+
+        self._poll(stop_event)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        if self.is_running() and not self._stop_event.is_set():
+            return
+
+        # Never waits for a stopped run, it may still be deep in an update.
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop_event,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def get_library_watcher(library_path: str) -> LibraryWatcher:
+    library_path = os.path.normpath(library_path)
+
+    with _library_watchers_lock:
+        library_watcher = _library_watchers.get(library_path)
+
+        if not library_watcher:
+            index = library_index.get_library_index(library_path)
+            library_watcher = LibraryWatcher(index)
+            _library_watchers[library_path] = library_watcher
+
+    return library_watcher
+
+
+def watch_library(library_path: str) -> LibraryWatcher:
+    library_watcher = get_library_watcher(library_path)
+
+    # One library is used at a time, the watchers of the previous ones would
+    # keep their threads and inotify descriptors for the whole session.
+    with _library_watchers_lock:
+        other_library_watchers = [
+            other_library_watcher
+            for other_library_watcher in _library_watchers.values()
+            if other_library_watcher is not library_watcher
+        ]
+
+    for other_library_watcher in other_library_watchers:
+        other_library_watcher.stop()
+
+    library_watcher.start()
+
+    return library_watcher
@@ -0,0 +1,236 @@
+from array import array
+from typing import Optional
+import threading
+import logging
+import mmap
+import os
+
+import vex_manager.core.vex_lexer as vex_lexer
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+# Only the offset and lexer state of one line in this many are kept, the
+# lines between are found again from them when shown.
+LINE_INDEX_STEP = 64
+
+# Lines indexed each time the lock is taken, lookups wait at most this long.
+INDEX_CHUNK_LINES = 4096
+
+# Generated tables can hold a whole array in one line, it is cut when shown.
+MAX_LINE_LENGTH = 4096
+
+ENCODING = "utf-8"
+
+
+def get_exit_state(line: bytes, state: int) -> int:
+    # Most lines can not open nor close a comment, they are not lexed.
+    if state == vex_lexer.DEFAULT_STATE and b"/*" not in line:
+        return state
+
+    if state == vex_lexer.MULTI_LINE_COMMENT_STATE and b"*/" not in line:
+        return state
+
+    _, state = vex_lexer.tokenize(line.decode(ENCODING, "replace"), state)
+
+    return state
+
+
+class MappedVEXFile:
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self._data = b""
+
+        self.size = 0
+        self.mtime = 0.0
+
+        # Offsets and entry states of every LINE_INDEX_STEP line.
+        self._line_offsets = array("q")
+        self._line_states = bytearray()
+
+        self.line_count = 0
+        self.is_indexed = False
+
+        self._cancelled = threading.Event()
+        self._index_thread = None
+
+    def open(self) -> bool:
+        try:
+            stat_result = os.stat(self.file_path)
+            file_for_read = open(self.file_path, "rb")
+        except OSError as error:
+            logger.error(f"Could not open {self.file_path!r}: {error}")
+
+            return False
+
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+
+        # Empty files can not be mapped.
+        if self.size:
+            try:
+                self._mmap = mmap.mmap(
+                    file_for_read.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except (OSError, ValueError) as error:
+                logger.error(f"Could not map {self.file_path!r}: {error}")
+                file_for_read.close()
+
+                return False
+
+            self._data = self._mmap
+
+        self._file = file_for_read
+
+        return True
+
+    def is_stale(self) -> bool:
+        try:
+            stat_result = os.stat(self.file_path)
+        except OSError:
+            return True
+
+        return (stat_result.st_size, stat_result.st_mtime) != (self.size, self.mtime)
+
+    def build_index(self) -> None:
+        position = 0
+        state = vex_lexer.DEFAULT_STATE
+        line_number = 0
+
+        while not self._cancelled.is_set():
+            with self._lock:
+                if self._cancelled.is_set():
+                    return
+
+                data = self._data
+                size = len(data)
+
+                for i in range(INDEX_CHUNK_LINES):
+                    if not line_number % LINE_INDEX_STEP:
+                        self._line_offsets.append(position)
+                        self._line_states.append(state)
+
+                    end = data.find(b"\n", position)
+                    is_last_line = end < 0
+
+                    if is_last_line:
+                        end = size
+
+                    state = get_exit_state(data[position:end], state)
+                    position = end + 1
+                    line_number += 1
+
+                    if is_last_line:
+                        break
+
+                self.line_count = line_number
+
+            if is_last_line:
+                break
+
+        self.is_indexed = not self._cancelled.is_set()
+
+        logger.debug(f"{self.file_path!r} indexed, {self.line_count} lines.")
+
+    def build_index_in_background(self) -> None:
+        if self._index_thread:
+            return
+
+        self._index_thread = threading.Thread(target=self.build_index, daemon=True)
+        self._index_thread.start()
+
+    def _get_line_end(self, position: int) -> int:
+        end = self._data.find(b"\n", position)
+
+        return len(self._data) if end < 0 else end
+
+    def _decode(self, position: int, end: int) -> str:
+        line = self._data[position : min(end, position + MAX_LINE_LENGTH)]
+        text = line.decode(ENCODING, "replace").rstrip("\r")
+
+        if end - position > MAX_LINE_LENGTH:
+            text = f"{text} ... ({end - position} bytes)"
+
+        return text
+
+    def get_lines(self, first_line: int, count: int) -> list[tuple[str, int]]:
+        # Each line with the lexer state it starts in, read from the nearest
+        # indexed line before it.
+        lines = []
+
+        with self._lock:
+            if self._cancelled.is_set():
+                return lines
+
+            checkpoint = first_line // LINE_INDEX_STEP
+
+            if first_line >= self.line_count or checkpoint >= len(self._line_offsets):
+                return lines
+
+            position = self._line_offsets[checkpoint]
+            state = self._line_states[checkpoint]
+            line_number = checkpoint * LINE_INDEX_STEP
+            last_line = min(first_line + count, self.line_count)
+
+            while line_number < last_line:
+                end = self._get_line_end(position)
+
+                if line_number >= first_line:
+                    lines.append((self._decode(position, end), state))
+
+                state = get_exit_state(self._data[position:end], state)
+                position = end + 1
+                line_number += 1
+
+        return lines
+
+    def get_text(self, first_line: int, last_line: int) -> str:
+        # Whole lines, as they are in the file.
+        with self._lock:
+            checkpoint = first_line // LINE_INDEX_STEP
+
+            if self._cancelled.is_set() or checkpoint >= len(self._line_offsets):
+                return ""
+
+            position = self._line_offsets[checkpoint]
+
+            for i in range(first_line - checkpoint * LINE_INDEX_STEP):
+                position = self._get_line_end(position) + 1
+
+            start = position
+
+            for i in range(last_line - first_line + 1):
+                position = self._get_line_end(position) + 1
+
+            return self._data[start : position - 1].decode(ENCODING, "replace")
+
+    def close(self) -> None:
+        self._cancelled.set()
+
+        with self._lock:
+            self._data = b""
+
+            if self._mmap:
+                self._mmap.close()
+
+            if self._file:
+                self._file.close()
+
+            self._mmap = None
+            self._file = None
+
+
+def open_mapped_vex_file(file_path: str) -> Optional[MappedVEXFile]:
+    mapped_vex_file = MappedVEXFile(file_path)
+
+    if not mapped_vex_file.open():
+        return None
+
+    mapped_vex_file.build_index_in_background()
+
+    return mapped_vex_file
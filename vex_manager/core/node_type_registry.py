@@ -0,0 +1,131 @@
+import hou
+
+from typing import Optional
+import logging
+import json
+import os
+
+from vex_manager.config import WrangleNodes
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+WRANGLE_NODE_TYPE_NAMES = frozenset(node.value for node in WrangleNodes)
+
+# Names the built-in wrangles use, tried when no parm is tagged as VEX.
+SNIPPET_PARM_NAMES = ("snippet", "vexsnippet", "code")
+
+VEX_EDITOR_LANGUAGE = "vex"
+
+_node_type_registry = None
+
+
+class NodeTypeRegistry:
+
+    def __init__(self) -> None:
+        # Snippet parm names by type name, from the config file or registered.
+        self._configured_parm_names = {}
+
+        # Snippet parm names by hou.NodeType, "" for the types without one.
+        self._parm_names = {}
+
+    @staticmethod
+    def _discover_snippet_parm_name(node: hou.Node) -> str:
+        # Studio HDAs wrapping a wrangle promote its snippet parm, which keeps
+        # the tags that make Houdini edit it as VEX.
+        for parm in node.parms():
+            tags = parm.parmTemplate().tags()
+
+            if tags.get("editorlang", "").lower() == VEX_EDITOR_LANGUAGE:
+                return parm.name()
+
+        if node.type().name() in WRANGLE_NODE_TYPE_NAMES:
+            for parm_name in SNIPPET_PARM_NAMES:
+                if node.parm(parm_name) is not None:
+                    return parm_name
+
+        return ""
+
+    def get_snippet_parm_name(self, node: hou.Node) -> str:
+        node_type = node.type()
+        parm_name = self._parm_names.get(node_type)
+
+        if parm_name is None:
+            parm_name = self._configured_parm_names.get(node_type.name())
+
+            if parm_name is None:
+                parm_name = self._discover_snippet_parm_name(node)
+
+                logger.debug(
+                    f"{node_type.name()!r} snippet parm: {parm_name or None!r}"
+                )
+
+            self._parm_names[node_type] = parm_name
+
+        return parm_name
+
+    def get_snippet_parm(self, node: hou.Node) -> Optional[hou.Parm]:
+        parm_name = self.get_snippet_parm_name(node)
+
+        if not parm_name:
+            logger.error(f"{node.name()!r} is not a wrangle node.")
+
+            return None
+
+        snippet_parm = node.parm(parm_name)
+
+        if snippet_parm is None:
+            logger.error(f"No snippet parm found on {node.name()!r}.")
+
+        return snippet_parm
+
+    def is_vex_node(self, node: hou.Node) -> bool:
+        return bool(self.get_snippet_parm_name(node))
+
+    def register(self, type_name: str, parm_name: str) -> None:
+        self._configured_parm_names[type_name] = parm_name
+
+        # Types already seen are looked at again.
+        for node_type in list(self._parm_names):
+            if node_type.name() == type_name:
+                del self._parm_names[node_type]
+
+    def load(self, config_path: str) -> bool:
+        # A JSON object of node type names and the parm holding their code,
+        # "" marks types to leave alone.
+        try:
+            with open(config_path, "r", encoding="utf-8") as file_for_read:
+                parm_names = json.load(file_for_read)
+        except (OSError, ValueError) as error:
+            logger.error(f"Could not read the node types of {config_path!r}: {error}")
+
+            return False
+
+        if not isinstance(parm_names, dict):
+            logger.error(f"Invalid node types in {config_path!r}")
+
+            return False
+
+        for type_name, parm_name in parm_names.items():
+            if isinstance(parm_name, str):
+                self.register(type_name, parm_name)
+
+        return True
+
+    def clear(self) -> None:
+        self._parm_names.clear()
+
+
+def get_node_type_registry() -> NodeTypeRegistry:
+    global _node_type_registry
+
+    if _node_type_registry is None:
+        _node_type_registry = NodeTypeRegistry()
+
+        config_path = utils.get_node_types_path()
+
+        if os.path.exists(config_path):
+            _node_type_registry.load(config_path)
+
+    return _node_type_registry
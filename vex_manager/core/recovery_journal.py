@@ -0,0 +1,321 @@
+from typing import Optional
+import threading
+import tempfile
+import logging
+import ctypes
+import socket
+import json
+import sys
+import os
+
+import vex_manager.core.document_state as document_state
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+JOURNAL_EXTENSION = ".journal"
+
+# Deltas appended before the journal is written again as one snapshot.
+MAX_JOURNAL_RECORDS = 256
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+ERROR_ACCESS_DENIED = 5
+
+
+def get_owner() -> tuple[str, int]:
+    return socket.gethostname(), os.getpid()
+
+
+def is_process_running(pid: int) -> bool:
+    # Processes that can not be looked at are taken as running.
+    if sys.platform == "win32":
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+
+        if not handle:
+            return kernel32.GetLastError() == ERROR_ACCESS_DENIED
+
+        exit_code = ctypes.c_ulong()
+
+        try:
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+        finally:
+            kernel32.CloseHandle(handle)
+
+        return exit_code.value == STILL_ACTIVE
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def get_recovery_journal_path(file_path: str) -> str:
+    # One journal per snippet and session, two Houdini sessions editing the
+    # same snippet do not write over each other.
+    name = utils.get_content_hash(os.path.normpath(file_path).encode("utf-8"))
+    host_name, pid = get_owner()
+    owner = utils.get_content_hash(f"{host_name}:{pid}".encode("utf-8"))[:12]
+
+    return os.path.join(
+        utils.get_recovery_journals_path(), f"{name}-{owner}{JOURNAL_EXTENSION}"
+    )
+
+
+def get_recovery_journal_paths() -> list[str]:
+    folder_path = utils.get_recovery_journals_path()
+
+    try:
+        file_names = os.listdir(folder_path)
+    except FileNotFoundError:
+        return []
+    except OSError as error:
+        logger.error(f"Could not list the recovery journals: {error}")
+
+        return []
+
+    return sorted(
+        os.path.join(folder_path, file_name)
+        for file_name in file_names
+        if file_name.endswith(JOURNAL_EXTENSION)
+    )
+
+
+def read_recovery_journal_owner(journal_path: str) -> Optional[tuple[str, int]]:
+    try:
+        with open(journal_path, "r", encoding="utf-8") as file_for_read:
+            header = json.loads(file_for_read.readline())
+
+        return header["host_name"], int(header["pid"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def is_recovery_journal_orphaned(journal_path: str) -> bool:
+    # Left by a session that is gone. Sessions of other machines can not be
+    # checked from here, their own next session recovers them.
+    owner = read_recovery_journal_owner(journal_path)
+
+    if owner is None:
+        return False
+
+    host_name, pid = owner
+    current_host_name, current_pid = get_owner()
+
+    if host_name != current_host_name or pid == current_pid:
+        return False
+
+    return not is_process_running(pid)
+
+
+def get_orphaned_recovery_journal_paths() -> list[str]:
+    return [
+        journal_path
+        for journal_path in get_recovery_journal_paths()
+        if is_recovery_journal_orphaned(journal_path)
+    ]
+
+
+def _get_common_prefix_length(text: str, other_text: str) -> int:
+    # Halved with slice comparisons, a character loop is too slow in Python.
+    low = 0
+    high = min(len(text), len(other_text))
+
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if text[low:middle] == other_text[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+
+def get_delta(text: str, new_text: str) -> tuple[int, int, str]:
+    # The single replacement turning one text into the other, typing between
+    # two writes is usually one.
+    position = _get_common_prefix_length(text, new_text)
+
+    suffix_length = _get_common_prefix_length(
+        text[position:][::-1], new_text[position:][::-1]
+    )
+
+    return (
+        position,
+        len(text) - position - suffix_length,
+        new_text[position : len(new_text) - suffix_length],
+    )
+
+
+class RecoveryJournal:
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+        self._lock = threading.Lock()
+
+        # What the journal holds once replayed, None before the first write.
+        self._text = None
+        self._record_count = 0
+
+    def _write_snapshot(self, journal_path: str, text: str) -> bool:
+        folder_path = os.path.dirname(journal_path)
+
+        try:
+            os.makedirs(folder_path, exist_ok=True)
+
+            file_descriptor, temp_file_path = tempfile.mkstemp(
+                prefix=".journal.", suffix=".tmp", dir=folder_path
+            )
+        except OSError as error:
+            logger.error(f"Could not journal {self.file_path!r}: {error}")
+
+            return False
+
+        host_name, pid = get_owner()
+        header = {
+            "file_path": os.path.normpath(self.file_path),
+            "host_name": host_name,
+            "pid": pid,
+        }
+
+        # The owner is read without the content, it is on its own line.
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file_to_write:
+                file_to_write.write(json.dumps(header))
+                file_to_write.write("\n")
+                file_to_write.write(json.dumps(text))
+                file_to_write.write("\n")
+
+            os.replace(temp_file_path, journal_path)
+        except OSError as error:
+            logger.error(f"Could not journal {self.file_path!r}: {error}")
+
+            try:
+                os.remove(temp_file_path)
+            except OSError:
+                pass
+
+            return False
+
+        return True
+
+    def write(self, text: str) -> bool:
+        with self._lock:
+            journal_path = get_recovery_journal_path(self.file_path)
+
+            if self._text is None or self._record_count >= MAX_JOURNAL_RECORDS:
+                if not self._write_snapshot(journal_path, text):
+                    return False
+
+                self._text = text
+                self._record_count = 0
+
+                return True
+
+            if text == self._text:
+                return True
+
+            # Appended only, a crash while writing loses the last line at most.
+            try:
+                with open(journal_path, "a", encoding="utf-8") as file_to_write:
+                    file_to_write.write(json.dumps(get_delta(self._text, text)))
+                    file_to_write.write("\n")
+            except OSError as error:
+                logger.error(f"Could not journal {self.file_path!r}: {error}")
+
+                # Written whole next time.
+                self._text = None
+
+                return False
+
+            self._text = text
+            self._record_count += 1
+
+            return True
+
+    def remove(self) -> None:
+        with self._lock:
+            self._text = None
+            self._record_count = 0
+
+            remove_recovery_journal(get_recovery_journal_path(self.file_path))
+
+    def rename(self, new_file_path: str) -> None:
+        # Written whole under the new name by the next write.
+        self.remove()
+
+        self.file_path = new_file_path
+
+
+def read_recovery_journal(journal_path: str) -> Optional[tuple[str, str]]:
+    try:
+        with open(journal_path, "r", encoding="utf-8") as file_for_read:
+            lines = file_for_read.read().split("\n")
+    except OSError as error:
+        logger.error(f"Could not read the recovery journal {journal_path!r}: {error}")
+
+        return None
+
+    try:
+        file_path = json.loads(lines[0])["file_path"]
+        text = json.loads(lines[1])
+
+        if not isinstance(text, str):
+            raise TypeError(text)
+    except (ValueError, KeyError, TypeError, IndexError):
+        logger.error(f"Invalid recovery journal {journal_path!r}")
+
+        return None
+
+    for line in lines[2:]:
+        # The line being written when Houdini went down can be cut.
+        try:
+            position, removed, added = json.loads(line)
+        except (ValueError, TypeError):
+            break
+
+        text = f"{text[:position]}{added}{text[position + removed:]}"
+
+    return file_path, text
+
+
+def remove_recovery_journal(journal_path: str) -> None:
+    try:
+        os.remove(journal_path)
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        logger.error(f"Could not remove the recovery journal {journal_path!r}: {error}")
+
+
+def restore_recovery_journal(journal_path: str) -> str:
+    # The edits become unsaved content of the snippet, shown when it is opened.
+    journal = read_recovery_journal(journal_path)
+
+    if not journal:
+        return ""
+
+    file_path, text = journal
+    state = document_state.load_document_state(file_path) or {}
+
+    if not document_state.save_document_state(
+        file_path,
+        state.get("cursor_position", 0),
+        state.get("anchor_position", 0),
+        state.get("scroll_value", 0),
+        text,
+    ):
+        return ""
+
+    remove_recovery_journal(journal_path)
+
+    return file_path
@@ -0,0 +1,315 @@
+import hou
+
+from collections import defaultdict
+import logging
+import re
+
+import vex_manager.core.node_type_registry as node_type_registry
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+NODE_EVENT_TYPES = (hou.nodeEventType.ParmTupleChanged, hou.nodeEventType.BeingDeleted)
+
+# Nodes created after the index is built are found through their network.
+NETWORK_EVENT_TYPES = (hou.nodeEventType.ChildCreated, hou.nodeEventType.BeingDeleted)
+
+# Scenes replaced or merged in may hold node types not seen yet.
+HIP_FILE_EVENT_TYPES = frozenset(
+    (
+        hou.hipFileEventType.AfterClear,
+        hou.hipFileEventType.AfterLoad,
+        hou.hipFileEventType.AfterMerge,
+    )
+)
+
+# Strings are matched with the comments, so "//" in a string is kept. The
+# lexer is too slow for thousands of nodes, token kinds are not needed here.
+COMMENT_REG_EXP = re.compile(
+    r'("(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?)|//[^\n]*|/\*.*?(?:\*/|\Z)',
+    re.DOTALL,
+)
+TOKEN_REG_EXP = re.compile(r'"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?|[@\w.]+|\S')
+
+_scene_snippet_index = None
+
+
+def normalize_vex_code(vex_code: str) -> str:
+    # Tokens without comments nor whitespace, padded so a snippet is only
+    # found in code on whole tokens.
+    vex_code = COMMENT_REG_EXP.sub(lambda match: match.group(1) or " ", vex_code)
+    tokens = TOKEN_REG_EXP.findall(vex_code)
+
+    return f" {' '.join(tokens)} " if tokens else ""
+
+
+def get_vex_code_fingerprint(normalized_vex_code: str) -> str:
+    return utils.get_content_hash(normalized_vex_code.encode("utf-8"))
+
+
+class SceneSnippetIndex:
+
+    def __init__(self) -> None:
+        self.is_built = False
+
+        # Networks told about the nodes created in them, by session id.
+        self._networks = {}
+
+        # Nodes, their normalized code and fingerprint by session id.
+        self._nodes = {}
+        self._normalized_vex_codes = {}
+        self._fingerprints = {}
+        self._session_ids = defaultdict(set)
+
+        # Changed since the last lookup, fingerprinted again when needed.
+        self._dirty_session_ids = set()
+
+        # Code from an expression, its references are not followed so it is
+        # evaluated again at every lookup.
+        self._expression_session_ids = set()
+
+        # Normalized code and fingerprint by code, scenes copy snippets around.
+        self._normalized_by_vex_code = {}
+
+    def _node_event(
+        self, event_type: hou.nodeEventType, node: hou.Node, **kwargs
+    ) -> None:
+
+        session_id = node.sessionId()
+
+        if event_type == hou.nodeEventType.BeingDeleted:
+            self._remove_node(session_id)
+
+            return
+
+        # Called for every parm of the node, only marked as it is edited.
+        parm_tuple = kwargs.get("parm_tuple")
+        registry = node_type_registry.get_node_type_registry()
+        parm_name = registry.get_snippet_parm_name(node)
+
+        if parm_tuple is None or parm_tuple.name() == parm_name:
+            self._dirty_session_ids.add(session_id)
+
+    def _network_event(
+        self, event_type: hou.nodeEventType, node: hou.Node, **kwargs
+    ) -> None:
+
+        if event_type == hou.nodeEventType.BeingDeleted:
+            self._networks.pop(node.sessionId(), None)
+
+            return
+
+        child_node = kwargs.get("child_node")
+
+        if child_node is not None:
+            self._add_created_node(child_node)
+
+    def _discard_fingerprint(self, session_id: int) -> None:
+        fingerprint = self._fingerprints.pop(session_id, None)
+
+        if fingerprint is None:
+            return
+
+        session_ids = self._session_ids[fingerprint]
+        session_ids.discard(session_id)
+
+        # Every edit made in Houdini leaves a fingerprint behind otherwise.
+        if not session_ids:
+            del self._session_ids[fingerprint]
+
+    def _add_node(self, node: hou.Node) -> None:
+        session_id = node.sessionId()
+
+        if session_id in self._nodes:
+            return
+
+        # Fingerprinted at the next lookup, the code of a node being created
+        # is often set right after.
+        self._nodes[session_id] = node
+        self._dirty_session_ids.add(session_id)
+
+        node.addEventCallback(NODE_EVENT_TYPES, self._node_event)
+
+    def _watch_network(self, network: hou.Node) -> None:
+        session_id = network.sessionId()
+
+        if session_id in self._networks:
+            return
+
+        self._networks[session_id] = network
+
+        network.addEventCallback(NETWORK_EVENT_TYPES, self._network_event)
+
+    def _add_created_node(self, node: hou.Node) -> None:
+        registry = node_type_registry.get_node_type_registry()
+
+        # Pasted networks and HDAs come with their children.
+        for other_node in (node,) + node.allSubChildren():
+            if registry.is_vex_node(other_node):
+                self._add_node(other_node)
+
+            # The contents of locked HDAs only change with their definition.
+            if other_node.isNetwork() and not other_node.isInsideLockedHDA():
+                self._watch_network(other_node)
+
+    def _update_node(self, session_id: int) -> None:
+        node = self._nodes.get(session_id)
+
+        if not node:
+            return
+
+        registry = node_type_registry.get_node_type_registry()
+        parm_name = registry.get_snippet_parm_name(node)
+        snippet_parm = node.parm(parm_name) if parm_name else None
+        vex_code = ""
+
+        self._expression_session_ids.discard(session_id)
+
+        if snippet_parm:
+            # Keyframed or referencing another parm, like the wrangles inside
+            # HDAs, the code is what the expression evaluates to.
+            try:
+                vex_code = snippet_parm.unexpandedString()
+            except hou.OperationFailed:
+                vex_code = snippet_parm.evalAsString()
+
+                self._expression_session_ids.add(session_id)
+
+        normalized = self._normalized_by_vex_code.get(vex_code)
+
+        if normalized is None:
+            normalized_vex_code = normalize_vex_code(vex_code)
+            normalized = (
+                normalized_vex_code,
+                get_vex_code_fingerprint(normalized_vex_code),
+            )
+
+            # Edited code is left behind, dropped once it outgrows the scene.
+            if len(self._normalized_by_vex_code) > 2 * len(self._nodes):
+                self._normalized_by_vex_code.clear()
+
+            self._normalized_by_vex_code[vex_code] = normalized
+
+        normalized_vex_code, fingerprint = normalized
+
+        self._discard_fingerprint(session_id)
+
+        self._normalized_vex_codes[session_id] = normalized_vex_code
+        self._fingerprints[session_id] = fingerprint
+        self._session_ids[fingerprint].add(session_id)
+
+    def _remove_node(self, session_id: int) -> None:
+        self._nodes.pop(session_id, None)
+        self._normalized_vex_codes.pop(session_id, None)
+        self._dirty_session_ids.discard(session_id)
+        self._expression_session_ids.discard(session_id)
+        self._discard_fingerprint(session_id)
+
+    def _refresh(self) -> None:
+        if not self.is_built:
+            self.build()
+
+        # Only the nodes edited or created since the last lookup.
+        self._dirty_session_ids.update(self._expression_session_ids)
+
+        for session_id in self._dirty_session_ids:
+            self._update_node(session_id)
+
+        self._dirty_session_ids.clear()
+
+    def build(self) -> None:
+        self.clear()
+
+        # The only walk through the networks, ChildCreated events keep the
+        # index up to date after that.
+        self._add_created_node(hou.node("/"))
+
+        self.is_built = True
+
+        logger.debug(f"{len(self._nodes)} nodes with VEX indexed.")
+
+    def clear(self) -> None:
+        for node in self._nodes.values():
+            try:
+                node.removeEventCallback(NODE_EVENT_TYPES, self._node_event)
+            except hou.ObjectWasDeleted:
+                pass
+
+        for network in self._networks.values():
+            try:
+                network.removeEventCallback(NETWORK_EVENT_TYPES, self._network_event)
+            except hou.ObjectWasDeleted:
+                pass
+
+        self.is_built = False
+        self._networks.clear()
+        self._nodes.clear()
+        self._normalized_vex_codes.clear()
+        self._fingerprints.clear()
+        self._session_ids.clear()
+        self._dirty_session_ids.clear()
+        self._expression_session_ids.clear()
+        self._normalized_by_vex_code.clear()
+
+    def find_nodes(self, vex_code: str, inserted: bool = False) -> list[hou.Node]:
+        # Nodes with the same code, a fingerprint lookup, then the ones it was
+        # inserted in when asked for, which means reading all the code.
+        normalized_vex_code = normalize_vex_code(vex_code)
+
+        if not normalized_vex_code:
+            return []
+
+        self._refresh()
+
+        fingerprint = get_vex_code_fingerprint(normalized_vex_code)
+        session_ids = self._session_ids.get(fingerprint, set())
+
+        nodes = [self._nodes[session_id] for session_id in sorted(session_ids)]
+
+        if not inserted:
+            return nodes
+
+        nodes.extend(
+            self._nodes[session_id]
+            for session_id, other_normalized_vex_code in (
+                self._normalized_vex_codes.items()
+            )
+            if session_id not in session_ids
+            and normalized_vex_code in other_normalized_vex_code
+        )
+
+        return nodes
+
+
+def _hip_file_event(event_type: hou.hipFileEventType) -> None:
+    if event_type in HIP_FILE_EVENT_TYPES and _scene_snippet_index:
+        _scene_snippet_index.clear()
+
+
+def get_scene_snippet_index() -> SceneSnippetIndex:
+    global _scene_snippet_index
+
+    if _scene_snippet_index is None:
+        _scene_snippet_index = SceneSnippetIndex()
+
+        # Built again at the next lookup after another scene is opened.
+        hou.hipFile.addEventCallback(_hip_file_event)
+
+    return _scene_snippet_index
+
+
+def select_nodes_using_vex_code(vex_code: str, inserted: bool = False) -> int:
+    nodes = get_scene_snippet_index().find_nodes(vex_code, inserted)
+
+    if not nodes:
+        logger.info("No node in the scene uses this code.")
+
+        return 0
+
+    hou.clearAllSelected()
+
+    for node in nodes:
+        node.setSelected(True)
+
+    return len(nodes)
@@ -0,0 +1,155 @@
+from typing import Optional
+import threading
+import logging
+import os
+
+import vex_manager.core.library_index as library_index
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+TRIGRAM_SIZE = 3
+
+MAX_STALE_POSTINGS = 5000
+
+_search_indexes = {}
+_search_indexes_lock = threading.Lock()
+
+
+def get_trigrams(text: str) -> set[str]:
+    return {text[i : i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+
+    def __init__(self, index: library_index.LibraryIndex) -> None:
+        self.library_index = index
+
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._pending_postings = []
+        self._stale_postings = 0
+        self._is_building = False
+        self._is_built = False
+        self._build_thread = None
+
+        self.library_index.add_callback(self._library_index_changed)
+
+    def _library_index_changed(self, file_path: str, content: Optional[bytes]) -> None:
+        # Replaced and removed files keep their old postings until the next
+        # build, search results are always checked against the library index.
+        with self._lock:
+            self._stale_postings += 1
+
+            if content is not None:
+                file_id = self.library_index.get_file_id(file_path)
+
+                if file_id >= 0 and len(content) <= library_index.MAX_CONTENT_SIZE:
+                    text = content.decode("utf-8", errors="replace")
+
+                    if self._is_building:
+                        self._pending_postings.append((file_id, text))
+
+                    self._add_postings(file_id, text)
+
+            rebuild = self._is_built and self._stale_postings > MAX_STALE_POSTINGS
+
+        if rebuild:
+            self.build_in_background()
+
+    def _add_postings(self, file_id: int, text: str) -> None:
+        for trigram in get_trigrams(text):
+            file_ids = self._postings.get(trigram)
+
+            if file_ids is None:
+                self._postings[trigram] = {file_id}
+            else:
+                file_ids.add(file_id)
+
+    def build(self) -> None:
+        with self._lock:
+            self._is_building = True
+
+        postings = {}
+
+        for file_id, text in self.library_index.get_contents():
+            for trigram in get_trigrams(text):
+                file_ids = postings.get(trigram)
+
+                if file_ids is None:
+                    postings[trigram] = {file_id}
+                else:
+                    file_ids.add(file_id)
+
+        with self._lock:
+            self._postings = postings
+
+            for file_id, text in self._pending_postings:
+                self._add_postings(file_id, text)
+
+            self._pending_postings = []
+            self._stale_postings = 0
+            self._is_building = False
+            self._is_built = True
+
+        logger.debug(f"Search index built, {len(postings)} trigrams.")
+
+    def build_in_background(self) -> None:
+        if self._build_thread and self._build_thread.is_alive():
+            return
+
+        self._build_thread = threading.Thread(target=self.build, daemon=True)
+        self._build_thread.start()
+
+    def is_built(self) -> bool:
+        return self._is_built
+
+    def search(self, text: str, limit: int = 500) -> list[str]:
+        # Shorter text is in most files, reading them all is not worth it.
+        if len(text) < TRIGRAM_SIZE:
+            return []
+
+        if not self._is_built:
+            return self.library_index.find_vex_files_containing(text, limit=limit)
+
+        with self._lock:
+            postings = []
+
+            for trigram in get_trigrams(text):
+                file_ids = self._postings.get(trigram)
+
+                if not file_ids:
+                    return []
+
+                postings.append(file_ids)
+
+            postings.sort(key=len)
+            candidate_ids = set(postings[0])
+
+            for file_ids in postings[1:]:
+                candidate_ids.intersection_update(file_ids)
+
+                if not candidate_ids:
+                    return []
+
+        return self.library_index.find_vex_files_containing(
+            text, file_ids=sorted(candidate_ids), limit=limit
+        )
+
+
+def get_search_index(library_path: str) -> SearchIndex:
+    library_path = os.path.normpath(library_path)
+
+    with _search_indexes_lock:
+        search_index = _search_indexes.get(library_path)
+
+        if not search_index:
+            index = library_index.get_library_index(library_path)
+            search_index = SearchIndex(index)
+            _search_indexes[library_path] = search_index
+
+    return search_index
+
+
+def search_vex_files(library_path: str, text: str, limit: int = 500) -> list[str]:
+    return get_search_index(library_path).search(text, limit=limit)
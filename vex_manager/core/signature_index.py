@@ -0,0 +1,321 @@
+from typing import Iterable
+from typing import Optional
+import threading
+import logging
+import zipfile
+import struct
+import mmap
+import os
+import re
+
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+# Records are "name\x1fsummary\x1fsignature\x1esignature", sorted by name and
+# found through a table of (offset, length) pairs, so a lookup only touches a
+# few pages of the file.
+MAGIC = b"VEXSIG01"
+HEADER = struct.Struct("<8sI")
+TABLE_ENTRY = struct.Struct("<II")
+
+FIELD_SEPARATOR = "\x1f"
+SIGNATURE_SEPARATOR = "\x1e"
+
+HELP_ARCHIVE_NAME = "vex.zip"
+HELP_FUNCTIONS_FOLDER = "functions"
+
+SUMMARY_REG_EXP = re.compile(r'"""(.+?)"""', re.DOTALL)
+USAGE_REG_EXP = re.compile(r"^:usage:\s*`?(.+?)`?\s*$", re.MULTILINE)
+
+_signature_index = None
+_signature_index_lock = threading.Lock()
+
+
+def get_help_path() -> str:
+    # $HFS/houdini/help holds the VEX help zipped or, in builds, as a folder.
+    hfs_path = os.environ.get("HFS", "")
+
+    if not hfs_path:
+        return ""
+
+    help_path = os.path.join(hfs_path, "houdini", "help")
+
+    for path in (
+        os.path.join(help_path, HELP_ARCHIVE_NAME),
+        os.path.join(help_path, "vex"),
+    ):
+        if os.path.exists(path):
+            return path
+
+    return ""
+
+
+def parse_function_help(text: str) -> tuple[str, tuple[str, ...]]:
+    match = SUMMARY_REG_EXP.search(text)
+    summary = " ".join(match.group(1).split()) if match else ""
+
+    signatures = tuple(
+        dict.fromkeys(
+            " ".join(signature.split()) for signature in USAGE_REG_EXP.findall(text)
+        )
+    )
+
+    return summary, signatures
+
+
+def iter_function_help(help_path: str) -> Iterable[tuple[str, str]]:
+    if zipfile.is_zipfile(help_path):
+        with zipfile.ZipFile(help_path) as help_archive:
+            for file_name in help_archive.namelist():
+                folder_name, _, base_name = file_name.rpartition("/")
+
+                if folder_name == HELP_FUNCTIONS_FOLDER and base_name.endswith(".txt"):
+                    text = help_archive.read(file_name).decode("utf-8", "replace")
+
+                    yield base_name[:-4], text
+
+        return
+
+    functions_path = os.path.join(help_path, HELP_FUNCTIONS_FOLDER)
+
+    for base_name in sorted(os.listdir(functions_path)):
+        if base_name.endswith(".txt"):
+            with open(
+                os.path.join(functions_path, base_name),
+                "r",
+                encoding="utf-8",
+                errors="replace",
+            ) as file_for_read:
+                yield base_name[:-4], file_for_read.read()
+
+
+def write_signature_index(
+    index_path: str, signatures: dict[str, tuple[str, tuple[str, ...]]]
+) -> None:
+
+    separators = str.maketrans({FIELD_SEPARATOR: " ", SIGNATURE_SEPARATOR: " "})
+
+    table = []
+    records = []
+    offset = HEADER.size + TABLE_ENTRY.size * len(signatures)
+
+    for name in sorted(signatures):
+        summary, function_signatures = signatures[name]
+
+        record = FIELD_SEPARATOR.join(
+            (
+                name,
+                summary.translate(separators),
+                SIGNATURE_SEPARATOR.join(
+                    signature.translate(separators) for signature in function_signatures
+                ),
+            )
+        ).encode("utf-8")
+
+        table.append(TABLE_ENTRY.pack(offset, len(record)))
+        records.append(record)
+        offset += len(record)
+
+    index_folder_path = os.path.dirname(index_path)
+
+    if index_folder_path and not os.path.exists(index_folder_path):
+        os.makedirs(index_folder_path)
+
+    with open(index_path, "wb") as file_for_write:
+        file_for_write.write(HEADER.pack(MAGIC, len(signatures)))
+        file_for_write.write(b"".join(table))
+        file_for_write.write(b"".join(records))
+
+
+def build_signature_index(help_path: str, index_path: str) -> int:
+    signatures = {}
+
+    for name, text in iter_function_help(help_path):
+        summary, function_signatures = parse_function_help(text)
+
+        if summary or function_signatures:
+            signatures[name] = (summary, function_signatures)
+
+    write_signature_index(index_path, signatures)
+
+    logger.debug(f"Signature index built, {len(signatures)} functions.")
+
+    return len(signatures)
+
+
+class SignatureIndex:
+
+    def __init__(self, index_path: str = "", help_path: str = "") -> None:
+        self.index_path = index_path or utils.get_signature_index_path()
+        self.help_path = help_path
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self._size = 0
+        self._is_loaded = False
+        self._cache = {}
+
+        self._build_thread = None
+
+    def _load(self) -> None:
+        self._is_loaded = True
+
+        if not os.path.exists(self.index_path):
+            return
+
+        try:
+            file_for_read = open(self.index_path, "rb")
+        except OSError:
+            logger.exception(f"Failed to open the signature index {self.index_path!r}.")
+
+            return
+
+        try:
+            index_mmap = mmap.mmap(file_for_read.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            logger.exception(f"Failed to map the signature index {self.index_path!r}.")
+            file_for_read.close()
+
+            return
+
+        if len(index_mmap) < HEADER.size:
+            magic, size = b"", 0
+        else:
+            magic, size = HEADER.unpack_from(index_mmap)
+
+        if magic != MAGIC:
+            logger.warning(f"Signature index {self.index_path!r} is not valid.")
+            index_mmap.close()
+            file_for_read.close()
+
+            return
+
+        self._file = file_for_read
+        self._mmap = index_mmap
+        self._size = size
+
+    def _get_record(self, i: int) -> bytes:
+        offset, length = TABLE_ENTRY.unpack_from(
+            self._mmap, HEADER.size + TABLE_ENTRY.size * i
+        )
+
+        return self._mmap[offset : offset + length]
+
+    def _find(self, name: str) -> Optional[tuple[str, tuple[str, ...]]]:
+        name_bytes = name.encode("utf-8")
+        separator = FIELD_SEPARATOR.encode("utf-8")
+        low, high = 0, self._size
+
+        while low < high:
+            middle = (low + high) // 2
+            record = self._get_record(middle)
+            record_name = record[: record.find(separator)]
+
+            if record_name == name_bytes:
+                _, summary, signatures = record.decode("utf-8").split(FIELD_SEPARATOR)
+
+                return summary, tuple(
+                    filter(None, signatures.split(SIGNATURE_SEPARATOR))
+                )
+
+            if record_name < name_bytes:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def _is_stale(self) -> bool:
+        if not self.help_path or not os.path.exists(self.help_path):
+            return False
+
+        if not os.path.exists(self.index_path):
+            return True
+
+        return os.path.getmtime(self.help_path) > os.path.getmtime(self.index_path)
+
+    def build(self) -> None:
+        if not self._is_stale():
+            return
+
+        # Built aside, lookups keep using the old index meanwhile.
+        temporary_path = f"{self.index_path}.tmp"
+
+        try:
+            build_signature_index(self.help_path, temporary_path)
+        except Exception:
+            logger.exception(
+                f"Failed to build the signature index from {self.help_path!r}."
+            )
+
+            return
+
+        # A mapped file can not be replaced on Windows, it is reopened at the
+        # next lookup.
+        with self._lock:
+            self.close()
+
+            try:
+                os.replace(temporary_path, self.index_path)
+            except OSError:
+                logger.exception(
+                    f"Failed to replace the signature index {self.index_path!r}."
+                )
+
+    def build_in_background(self) -> None:
+        if self._build_thread and self._build_thread.is_alive():
+            return
+
+        self._build_thread = threading.Thread(target=self.build, daemon=True)
+        self._build_thread.start()
+
+    def get_signature(self, name: str) -> Optional[tuple[str, tuple[str, ...]]]:
+        with self._lock:
+            if name in self._cache:
+                return self._cache[name]
+
+            if not self._is_loaded:
+                self._load()
+
+            signature = self._find(name) if self._mmap else None
+            self._cache[name] = signature
+
+        return signature
+
+    def close(self) -> None:
+        if self._mmap:
+            self._mmap.close()
+            self._file.close()
+
+        self._file = None
+        self._mmap = None
+        self._size = 0
+        self._is_loaded = False
+        self._cache = {}
+
+    def __contains__(self, name: str) -> bool:
+        return self.get_signature(name) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if not self._is_loaded:
+                self._load()
+
+            return self._size
+
+
+def get_signature_index() -> SignatureIndex:
+    global _signature_index
+
+    with _signature_index_lock:
+        if _signature_index is None:
+            _signature_index = SignatureIndex(help_path=get_help_path())
+
+            # Nothing is read until the first lookup, the help is only parsed
+            # again when Houdini's is newer than the index.
+            _signature_index.build_in_background()
+
+    return _signature_index
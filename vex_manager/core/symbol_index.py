@@ -0,0 +1,278 @@
+from typing import Iterable
+from typing import Optional
+import threading
+import logging
+import sqlite3
+import os
+
+from vex_manager.config import VEXSyntaxis
+import vex_manager.core.library_index as library_index
+import vex_manager.core.vex_parser as vex_parser
+import vex_manager.core.vex_lexer as vex_lexer
+import vex_manager.utils as utils
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+FUNCTION = "function"
+KEYWORD = "keyword"
+TYPE = "type"
+ATTRIBUTE_READ = "attribute_read"
+ATTRIBUTE_WRITE = "attribute_write"
+
+UPDATE_BATCH_SIZE = 500
+
+VEX_FUNCTIONS = frozenset(VEXSyntaxis.VEX_FUNCTIONS)
+KEYWORDS = frozenset(VEXSyntaxis.KEYWORDS)
+DATA_TYPES = frozenset(VEXSyntaxis.DATA_TYPES)
+
+IDENTIFIER_KINDS = frozenset(
+    (vex_lexer.IDENTIFIER, vex_lexer.KEYWORD, vex_lexer.TYPE, vex_lexer.FUNCTION)
+)
+
+_symbol_indexes = {}
+_symbol_indexes_lock = threading.Lock()
+
+
+def get_attribute_name(attribute: str) -> str:
+    return attribute.rsplit("@", 1)[-1]
+
+
+def get_symbols(vex_code: str) -> set[tuple[str, str]]:
+    tokens = vex_parser.get_significant_tokens(vex_code)
+
+    symbols = set()
+
+    for index, (start, end, kind, text) in enumerate(tokens):
+        if kind == vex_lexer.ATTRIBUTE:
+            if vex_parser.is_attribute_write(tokens, index):
+                symbols.add((ATTRIBUTE_WRITE, get_attribute_name(text)))
+            else:
+                symbols.add((ATTRIBUTE_READ, get_attribute_name(text)))
+
+            continue
+
+        # Members, like "v.x", are not symbols.
+        if kind not in IDENTIFIER_KINDS or (index and tokens[index - 1][3] == "."):
+            continue
+
+        call = index + 1 < len(tokens) and tokens[index + 1][3] == "("
+
+        if call and text in VEX_FUNCTIONS:
+            symbols.add((FUNCTION, text))
+        elif text in KEYWORDS:
+            symbols.add((KEYWORD, text))
+        elif text in DATA_TYPES:
+            symbols.add((TYPE, text))
+
+    return symbols
+
+
+class SymbolIndex:
+
+    def __init__(self, index: library_index.LibraryIndex) -> None:
+        self.library_index = index
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            index.index_path, timeout=30, check_same_thread=False
+        )
+
+        self._create_tables()
+
+        self.library_index.add_callback(self._library_index_changed)
+
+    def _create_tables(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS symbol_files ("
+                "path TEXT PRIMARY KEY, hash TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS symbols (path TEXT, kind TEXT, name TEXT)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS symbols_name ON symbols (kind, name)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path, kind, name)"
+            )
+
+    def _library_index_changed(self, file_path: str, content: Optional[bytes]) -> None:
+        with self._lock, self._connection:
+            if content is None:
+                self._remove_symbols(file_path)
+            else:
+                self._index_symbols(
+                    file_path,
+                    utils.get_content_hash(content),
+                    content.decode("utf-8", errors="replace"),
+                )
+
+    def _remove_symbols(self, file_path: str) -> None:
+        self._connection.execute("DELETE FROM symbols WHERE path = ?", (file_path,))
+        self._connection.execute(
+            "DELETE FROM symbol_files WHERE path = ?", (file_path,)
+        )
+
+    def _index_symbols(self, file_path: str, content_hash: str, vex_code: str) -> None:
+        self._remove_symbols(file_path)
+
+        self._connection.executemany(
+            "INSERT INTO symbols (path, kind, name) VALUES (?, ?, ?)",
+            [(file_path, kind, name) for kind, name in get_symbols(vex_code)],
+        )
+        self._connection.execute(
+            "INSERT INTO symbol_files (path, hash) VALUES (?, ?)",
+            (file_path, content_hash),
+        )
+
+    def update(self) -> int:
+        prefix = self.library_index.library_path + os.sep
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT files.path, files.hash, files.content FROM files "
+                "LEFT JOIN symbol_files ON symbol_files.path = files.path "
+                "WHERE substr(files.path, 1, ?) = ? AND files.content IS NOT NULL "
+                "AND (symbol_files.hash IS NULL OR symbol_files.hash != files.hash)",
+                (len(prefix), prefix),
+            ).fetchall()
+
+        # Short transactions keep the library index writable while tokenizing.
+        for i in range(0, len(rows), UPDATE_BATCH_SIZE):
+            with self._lock, self._connection:
+                for file_path, content_hash, vex_code in rows[
+                    i : i + UPDATE_BATCH_SIZE
+                ]:
+                    self._index_symbols(file_path, content_hash, vex_code)
+
+        with self._lock, self._connection:
+            for table in ("symbols", "symbol_files"):
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE substr(path, 1, ?) = ? "
+                    f"AND path NOT IN (SELECT path FROM files)",
+                    (len(prefix), prefix),
+                )
+
+        logger.debug(f"Symbol index updated, {len(rows)} files tokenized.")
+
+        return len(rows)
+
+    def update_in_background(self) -> None:
+        threading.Thread(target=self.update, daemon=True).start()
+
+    def _count_vex_files(self, condition: tuple[tuple[str, ...], str]) -> int:
+        kind, name = condition
+
+        row = self._connection.execute(
+            f"SELECT count(*) FROM symbols WHERE "
+            f"kind IN ({', '.join('?' * len(kind))}) AND name = ?",
+            (*kind, name),
+        ).fetchone()
+
+        return row[0]
+
+    def find_vex_files(
+        self,
+        functions: Iterable[str] = (),
+        keywords: Iterable[str] = (),
+        types: Iterable[str] = (),
+        attributes_read: Iterable[str] = (),
+        attributes_written: Iterable[str] = (),
+        attributes: Iterable[str] = (),
+    ) -> list[str]:
+
+        conditions = []
+
+        for kind, names in (
+            ((FUNCTION,), functions),
+            ((KEYWORD,), keywords),
+            ((TYPE,), types),
+            ((ATTRIBUTE_READ,), attributes_read),
+            ((ATTRIBUTE_WRITE,), attributes_written),
+            ((ATTRIBUTE_READ, ATTRIBUTE_WRITE), attributes),
+        ):
+            for name in names:
+                if kind[0] not in (FUNCTION, KEYWORD, TYPE):
+                    name = get_attribute_name(name)
+
+                conditions.append((kind, name))
+
+        if not conditions:
+            return []
+
+        prefix = self.library_index.library_path + os.sep
+
+        with self._lock:
+            # The rarest symbol drives the query, the rest are index lookups.
+            conditions.sort(key=self._count_vex_files)
+
+            (kind, name), *conditions = conditions
+
+            query = (
+                f"SELECT DISTINCT path FROM symbols WHERE "
+                f"kind IN ({', '.join('?' * len(kind))}) AND name = ? "
+                f"AND substr(path, 1, ?) = ?"
+            )
+            parameters = [*kind, name, len(prefix), prefix]
+
+            for kind, name in conditions:
+                query += (
+                    f" AND EXISTS (SELECT 1 FROM symbols AS other "
+                    f"WHERE other.path = symbols.path "
+                    f"AND other.kind IN ({', '.join('?' * len(kind))}) "
+                    f"AND other.name = ?)"
+                )
+                parameters.extend((*kind, name))
+
+            rows = self._connection.execute(
+                f"{query} ORDER BY path", parameters
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def get_symbol_counts(self) -> dict[str, int]:
+        # How many snippets use each name, attributes are prefixed with "@".
+        prefix = self.library_index.library_path + os.sep
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT kind IN (?, ?), name, count(DISTINCT path) FROM symbols "
+                "WHERE substr(path, 1, ?) = ? GROUP BY kind IN (?, ?), name",
+                (
+                    ATTRIBUTE_READ,
+                    ATTRIBUTE_WRITE,
+                    len(prefix),
+                    prefix,
+                    ATTRIBUTE_READ,
+                    ATTRIBUTE_WRITE,
+                ),
+            ).fetchall()
+
+        return {
+            f"@{name}" if attribute else name: count for attribute, name, count in rows
+        }
+
+    def get_symbols(self, file_path: str) -> set[tuple[str, str]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT kind, name FROM symbols WHERE path = ?",
+                (os.path.normpath(file_path),),
+            ).fetchall()
+
+        return set(rows)
+
+
+def get_symbol_index(library_path: str) -> SymbolIndex:
+    library_path = os.path.normpath(library_path)
+
+    with _symbol_indexes_lock:
+        symbol_index = _symbol_indexes.get(library_path)
+
+        if not symbol_index:
+            index = library_index.get_library_index(library_path)
+            symbol_index = SymbolIndex(index)
+            _symbol_indexes[library_path] = symbol_index
+
+    return symbol_index
@@ -0,0 +1,127 @@
+from typing import Iterator
+import logging
+import re
+
+from vex_manager.config import VEXSyntaxis
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+COMMENT = "comment"
+MULTI_LINE_COMMENT = "multi_line_comment"
+STRING = "string"
+NUMBER = "number"
+ATTRIBUTE = "attribute"
+KEYWORD = "keyword"
+TYPE = "type"
+FUNCTION = "function"
+IDENTIFIER = "identifier"
+OPERATOR = "operator"
+PUNCTUATION = "punctuation"
+UNKNOWN = "unknown"
+
+# Lexing states, saved per line so lexing can resume at any line.
+DEFAULT_STATE = 0
+MULTI_LINE_COMMENT_STATE = 1
+
+VEX_FUNCTIONS = frozenset(VEXSyntaxis.VEX_FUNCTIONS)
+KEYWORDS = frozenset(VEXSyntaxis.KEYWORDS)
+DATA_TYPES = frozenset(VEXSyntaxis.DATA_TYPES)
+
+# Types win over keywords and keywords over functions, like "struct".
+IDENTIFIER_KINDS = {
+    **dict.fromkeys(VEX_FUNCTIONS, FUNCTION),
+    **dict.fromkeys(KEYWORDS, KEYWORD),
+    **dict.fromkeys(DATA_TYPES, TYPE),
+}
+
+# The first alternative matching at a position wins, so comments and strings
+# hide anything inside them. Strings do not span lines.
+TOKEN_REG_EXP = re.compile(
+    r"\s*(?:"
+    r"(?P<comment>//[^\n]*)"
+    r"|(?P<comment_start>/\*)"
+    r'|(?P<string>"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?)'
+    r"|(?P<attribute>(?:[A-Za-z0-9]{1,2}(?:\[\])?)?@[A-Za-z_]\w*)"
+    r"|(?P<identifier>[A-Za-z_]\w*)"
+    r"|(?P<number>0[xX][0-9A-Fa-f]+|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<operator>\+\+|--|&&|\|\||<<=?|>>=?|->|[-+*/%&|^!<>=]=?|[~?:])"
+    r"|(?P<punctuation>[()\[\]{};,.])"
+    r"|(?P<unknown>.))"
+)
+
+TOKEN_KINDS = {
+    "comment": COMMENT,
+    "string": STRING,
+    "attribute": ATTRIBUTE,
+    "number": NUMBER,
+    "operator": OPERATOR,
+    "punctuation": PUNCTUATION,
+    "unknown": UNKNOWN,
+}
+
+
+def tokenize(
+    vex_code: str, state: int = DEFAULT_STATE
+) -> tuple[list[tuple[int, int, str]], int]:
+
+    tokens = []
+    position = 0
+
+    if state == MULTI_LINE_COMMENT_STATE:
+        position = vex_code.find("*/")
+
+        if position < 0:
+            if vex_code:
+                tokens.append((0, len(vex_code), MULTI_LINE_COMMENT))
+
+            return tokens, MULTI_LINE_COMMENT_STATE
+
+        position += 2
+        tokens.append((0, position, MULTI_LINE_COMMENT))
+
+    append = tokens.append
+    identifier_kinds = IDENTIFIER_KINDS
+    token_kinds = TOKEN_KINDS
+
+    while True:
+        # Restarted only after multi-line comments, which are found by hand.
+        for match in TOKEN_REG_EXP.finditer(vex_code, position):
+            token = match.lastgroup
+            start, end = match.span(token)
+
+            if token == "identifier":
+                kind = identifier_kinds.get(match.group(token), IDENTIFIER)
+            elif token == "comment_start":
+                position = vex_code.find("*/", end)
+
+                if position < 0:
+                    append((start, len(vex_code) - start, MULTI_LINE_COMMENT))
+
+                    return tokens, MULTI_LINE_COMMENT_STATE
+
+                position += 2
+                append((start, position - start, MULTI_LINE_COMMENT))
+
+                break
+            else:
+                kind = token_kinds[token]
+
+            append((start, end - start, kind))
+        else:
+            return tokens, DEFAULT_STATE
+
+
+def iter_lines(
+    vex_code: str, state: int = DEFAULT_STATE
+) -> Iterator[tuple[str, list[tuple[int, int, str]], int]]:
+
+    # Yields the state each line ends with, saved it resumes at the next line.
+    for line in vex_code.split("\n"):
+        tokens, state = tokenize(line, state)
+
+        yield line, tokens, state
+
+
+def is_significant(kind: str) -> bool:
+    return kind not in (COMMENT, MULTI_LINE_COMMENT)
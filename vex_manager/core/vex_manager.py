@@ -1,47 +1,69 @@
 import hou
 
+from typing import Iterable
 import logging
 
-from vex_manager.config import WrangleNodes
+import vex_manager.core.node_type_registry as node_type_registry
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
+UNDO_GROUP_LABEL = "VEX Manager: Apply Code"
 
-def set_vex_code_in_selected_wrangle_node(vex_code: str, insert: bool = False) -> None:
-    if vex_code:
-        selected_nodes = hou.selectedNodes()
 
-        if selected_nodes:
-            node = selected_nodes[-1]
-            wrangle_node_types = [node.value for node in WrangleNodes]
-
-            if node.type().name() in wrangle_node_types:
-                parms = [parm.name() for parm in node.parms()]
-
-                if "snippet" in parms:
-                    snippet_parm = node.parm("snippet")
-                elif "vexsnippet" in parms:
-                    snippet_parm = node.parm("vexsnippet")
-                elif "code" in parms:
-                    snippet_parm = node.parm("code")
-                else:
-                    logger.error("No snippet parm found.")
+def set_vex_code_in_wrangle_nodes(
+    nodes: Iterable[hou.Node], vex_code: str, insert: bool = False
+) -> int:
+
+    if not vex_code:
+        return 0
 
-                    return
+    registry = node_type_registry.get_node_type_registry()
+    count = 0
 
-                if insert:
-                    current_code = snippet_parm.evalAsString()
+    # Undone in one step, however many nodes were changed.
+    with hou.undos.group(UNDO_GROUP_LABEL):
+        for node in nodes:
+            snippet_parm = registry.get_snippet_parm(node)
 
-                    if current_code:
-                        new_vex_code = f"{current_code}\n\n{vex_code}"
-                    else:
-                        new_vex_code = vex_code
+            if snippet_parm is None:
+                continue
+
+            if insert:
+                current_code = snippet_parm.evalAsString()
+
+                if current_code:
+                    new_vex_code = f"{current_code}\n\n{vex_code}"
                 else:
                     new_vex_code = vex_code
-
-                snippet_parm.set(new_vex_code)
             else:
-                logger.error(f"{node.name()!r} is not a wrangle node.")
+                new_vex_code = vex_code
+
+            snippet_parm.set(new_vex_code)
+            count += 1
+
+    return count
+
+
+def set_vex_code_in_selected_wrangle_nodes(vex_code: str, insert: bool = False) -> int:
+    if not vex_code:
+        return 0
+
+    selected_nodes = hou.selectedNodes()
+
+    if not selected_nodes:
+        logger.error("There is no selected node.")
+
+        return 0
+
+    return set_vex_code_in_wrangle_nodes(selected_nodes, vex_code, insert)
+
+
+def set_vex_code_in_selected_wrangle_node(vex_code: str, insert: bool = False) -> None:
+    if vex_code:
+        selected_nodes = hou.selectedNodes()
+
+        if selected_nodes:
+            set_vex_code_in_wrangle_nodes(selected_nodes[-1:], vex_code, insert)
         else:
             logger.error("There is no selected node.")
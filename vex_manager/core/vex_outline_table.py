@@ -0,0 +1,183 @@
+import threading
+import logging
+
+import vex_manager.core.vex_lexer as vex_lexer
+import vex_manager.core.vex_parser as vex_parser
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+OUTLINE_KINDS = frozenset((vex_parser.FUNCTION, vex_parser.STRUCT, vex_parser.BLOCK))
+
+BRACKET_DEPTHS = {"(": 1, "[": 1, "{": 1, ")": -1, "]": -1, "}": -1}
+
+# About one in this many top-level statements ends a segment. The ends only
+# depend on the lines themselves, so lines added above do not move them.
+SEGMENT_END_MODULUS = 16
+
+
+class VEXOutlineTable:
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        # Lines by (text, state) and parsed segments by (text, struct names
+        # used), only the ones of the last update are kept.
+        self._lines = {}
+        self._segments = {}
+
+        self.root = vex_parser.VEXOutlineItem("snippet", "")
+
+    @staticmethod
+    def _get_line_data(line: str, state: int) -> tuple[int, int, str, frozenset]:
+        tokens, state = vex_lexer.tokenize(line, state)
+
+        depth = 0
+        last_text = ""
+        names = set()
+
+        for start, length, kind in tokens:
+            if not vex_lexer.is_significant(kind):
+                continue
+
+            last_text = line[start : start + length]
+            depth += BRACKET_DEPTHS.get(last_text, 0)
+
+            if kind in (vex_lexer.IDENTIFIER, vex_lexer.FUNCTION):
+                names.add(last_text)
+
+        return state, depth, last_text, frozenset(names)
+
+    def _get_segment(
+        self, segment_text: str, struct_names: frozenset, segments: dict
+    ) -> tuple[tuple[vex_parser.VEXOutlineItem, ...], frozenset]:
+
+        key = (segment_text, struct_names)
+        segment = segments.get(key) or self._segments.get(key)
+
+        if segment is None:
+            # Declarations like "piece p;" depend on the structs above.
+            parser = vex_parser.VEXParser(segment_text)
+            parser.struct_names.update(struct_names)
+
+            segment = (
+                tuple(parser.parse().children),
+                frozenset(parser.struct_names - struct_names),
+            )
+
+        segments[key] = segment
+
+        return segment
+
+    def _copy_items(
+        self,
+        parent: vex_parser.VEXOutlineItem,
+        items: tuple[vex_parser.VEXOutlineItem, ...],
+        position: int,
+        line_offset: int,
+    ) -> None:
+
+        for item in items:
+            if item.kind not in OUTLINE_KINDS:
+                continue
+
+            # Plain scopes are left out, what they hold is not.
+            if item.kind == vex_parser.BLOCK and not item.name:
+                self._copy_items(parent, item.children, position, line_offset)
+
+                continue
+
+            item_copy = vex_parser.VEXOutlineItem(
+                item.kind,
+                item.name,
+                item.type_name,
+                item.start + position,
+                item.end + position,
+                parent,
+            )
+            item_copy.line = item.line + line_offset
+            item_copy.end_line = item.end_line + line_offset
+            parent.children.append(item_copy)
+
+            self._copy_items(item_copy, item.children, position, line_offset)
+
+    def update(self, vex_code: str) -> vex_parser.VEXOutlineItem:
+        with self._lock:
+            root = vex_parser.VEXOutlineItem("snippet", "", end=len(vex_code))
+
+            lines = {}
+            segments = {}
+            struct_names = frozenset()
+
+            state = vex_lexer.DEFAULT_STATE
+            depth = 0
+
+            segment_lines = []
+            segment_names = set()
+            segment_position = 0
+            segment_line_offset = 0
+            line_count = 0
+
+            for line in vex_code.split("\n"):
+                key = (line, state)
+                line_data = lines.get(key) or self._lines.get(key)
+
+                if line_data is None:
+                    line_data = self._get_line_data(line, state)
+
+                lines[key] = line_data
+                state, depth_delta, last_text, names = line_data
+                segment_lines.append(line)
+                line_count += 1
+
+                if names:
+                    segment_names.update(names)
+
+                if depth_delta:
+                    depth = max(0, depth + depth_delta)
+
+                # Segments end after top-level blocks and some statements.
+                if (
+                    depth
+                    or state != vex_lexer.DEFAULT_STATE
+                    or last_text not in (";", "}")
+                    or (last_text == ";" and hash(line) % SEGMENT_END_MODULUS)
+                ):
+                    continue
+
+                # Only the structs the segment names are part of its key, a
+                # struct added above does not parse everything below again.
+                segment_text = "\n".join(segment_lines)
+                items, segment_struct_names = self._get_segment(
+                    segment_text, struct_names.intersection(segment_names), segments
+                )
+
+                if segment_struct_names:
+                    struct_names = struct_names | segment_struct_names
+
+                self._copy_items(root, items, segment_position, segment_line_offset)
+
+                segment_lines = []
+                segment_names = set()
+                segment_position += len(segment_text) + 1
+                segment_line_offset = line_count
+
+            if segment_lines:
+                segment_text = "\n".join(segment_lines)
+                items, _ = self._get_segment(
+                    segment_text, struct_names.intersection(segment_names), segments
+                )
+
+                self._copy_items(root, items, segment_position, segment_line_offset)
+
+            self._lines = lines
+            self._segments = segments
+            self.root = root
+
+        return root
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lines = {}
+            self._segments = {}
+            self.root = vex_parser.VEXOutlineItem("snippet", "")
@@ -0,0 +1,451 @@
+from typing import Iterator
+from typing import Optional
+import bisect
+import logging
+import re
+
+import vex_manager.core.vex_lexer as vex_lexer
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+FUNCTION = "function"
+STRUCT = "struct"
+BLOCK = "block"
+DECLARATION = "declaration"
+ATTRIBUTE_READ = "attribute_read"
+ATTRIBUTE_WRITE = "attribute_write"
+
+MODIFIERS = frozenset(("const", "export", "function"))
+BLOCK_KEYWORDS = frozenset(
+    (
+        "do",
+        "else",
+        "for",
+        "foreach",
+        "forpoints",
+        "gather",
+        "if",
+        "illuminance",
+        "while",
+    )
+)
+
+ATTRIBUTE_PREFIX_TYPES = {
+    "f": "float",
+    "u": "vector2",
+    "v": "vector",
+    "p": "vector4",
+    "2": "matrix2",
+    "3": "matrix3",
+    "4": "matrix",
+    "i": "int",
+    "s": "string",
+    "d": "dict",
+}
+
+# https://www.sidefx.com/docs/houdini/vex/snippets.html#known-attributes
+KNOWN_ATTRIBUTE_TYPES = {
+    **dict.fromkeys(
+        (
+            "P",
+            "accel",
+            "Cd",
+            "N",
+            "scale",
+            "force",
+            "rest",
+            "torque",
+            "up",
+            "uv",
+            "v",
+        ),
+        "vector",
+    ),
+    **dict.fromkeys(("backtrack", "orient", "rot"), "vector4"),
+    **dict.fromkeys(
+        (
+            "id",
+            "nextid",
+            "pstate",
+            "elemnum",
+            "ptnum",
+            "primnum",
+            "vtxnum",
+            "numpt",
+            "numprim",
+            "numvtx",
+        ),
+        "int",
+    ),
+    **dict.fromkeys(("name", "instance"), "string"),
+}
+
+ASSIGNMENT_OPERATORS = frozenset(
+    ("=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "<<=", ">>=")
+)
+INCREMENT_OPERATORS = frozenset(("++", "--"))
+
+# A brace after these starts a value, like an array, not a block.
+VALUE_PREFIXES = frozenset(
+    ("=", ",", "(", "{", "[", "?", ":", "return", *ASSIGNMENT_OPERATORS)
+)
+
+ATTRIBUTE_REG_EXP = re.compile(r"^(?:(\w{1,2})?(\[\])?)@(\w+)$")
+
+
+def get_attribute_type(attribute: str) -> str:
+    match = ATTRIBUTE_REG_EXP.match(attribute)
+
+    if not match:
+        return ""
+
+    prefix, array, name = match.groups()
+
+    if prefix:
+        type_name = ATTRIBUTE_PREFIX_TYPES.get(prefix, "")
+    elif name.startswith("group_"):
+        type_name = "int"
+    else:
+        type_name = KNOWN_ATTRIBUTE_TYPES.get(name, "float")
+
+    return f"{type_name}[]" if array and type_name else type_name
+
+
+def get_significant_tokens(vex_code: str) -> list[tuple[int, int, str, str]]:
+    tokens, _ = vex_lexer.tokenize(vex_code)
+
+    return [
+        (start, start + length, kind, vex_code[start : start + length])
+        for start, length, kind in tokens
+        if vex_lexer.is_significant(kind)
+    ]
+
+
+def is_attribute_write(tokens: list[tuple[int, int, str, str]], index: int) -> bool:
+    previous_text = tokens[index - 1][3] if index else ""
+    position = index + 1
+
+    # Components and elements, like "v@P.y" or "i[]@pts[0]".
+    if position < len(tokens) and tokens[position][3] == ".":
+        position += 2
+    elif position < len(tokens) and tokens[position][3] == "[":
+        depth = 0
+
+        while position < len(tokens):
+            depth += {"[": 1, "]": -1}.get(tokens[position][3], 0)
+            position += 1
+
+            if not depth:
+                break
+
+    next_text = tokens[position][3] if position < len(tokens) else ""
+
+    return (
+        previous_text in INCREMENT_OPERATORS
+        or next_text in ASSIGNMENT_OPERATORS
+        or next_text in INCREMENT_OPERATORS
+    )
+
+
+def get_call_argument(
+    vex_code: str, state: int = vex_lexer.DEFAULT_STATE
+) -> tuple[str, int]:
+
+    # The call the end of the code is in and the index of its argument there,
+    # ("fit", 2) for "fit(x, 0, 1", nothing in comments and outside calls.
+    tokens, _ = vex_lexer.tokenize(vex_code, state)
+
+    if tokens:
+        start, length, kind = tokens[-1]
+
+        if not vex_lexer.is_significant(kind) and start + length >= len(vex_code):
+            return "", 0
+
+    tokens = [token for token in tokens if vex_lexer.is_significant(token[2])]
+    argument = 0
+    depth = 0
+
+    for i in range(len(tokens) - 1, -1, -1):
+        start, length, kind = tokens[i]
+        text = vex_code[start : start + length]
+
+        if text in (")", "]", "}"):
+            depth += 1
+        elif text in ("(", "[", "{"):
+            if depth:
+                depth -= 1
+
+                continue
+
+            if text != "(" or not i:
+                break
+
+            start, length, kind = tokens[i - 1]
+
+            if kind in (vex_lexer.FUNCTION, vex_lexer.IDENTIFIER):
+                return vex_code[start : start + length], argument
+
+            break
+        elif text == "," and not depth:
+            argument += 1
+        elif text == ";" and not depth:
+            break
+
+    return "", 0
+
+
+class VEXOutlineItem:
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        type_name: str = "",
+        start: int = 0,
+        end: int = 0,
+        parent: Optional["VEXOutlineItem"] = None,
+    ) -> None:
+
+        self.kind = kind
+        self.name = name
+        self.type_name = type_name
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.children = []
+
+        # Filled in by the parser, offsets are cheaper to track.
+        self.line = 0
+        self.end_line = 0
+
+    def walk(self) -> Iterator["VEXOutlineItem"]:
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    def __repr__(self) -> str:
+        type_name = f"{self.type_name} " if self.type_name else ""
+
+        return f"<VEXOutlineItem {self.kind} {type_name}{self.name} line {self.line}>"
+
+
+class VEXParser:
+
+    def __init__(self, vex_code: str) -> None:
+        self.vex_code = vex_code
+
+        self.tokens = get_significant_tokens(vex_code)
+
+        self.root = VEXOutlineItem("snippet", "", end=len(vex_code))
+        self.struct_names = set()
+
+        self._line_starts = [0]
+        self._line_starts.extend(match.end() for match in re.finditer("\n", vex_code))
+
+    def _get_line(self, position: int) -> int:
+        return bisect.bisect_right(self._line_starts, position)
+
+    def _add_item(
+        self,
+        parent: VEXOutlineItem,
+        kind: str,
+        name: str,
+        type_name: str,
+        start: int,
+        end: int,
+    ) -> VEXOutlineItem:
+
+        item = VEXOutlineItem(kind, name, type_name, start, end, parent)
+        parent.children.append(item)
+
+        return item
+
+    def _is_type(self, text: str, kind: str) -> bool:
+        return kind == vex_lexer.TYPE or text in self.struct_names
+
+    def _add_declarations(
+        self, parent: VEXOutlineItem, statement: list[tuple[int, int, str, str]]
+    ) -> None:
+
+        # "float a = 1, b[];", parameters "(int a; float b, c)" and headers
+        # like "foreach (int pt; pts)". A type starting a segment is followed
+        # by names, more follow commas at the depth of the type.
+        type_name = ""
+        type_depth = 0
+        expects_name = False
+        depth = 0
+
+        for i, (start, end, kind, text) in enumerate(statement):
+            previous_text = statement[i - 1][3] if i else ";"
+
+            if text in ("(", "{"):
+                depth += 1
+            elif text in (")", "}"):
+                depth -= 1
+
+                if depth < type_depth:
+                    type_name = ""
+            elif text in ("[", "]"):
+                continue
+
+            if (
+                self._is_type(text, kind)
+                and text != "struct"
+                and (previous_text in ("(", ";", ",") or previous_text in MODIFIERS)
+            ):
+                type_name = text
+                type_depth = depth
+                expects_name = True
+            elif not type_name or depth != type_depth:
+                continue
+            elif expects_name and kind in (vex_lexer.IDENTIFIER, vex_lexer.FUNCTION):
+                next_text = statement[i + 1][3] if i + 1 < len(statement) else ";"
+
+                # Calls and prototypes, like "float(x)" or "float f(int a)".
+                if next_text != "(":
+                    self._add_item(parent, DECLARATION, text, type_name, start, end)
+
+                expects_name = False
+            elif text == ",":
+                expects_name = True
+            elif text == ";":
+                type_name = ""
+            else:
+                expects_name = False
+
+    def _open_brace(
+        self,
+        parent: VEXOutlineItem,
+        statement: list[tuple[int, int, str, str]],
+        brace_end: int,
+    ) -> VEXOutlineItem:
+
+        texts = [token[3] for token in statement]
+        start = statement[0][0] if statement else brace_end - 1
+
+        while texts and texts[0] in MODIFIERS:
+            texts.pop(0)
+
+        if len(texts) >= 2 and texts[0] == "struct":
+            self.struct_names.add(texts[1])
+
+            return self._add_item(parent, STRUCT, texts[1], "", start, brace_end)
+
+        if texts and texts[0] in BLOCK_KEYWORDS:
+            item = self._add_item(parent, BLOCK, texts[0], "", start, brace_end)
+            self._add_declarations(item, statement)
+
+            return item
+
+        # "vector[] name(...)" or "int name(...)".
+        if "(" in texts and texts[-1:] == [")"]:
+            name_index = texts.index("(") - 1
+            type_texts = texts[:name_index]
+
+            if name_index >= 1 and (
+                type_texts[0] in vex_lexer.DATA_TYPES
+                or type_texts[0] in self.struct_names
+                or type_texts[0] == "void"
+            ):
+                item = self._add_item(
+                    parent,
+                    FUNCTION,
+                    texts[name_index],
+                    "".join(type_texts),
+                    start,
+                    brace_end,
+                )
+
+                parameters_start = next(
+                    i for i, token in enumerate(statement) if token[3] == "("
+                )
+                self._add_declarations(item, statement[parameters_start:])
+
+                return item
+
+        return self._add_item(parent, BLOCK, "", "", start, brace_end)
+
+    def _add_attribute(
+        self, parent: VEXOutlineItem, index: int, start: int, end: int, text: str
+    ) -> None:
+
+        kind = (
+            ATTRIBUTE_WRITE
+            if is_attribute_write(self.tokens, index)
+            else ATTRIBUTE_READ
+        )
+        name = text.rsplit("@", 1)[-1]
+
+        # One binding per name and access in each scope keeps outlines short,
+        # the first one with an explicit type gives its type.
+        for item in parent.children:
+            if item.kind == kind and item.name == name:
+                if not text.startswith("@"):
+                    item.type_name = get_attribute_type(text)
+
+                return
+
+        self._add_item(parent, kind, name, get_attribute_type(text), start, end)
+
+    def parse(self) -> VEXOutlineItem:
+        # Braces of values, like "{0, 1, 0}", are kept in the stack as None.
+        braces = []
+        scope = self.root
+        statement = []
+        depth = 0
+
+        for index, token in enumerate(self.tokens):
+            start, end, kind, text = token
+
+            if kind == vex_lexer.ATTRIBUTE:
+                self._add_attribute(scope, index, start, end, text)
+
+            if text == "{":
+                previous_text = statement[-1][3] if statement else ""
+
+                if depth or previous_text in VALUE_PREFIXES:
+                    braces.append(None)
+                    statement.append(token)
+                else:
+                    scope = self._open_brace(scope, statement, end)
+                    braces.append(scope)
+                    statement = []
+            elif text == "}":
+                item = braces.pop() if braces else None
+
+                if item is None:
+                    statement.append(token)
+
+                    continue
+
+                self._add_declarations(scope, statement)
+                statement = []
+
+                item.end = end
+                scope = item.parent
+            elif text == ";" and not depth:
+                self._add_declarations(scope, statement)
+                statement = []
+            else:
+                if text == "(":
+                    depth += 1
+                elif text == ")":
+                    depth = max(0, depth - 1)
+
+                statement.append(token)
+
+        self._add_declarations(scope, statement)
+
+        self.root.children.sort(key=lambda child: child.start)
+
+        for item in self.root.walk():
+            item.children.sort(key=lambda child: child.start)
+            item.line = self._get_line(item.start)
+            item.end_line = self._get_line(max(item.start, item.end - 1))
+
+        return self.root
+
+
+def parse(vex_code: str) -> VEXOutlineItem:
+    return VEXParser(vex_code).parse()
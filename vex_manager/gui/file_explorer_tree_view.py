@@ -9,10 +9,13 @@ except ImportError:
 
 import hou
 
+import threading
 import logging
 import json
 import os
 
+from vex_manager.gui.library_tree_model import LibraryTreeModel
+from vex_manager.gui.vex_file_worker import VEXFilePrefetcher
 import vex_manager.utils as utils
 import vex_manager.core as core
 
@@ -23,20 +26,20 @@ logger = logging.getLogger(f"vex_manager.{__name__}")
 class FileExplorerTreeView(QtWidgets.QTreeView):
     PREFERENCES_PATH = utils.get_preferences_path()
 
+    PREFETCH_RADIUS = 4
+
     def __init__(self) -> None:
         super().__init__()
 
         self.library_path = ""
 
-        self.file_system_model = QtWidgets.QFileSystemModel()
-        self.file_system_model.setNameFilters(["*.vfl"])
-        self.file_system_model.setNameFilterDisables(False)
+        self._prefetch_cancelled = None
+
+        self.library_tree_model = LibraryTreeModel(self)
 
         self.setHeaderHidden(True)
-        self.setModel(self.file_system_model)
-        self.hideColumn(1)
-        self.hideColumn(2)
-        self.hideColumn(3)
+        self.setUniformRowHeights(True)
+        self.setModel(self.library_tree_model)
 
     def _load_preferences(self) -> None:
         settings = {}
@@ -62,9 +65,9 @@ class FileExplorerTreeView(QtWidgets.QTreeView):
                 current_index = self.currentIndex()
 
                 if current_index.data():
-                    self.file_system_model.mkdir(current_index, folder_name)
+                    self.library_tree_model.mkdir(current_index, folder_name)
                 else:
-                    self.file_system_model.mkdir(self.rootIndex(), folder_name)
+                    self.library_tree_model.mkdir(self.rootIndex(), folder_name)
             else:
                 logger.error(f"Invalid folder name {folder_name!r}")
 
@@ -83,9 +86,9 @@ class FileExplorerTreeView(QtWidgets.QTreeView):
                 current_index = self.currentIndex()
 
                 if current_index.data():
-                    item_path = self.file_system_model.filePath(current_index)
+                    item_path = self.library_tree_model.filePath(current_index)
 
-                    if os.path.isfile(item_path):
+                    if not self.library_tree_model.isDir(current_index):
                         item_path = os.path.dirname(item_path)
 
                     file_path = core.create_new_vex_file(item_path, file_name)
@@ -98,14 +101,12 @@ class FileExplorerTreeView(QtWidgets.QTreeView):
 
     def delete_selected_item(self) -> None:
         current_index = self.currentIndex()
-        item_path = self.file_system_model.filePath(current_index)
+        item_path = self.library_tree_model.filePath(current_index)
 
-        if item_path == self.library_path:
+        if item_path == self.library_tree_model.library_path:
             return
 
-        item_path = self.file_system_model.filePath(current_index)
-
-        if os.path.isdir(item_path):
+        if self.library_tree_model.isDir(current_index):
             warn = "Delete selected folder?"
         else:
             warn = "Delete selected VEX file?"
@@ -125,17 +126,55 @@ class FileExplorerTreeView(QtWidgets.QTreeView):
             )
 
         if not result:
-            self.file_system_model.remove(current_index)
+            self.library_tree_model.remove(current_index)
+
+    def _prefetch_neighbours(self, index: QtCore.QModelIndex) -> None:
+        if self._prefetch_cancelled:
+            self._prefetch_cancelled.set()
+            self._prefetch_cancelled = None
+
+        if not index.isValid():
+            return
+
+        # Closest snippets first, they are the most likely to be opened next.
+        file_paths = []
+
+        for distance in range(1, FileExplorerTreeView.PREFETCH_RADIUS + 1):
+            for row in (index.row() + distance, index.row() - distance):
+                sibling = index.sibling(row, 0)
 
-    def get_file_system_model(self) -> QtWidgets.QFileSystemModel:
-        return self.file_system_model
+                if sibling.isValid() and not self.library_tree_model.isDir(sibling):
+                    file_paths.append(self.library_tree_model.filePath(sibling))
+
+        if not self.library_tree_model.isDir(index):
+            file_paths.insert(0, self.library_tree_model.filePath(index))
+
+        if file_paths:
+            self._prefetch_cancelled = threading.Event()
+
+            QtCore.QThreadPool.globalInstance().start(
+                VEXFilePrefetcher(file_paths, self._prefetch_cancelled)
+            )
+
+    def get_library_tree_model(self) -> LibraryTreeModel:
+        return self.library_tree_model
 
     def set_library_path(self, library_path: str) -> None:
         self.library_path = library_path
 
-        self.setRootIndex(self.file_system_model.index(self.library_path))
+        self.library_tree_model.set_library_path(self.library_path)
+
+        # Syncs the index once, then pushes changes made by anyone.
+        if os.path.isdir(self.library_path):
+            core.watch_library(self.library_path)
+
+    def currentChanged(
+        self, current: QtCore.QModelIndex, previous: QtCore.QModelIndex
+    ) -> None:
+
+        super().currentChanged(current, previous)
 
-        self.file_system_model.setRootPath(self.library_path)
+        self._prefetch_neighbours(current)
 
     def mousePressEvent(self, event):
         super().mousePressEvent(event)
@@ -8,13 +8,53 @@ except ImportError:
     from PySide2 import QtGui
 
 import logging
+import os
 
 from vex_manager.gui.file_explorer_tree_view import FileExplorerTreeView
+import vex_manager.core.search_index as search_index
 import vex_manager.core as core
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
+# Milliseconds after the last key before the library is searched.
+SEARCH_DELAY = 200
+
+MAX_SEARCH_RESULTS = 500
+
+
+class VEXSearchWorkerSignals(QtCore.QObject):
+    found = QtCore.Signal(int, list)
+
+
+class VEXSearchWorker(QtCore.QRunnable):
+
+    def __init__(
+        self,
+        request_id: int,
+        text: str,
+        search_index: core.SearchIndex,
+        signals: VEXSearchWorkerSignals,
+    ) -> None:
+
+        super().__init__()
+
+        self.request_id = request_id
+        self.text = text
+        self.search_index = search_index
+        self.signals = signals
+
+    def run(self) -> None:
+        # Waits for the library index while the watcher updates it.
+        try:
+            file_paths = self.search_index.search(self.text, limit=MAX_SEARCH_RESULTS)
+        except Exception:
+            logger.exception(f"Failed to search {self.text!r}.")
+
+            file_paths = []
+
+        self.signals.found.emit(self.request_id, file_paths)
+
 
 class FileExplorerWidget(QtWidgets.QWidget):
     double_clicked = QtCore.Signal(str)
@@ -23,16 +63,37 @@ class FileExplorerWidget(QtWidgets.QWidget):
         super().__init__()
 
         self.library_path = ""
+        self.search_index = None
+        self.symbol_index = None
         self.warn_before_deleting_a_file = True
 
+        self._search_request_id = 0
+
+        # Searches run one after the other, the ones still waiting are
+        # dropped when the text changes again.
+        self.search_thread_pool = QtCore.QThreadPool(self)
+        self.search_thread_pool.setMaxThreadCount(1)
+
+        self.vex_search_worker_signals = VEXSearchWorkerSignals(self)
+
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY)
+
         self._create_widgets()
         self._create_layouts()
         self._create_connections()
 
     def _create_widgets(self) -> None:
+        self.search_line_edit = QtWidgets.QLineEdit()
+        self.search_line_edit.setPlaceholderText("Search in VEX files")
+        self.search_line_edit.setClearButtonEnabled(True)
+
+        self.search_results_list_widget = QtWidgets.QListWidget()
+        self.search_results_list_widget.setVisible(False)
 
         self.file_explorer_tree_view = FileExplorerTreeView()
-        self.file_system_model = self.file_explorer_tree_view.get_file_system_model()
+        self.library_tree_model = self.file_explorer_tree_view.get_library_tree_model()
 
         self.delete_push_button = QtWidgets.QPushButton("Delete")
 
@@ -42,6 +103,8 @@ class FileExplorerWidget(QtWidgets.QWidget):
 
     def _create_layouts(self) -> None:
         main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.search_line_edit)
+        main_layout.addWidget(self.search_results_list_widget)
         main_layout.addWidget(self.file_explorer_tree_view)
         main_layout.addWidget(self.delete_push_button)
         main_layout.setContentsMargins(QtCore.QMargins())
@@ -53,17 +116,89 @@ class FileExplorerWidget(QtWidgets.QWidget):
         main_layout.addLayout(new_h_box_layout)
 
     def _create_connections(self) -> None:
+        self.search_line_edit.textChanged.connect(self._search_text_changed_line_edit)
+        self.vex_search_worker_signals.found.connect(self._search_found)
+        self._search_timer.timeout.connect(self._search_timeout)
+        self.search_results_list_widget.itemDoubleClicked.connect(
+            self._search_results_item_double_clicked_list_widget
+        )
+
         self.file_explorer_tree_view.doubleClicked.connect(
             self._file_explorer_double_clicked_tree_view
         )
 
         self.delete_push_button.clicked.connect(self._delete_clicked_push_button)
         self.new_file_push_button.clicked.connect(self._new_file_clicked_push_button)
-        self.new_folder_push_button.clicked.connect(self._new_folder_clicked_push_button)
+        self.new_folder_push_button.clicked.connect(
+            self._new_folder_clicked_push_button
+        )
 
-    def _file_explorer_double_clicked_tree_view(self, index: QtCore.QModelIndex) -> None:
-        if not self.file_system_model.isDir(index):
-            self.double_clicked.emit(self.file_system_model.filePath(index))
+    def _file_explorer_double_clicked_tree_view(
+        self, index: QtCore.QModelIndex
+    ) -> None:
+        if not self.library_tree_model.isDir(index):
+            self.double_clicked.emit(self.library_tree_model.filePath(index))
+
+    def _search_text_changed_line_edit(self, text: str) -> None:
+        # Results of the previous text are dropped when they arrive.
+        self._search_request_id += 1
+        self._search_timer.stop()
+
+        searching = bool(text) and self.search_index is not None
+
+        self.search_results_list_widget.setVisible(searching)
+        self.file_explorer_tree_view.setVisible(not searching)
+
+        if not searching:
+            self.search_results_list_widget.clear()
+
+            return
+
+        if len(text) < search_index.TRIGRAM_SIZE:
+            self.search_results_list_widget.clear()
+
+            item = QtWidgets.QListWidgetItem(
+                f"Type at least {search_index.TRIGRAM_SIZE} characters"
+            )
+            item.setFlags(QtCore.Qt.NoItemFlags)
+            self.search_results_list_widget.addItem(item)
+
+            return
+
+        self._search_timer.start()
+
+    def _search_timeout(self) -> None:
+        if not self.search_index:
+            return
+
+        self.search_thread_pool.clear()
+        self.search_thread_pool.start(
+            VEXSearchWorker(
+                self._search_request_id,
+                self.search_line_edit.text(),
+                self.search_index,
+                self.vex_search_worker_signals,
+            )
+        )
+
+    def _search_found(self, request_id: int, file_paths: list[str]) -> None:
+        if request_id != self._search_request_id:
+            return
+
+        self.search_results_list_widget.clear()
+
+        for file_path in file_paths:
+            item = QtWidgets.QListWidgetItem()
+            item.setText(os.path.relpath(file_path, self.library_path))
+            item.setData(QtCore.Qt.UserRole, file_path)
+            item.setToolTip(file_path)
+            self.search_results_list_widget.addItem(item)
+
+    def _search_results_item_double_clicked_list_widget(
+        self, item: QtWidgets.QListWidgetItem
+    ) -> None:
+
+        self.double_clicked.emit(item.data(QtCore.Qt.UserRole))
 
     def _delete_clicked_push_button(self) -> None:
         self.file_explorer_tree_view.delete_selected_item()
@@ -80,4 +215,17 @@ class FileExplorerWidget(QtWidgets.QWidget):
     def set_library_path(self, library_path: str) -> None:
         self.library_path = library_path
 
+        if os.path.isdir(library_path):
+            self.search_index = core.get_search_index(library_path)
+            self.symbol_index = core.get_symbol_index(library_path)
+        else:
+            self.search_index = None
+            self.symbol_index = None
+
         self.file_explorer_tree_view.set_library_path(library_path)
+
+        if self.search_index:
+            self.search_index.build_in_background()
+            self.symbol_index.update_in_background()
+
+        self._search_text_changed_line_edit(self.search_line_edit.text())
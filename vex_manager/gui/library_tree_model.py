@@ -0,0 +1,516 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+from typing import Optional
+import bisect
+import logging
+import shutil
+import os
+
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+FILE_EXTENSION = ".vfl"
+
+
+class LibraryTreeItem:
+    NOT_FETCHED = 0
+    FETCHING = 1
+    FETCHED = 2
+
+    def __init__(
+        self, path: str, is_dir: bool, parent: Optional["LibraryTreeItem"] = None
+    ) -> None:
+
+        self.path = path
+        self.name = os.path.basename(path)
+        self.is_dir = is_dir
+        self.parent = parent
+
+        self.row_number = 0
+
+        self.children = []
+        self.pending_children = []
+        self.fetch_state = (
+            LibraryTreeItem.NOT_FETCHED if is_dir else LibraryTreeItem.FETCHED
+        )
+
+    def get_sort_key(self) -> tuple[bool, str]:
+        return not self.is_dir, self.name.lower()
+
+    def renumber_children(self, start: int = 0) -> None:
+        for row_number in range(start, len(self.children)):
+            self.children[row_number].row_number = row_number
+
+
+class LibraryScannerSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, str, list, list)
+
+
+class LibraryScanner(QtCore.QRunnable):
+
+    def __init__(self, generation: int, folder_path: str, library_path: str) -> None:
+        super().__init__()
+
+        self.generation = generation
+        self.folder_path = folder_path
+        self.library_path = library_path
+
+        self.signals = LibraryScannerSignals()
+
+    def run(self) -> None:
+        folder_paths = []
+        file_paths = []
+
+        library_index = core.find_library_index(self.folder_path)
+
+        if library_index and library_index.exists(self.folder_path):
+            folder_paths = library_index.get_folders(self.folder_path)
+            file_paths = library_index.get_vex_files(self.folder_path)
+        else:
+            # Not indexed yet, the background index update will follow.
+            try:
+                with os.scandir(self.folder_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            folder_paths.append(os.path.normpath(entry.path))
+                        elif entry.name.endswith(FILE_EXTENSION):
+                            file_paths.append(os.path.normpath(entry.path))
+            except OSError as error:
+                logger.error(f"Could not list {self.folder_path!r}: {error}")
+
+        self.signals.finished.emit(
+            self.generation, self.folder_path, folder_paths, file_paths
+        )
+
+
+class LibraryFileOperationSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, str, str, bool)
+
+
+class LibraryFileOperation(QtCore.QRunnable):
+    OPEN = "open"
+    MKDIR = "create"
+    REMOVE = "remove"
+
+    def __init__(
+        self,
+        generation: int,
+        operation: str,
+        path: str,
+        is_dir: bool,
+        signals: LibraryFileOperationSignals,
+    ) -> None:
+
+        super().__init__()
+
+        self.generation = generation
+        self.operation = operation
+        self.path = path
+        self.is_dir = is_dir
+        self.signals = signals
+
+    def run(self) -> None:
+        succeeded = False
+
+        try:
+            if self.operation == LibraryFileOperation.OPEN:
+                # Opening the index of a new library creates its database.
+                succeeded = os.path.isdir(self.path)
+
+                if succeeded:
+                    core.get_library_index(self.path)
+            elif self.operation == LibraryFileOperation.MKDIR:
+                os.mkdir(self.path)
+                succeeded = True
+            elif self.is_dir:
+                shutil.rmtree(self.path)
+                succeeded = True
+            else:
+                os.remove(self.path)
+                succeeded = True
+
+            library_index = core.find_library_index(self.path)
+
+            # The watcher would catch up, the index is told right away.
+            if succeeded and library_index:
+                if self.operation == LibraryFileOperation.MKDIR:
+                    library_index.add_folder(self.path)
+                elif self.operation == LibraryFileOperation.REMOVE:
+                    library_index.remove_path(self.path)
+        except OSError as error:
+            logger.error(f"Could not {self.operation} {self.path!r}: {error}")
+
+        self.signals.finished.emit(
+            self.generation, self.operation, self.path, succeeded
+        )
+
+
+class LibraryTreeModel(QtCore.QAbstractItemModel):
+    PAGE_SIZE = 256
+
+    library_index_changed = QtCore.Signal(str, bool)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+
+        self.library_path = ""
+        self.library_index = None
+
+        self._generation = 0
+        self._items = {}
+        self._root_item = LibraryTreeItem("", True)
+        self._scanners = set()
+
+        # One at a time, so a folder is created before it can be removed.
+        self.file_thread_pool = QtCore.QThreadPool(self)
+        self.file_thread_pool.setMaxThreadCount(1)
+
+        self.library_file_operation_signals = LibraryFileOperationSignals(self)
+
+        icon_provider = QtWidgets.QFileIconProvider()
+        self._folder_icon = icon_provider.icon(QtWidgets.QFileIconProvider.Folder)
+        self._file_icon = icon_provider.icon(QtWidgets.QFileIconProvider.File)
+
+        self.library_index_changed.connect(self._library_index_changed)
+        self.library_file_operation_signals.finished.connect(
+            self._file_operation_finished
+        )
+
+    def _get_item(self, index: QtCore.QModelIndex) -> LibraryTreeItem:
+        if index.isValid():
+            return index.internalPointer()
+
+        return self._root_item
+
+    def _get_index(self, item: LibraryTreeItem) -> QtCore.QModelIndex:
+        if item is self._root_item or not item.parent:
+            return QtCore.QModelIndex()
+
+        return self.createIndex(item.row_number, 0, item)
+
+    def _emit_library_index_changed(self, path: str, content: Optional[bytes]) -> None:
+        # Called from the thread that updated the index.
+        self.library_index_changed.emit(path, content is not None)
+
+    def _library_index_changed(self, path: str, exists: bool) -> None:
+        path = os.path.normpath(path)
+
+        if exists:
+            if path in self._items:
+                return
+
+            # New files can live in folders the model has not seen yet.
+            child_path = path
+            parent_path = os.path.dirname(path)
+
+            while parent_path not in self._items:
+                if parent_path == os.path.dirname(parent_path):
+                    return
+
+                child_path = parent_path
+                parent_path = os.path.dirname(parent_path)
+
+            parent_item = self._items[parent_path]
+
+            if parent_item.fetch_state == LibraryTreeItem.FETCHED:
+                item = LibraryTreeItem(child_path, child_path != path)
+                self._insert_item(parent_item, item)
+        else:
+            item = self._items.get(path)
+
+            if item:
+                self._remove_item(item)
+
+    def _insert_item(self, parent_item: LibraryTreeItem, item: LibraryTreeItem) -> None:
+        item.parent = parent_item
+        self._items[item.path] = item
+
+        keys = [child.get_sort_key() for child in parent_item.children]
+        row = bisect.bisect(keys, item.get_sort_key())
+
+        if row == len(parent_item.children) and parent_item.pending_children:
+            # Sorts after the loaded pages, it shows up with its own page.
+            keys = [child.get_sort_key() for child in parent_item.pending_children]
+            row = bisect.bisect(keys, item.get_sort_key())
+            parent_item.pending_children.insert(row, item)
+
+            return
+
+        self.beginInsertRows(self._get_index(parent_item), row, row)
+        parent_item.children.insert(row, item)
+        parent_item.renumber_children(row)
+        self.endInsertRows()
+
+    def _remove_item(self, item: LibraryTreeItem) -> None:
+        parent_item = item.parent
+
+        if not parent_item:
+            return
+
+        self._items.pop(item.path, None)
+
+        if item.is_dir:
+            for path in list(self._items):
+                if path.startswith(item.path + os.sep):
+                    del self._items[path]
+
+        if item in parent_item.pending_children:
+            parent_item.pending_children.remove(item)
+
+            return
+
+        row = item.row_number
+
+        self.beginRemoveRows(self._get_index(parent_item), row, row)
+        parent_item.children.pop(row)
+        parent_item.renumber_children(row)
+        self.endRemoveRows()
+
+    def _scanner_finished(
+        self,
+        generation: int,
+        folder_path: str,
+        folder_paths: list[str],
+        file_paths: list[str],
+    ) -> None:
+
+        if generation != self._generation:
+            return
+
+        item = self._items.get(folder_path)
+
+        if not item or item.fetch_state != LibraryTreeItem.FETCHING:
+            return
+
+        children = [LibraryTreeItem(path, True, item) for path in folder_paths]
+        children.extend(LibraryTreeItem(path, False, item) for path in file_paths)
+        children.sort(key=LibraryTreeItem.get_sort_key)
+
+        for child in children:
+            self._items[child.path] = child
+
+        item.pending_children = children
+        item.fetch_state = LibraryTreeItem.FETCHED
+
+        index = self._get_index(item)
+
+        if not children:
+            # Drops the expand arrow of empty folders.
+            self.dataChanged.emit(index, index)
+
+        self.fetchMore(index)
+
+    def _file_operation_finished(
+        self, generation: int, operation: str, path: str, succeeded: bool
+    ) -> None:
+
+        if generation != self._generation:
+            return
+
+        if operation == LibraryFileOperation.OPEN:
+            if succeeded:
+                self.library_index = core.get_library_index(path)
+                self.library_index.add_callback(self._emit_library_index_changed)
+
+                self._root_item.fetch_state = LibraryTreeItem.NOT_FETCHED
+                self.fetchMore(QtCore.QModelIndex())
+            else:
+                self._root_item.fetch_state = LibraryTreeItem.FETCHED
+
+            return
+
+        if not succeeded:
+            return
+
+        if operation == LibraryFileOperation.MKDIR:
+            parent_item = self._items.get(os.path.dirname(path))
+
+            if (
+                parent_item
+                and parent_item.fetch_state == LibraryTreeItem.FETCHED
+                and path not in self._items
+            ):
+                self._insert_item(parent_item, LibraryTreeItem(path, True))
+        else:
+            item = self._items.get(path)
+
+            if item:
+                self._remove_item(item)
+
+    def _start_file_operation(
+        self, operation: str, path: str, is_dir: bool = True
+    ) -> None:
+
+        self.file_thread_pool.start(
+            LibraryFileOperation(
+                self._generation,
+                operation,
+                path,
+                is_dir,
+                self.library_file_operation_signals,
+            )
+        )
+
+    def set_library_path(self, library_path: str) -> None:
+        self.beginResetModel()
+
+        if self.library_index:
+            self.library_index.remove_callback(self._emit_library_index_changed)
+
+        self._generation += 1
+        self.library_path = os.path.normpath(library_path) if library_path else ""
+        self.library_index = None
+        self._root_item = LibraryTreeItem(self.library_path, True)
+        self._items = {self.library_path: self._root_item}
+
+        # Fetched once the library is found to exist, network drives can
+        # take seconds to answer.
+        if self.library_path:
+            self._root_item.fetch_state = LibraryTreeItem.FETCHING
+            self._start_file_operation(LibraryFileOperation.OPEN, self.library_path)
+        else:
+            self._root_item.fetch_state = LibraryTreeItem.FETCHED
+
+        self.endResetModel()
+
+    def index_from_path(self, path: str) -> QtCore.QModelIndex:
+        item = self._items.get(os.path.normpath(path))
+
+        if item and item.parent and item not in item.parent.pending_children:
+            return self._get_index(item)
+
+        return QtCore.QModelIndex()
+
+    def filePath(self, index: QtCore.QModelIndex) -> str:
+        return self._get_item(index).path
+
+    def isDir(self, index: QtCore.QModelIndex) -> bool:
+        return self._get_item(index).is_dir
+
+    def mkdir(self, parent: QtCore.QModelIndex, name: str) -> None:
+        # The folder shows up once created.
+        parent_item = self._get_item(parent)
+
+        if not parent_item.is_dir:
+            parent_item = parent_item.parent
+
+        if parent_item.path:
+            folder_path = os.path.join(parent_item.path, name)
+
+            self._start_file_operation(LibraryFileOperation.MKDIR, folder_path)
+
+    def remove(self, index: QtCore.QModelIndex) -> None:
+        # The item goes away once removed.
+        item = self._get_item(index)
+
+        if item is not self._root_item:
+            self._start_file_operation(
+                LibraryFileOperation.REMOVE, item.path, item.is_dir
+            )
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        item = self._get_item(parent)
+
+        return item.fetch_state == LibraryTreeItem.NOT_FETCHED or bool(
+            item.pending_children
+        )
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        item = self._get_item(parent)
+
+        if item.fetch_state == LibraryTreeItem.NOT_FETCHED and item.path:
+            item.fetch_state = LibraryTreeItem.FETCHING
+
+            scanner = LibraryScanner(self._generation, item.path, self.library_path)
+            scanner.signals.finished.connect(self._scanner_finished)
+            scanner.signals.finished.connect(
+                lambda *args, scanner=scanner: self._scanners.discard(scanner)
+            )
+            self._scanners.add(scanner)
+
+            QtCore.QThreadPool.globalInstance().start(scanner)
+
+        elif item.pending_children:
+            page = item.pending_children[: LibraryTreeModel.PAGE_SIZE]
+            row = len(item.children)
+
+            self.beginInsertRows(parent, row, row + len(page) - 1)
+            item.children.extend(page)
+            item.renumber_children(row)
+            del item.pending_children[: len(page)]
+            self.endInsertRows()
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        item = self._get_item(parent)
+
+        if not item.is_dir:
+            return False
+
+        if item.fetch_state != LibraryTreeItem.FETCHED:
+            return True
+
+        return bool(item.children or item.pending_children)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+
+        return len(self._get_item(parent).children)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 1
+
+    def index(
+        self,
+        row: int,
+        column: int,
+        parent: QtCore.QModelIndex = QtCore.QModelIndex(),
+    ) -> QtCore.QModelIndex:
+
+        parent_item = self._get_item(parent)
+
+        if column != 0 or not 0 <= row < len(parent_item.children):
+            return QtCore.QModelIndex()
+
+        return self.createIndex(row, column, parent_item.children[row])
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:
+        if not index.isValid():
+            return QtCore.QModelIndex()
+
+        item = index.internalPointer()
+
+        if not item.parent or item.parent is self._root_item:
+            return QtCore.QModelIndex()
+
+        return self._get_index(item.parent)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        item = index.internalPointer()
+
+        if role == QtCore.Qt.DisplayRole:
+            return item.name
+        elif role == QtCore.Qt.DecorationRole:
+            return self._folder_icon if item.is_dir else self._file_icon
+        elif role == QtCore.Qt.ToolTipRole:
+            return item.path
+
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
@@ -16,6 +16,7 @@ import os
 from vex_manager.config import ColorScheme
 import vex_manager.utils as utils
 
+
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
 
@@ -83,6 +84,19 @@ class PreferencesUI(QtWidgets.QWidget):
             "Insert Closing Quotes"
         )
 
+        self.auto_complete_check_box = QtWidgets.QCheckBox("Auto-complete")
+
+        self.max_open_documents_spin_box = QtWidgets.QSpinBox()
+        self.max_open_documents_spin_box.setButtonSymbols(
+            QtWidgets.QAbstractSpinBox.NoButtons
+        )
+        self.max_open_documents_spin_box.setFixedWidth(75)
+        self.max_open_documents_spin_box.setRange(1, 64)
+        self.max_open_documents_spin_box.setToolTip(
+            "Snippets kept in memory with their undo history, older ones are "
+            "read again when shown."
+        )
+
         self.revert_to_default = QtWidgets.QPushButton("Revert to Default")
         self.revert_to_default.setVisible(False)
 
@@ -178,6 +192,10 @@ class PreferencesUI(QtWidgets.QWidget):
         code_editor_form_layout.addWidget(self.backspace_on_tab_stop_check_box)
         code_editor_form_layout.addWidget(self.insert_closing_brackets_check_box)
         code_editor_form_layout.addWidget(self.insert_closing_quotes_check_box)
+        code_editor_form_layout.addWidget(self.auto_complete_check_box)
+        code_editor_form_layout.addRow(
+            "Snippets Kept Open ", self.max_open_documents_spin_box
+        )
         code_editor_form_layout.setContentsMargins(6, 6, 6, 6)
         code_editor_form_layout.setSpacing(6)
         code_editor_group_box.setLayout(code_editor_form_layout)
@@ -306,6 +324,8 @@ class PreferencesUI(QtWidgets.QWidget):
         self.insert_closing_quotes_check_box.setChecked(
             settings.get("insert_closing_quotes", True)
         )
+        self.auto_complete_check_box.setChecked(settings.get("auto_complete", True))
+        self.max_open_documents_spin_box.setValue(settings.get("max_open_documents", 8))
 
         self.font_combo_box.setCurrentText(settings.get("font", "Source Sans Pro"))
         self.font_size_spin_box.setValue(settings.get("font_size", 8))
@@ -327,6 +347,8 @@ class PreferencesUI(QtWidgets.QWidget):
             "backspace_on_tab_stop": self.backspace_on_tab_stop_check_box.isChecked(),
             "insert_closing_brackets": self.insert_closing_brackets_check_box.isChecked(),
             "insert_closing_quotes": self.insert_closing_quotes_check_box.isChecked(),
+            "auto_complete": self.auto_complete_check_box.isChecked(),
+            "max_open_documents": self.max_open_documents_spin_box.value(),
             "font": self.font_combo_box.currentText(),
             "font_size": self.font_size_spin_box.value(),
             "color_scheme": self.color_scheme,
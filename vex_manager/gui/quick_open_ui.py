@@ -0,0 +1,235 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+import hou
+
+from typing import Optional
+import logging
+import json
+import os
+
+from vex_manager.core.fuzzy_matcher import FuzzyMatcher
+import vex_manager.utils as utils
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+
+class QuickOpenUI(QtWidgets.QWidget):
+    WINDOW_NAME = "vexManagerQuickOpen"
+    WINDOW_TITLE = "VEX Manager Quick Open"
+
+    PREFERENCES_PATH = utils.get_preferences_path()
+
+    MAX_RESULTS = 50
+
+    dialog_instance = None
+
+    @classmethod
+    def display(cls) -> None:
+        if not cls.dialog_instance:
+            cls.dialog_instance = QuickOpenUI()
+
+        cls.dialog_instance._load_preferences()
+        cls.dialog_instance.search_line_edit.clear()
+        cls.dialog_instance._update_results()
+
+        main_window = hou.qt.mainWindow()
+
+        if main_window:
+            geometry = cls.dialog_instance.frameGeometry()
+            geometry.moveCenter(main_window.frameGeometry().center())
+            cls.dialog_instance.move(geometry.topLeft())
+
+        cls.dialog_instance.show()
+        cls.dialog_instance.activateWindow()
+        cls.dialog_instance.search_line_edit.setFocus()
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.library_path = ""
+        self.library_index = None
+        self.fuzzy_matcher = None
+
+        self._fuzzy_matcher_dirty = True
+
+        self.resize(500, 350)
+        self.setObjectName(QuickOpenUI.WINDOW_NAME)
+        self.setParent(hou.qt.mainWindow(), QtCore.Qt.Popup)
+        self.setWindowTitle(QuickOpenUI.WINDOW_TITLE)
+
+        self._create_widgets()
+        self._create_layouts()
+        self._create_connections()
+
+    def _create_widgets(self) -> None:
+        self.search_line_edit = QtWidgets.QLineEdit()
+        self.search_line_edit.setPlaceholderText("Search VEX files")
+        self.search_line_edit.installEventFilter(self)
+
+        self.results_list_widget = QtWidgets.QListWidget()
+        self.results_list_widget.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.help_label = QtWidgets.QLabel(
+            "Enter: Replace Code    Shift+Enter: Insert Code    Esc: Close"
+        )
+        self.help_label.setEnabled(False)
+
+    def _create_layouts(self) -> None:
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.search_line_edit)
+        main_layout.addWidget(self.results_list_widget)
+        main_layout.addWidget(self.help_label)
+        main_layout.setContentsMargins(6, 6, 6, 6)
+        main_layout.setSpacing(3)
+
+    def _create_connections(self) -> None:
+        self.search_line_edit.textChanged.connect(self._update_results)
+        self.results_list_widget.itemDoubleClicked.connect(
+            self._results_item_double_clicked_list_widget
+        )
+
+    def _load_preferences(self) -> None:
+        preferences = {}
+
+        if os.path.exists(QuickOpenUI.PREFERENCES_PATH):
+            with open(QuickOpenUI.PREFERENCES_PATH, "r") as file_for_read:
+                preferences = json.load(file_for_read)
+
+        library_path = preferences.get("library_path", "")
+        library_path = hou.text.expandString(library_path)
+
+        if library_path != self.library_path:
+            self._set_library_path(library_path)
+
+    def _set_library_path(self, library_path: str) -> None:
+        if self.library_index:
+            self.library_index.remove_callback(self._library_index_changed)
+
+        self.library_path = library_path
+        self.fuzzy_matcher = None
+        self._fuzzy_matcher_dirty = True
+
+        if os.path.isdir(library_path):
+            self.library_index = core.get_library_index(library_path)
+            self.library_index.add_callback(self._library_index_changed)
+
+            core.watch_library(library_path)
+        else:
+            self.library_index = None
+
+            logger.error(f"Library path {library_path!r} does not exist.")
+
+    def _library_index_changed(self, file_path: str, content: Optional[bytes]) -> None:
+        self._fuzzy_matcher_dirty = True
+
+    def _get_fuzzy_matcher(self) -> Optional[FuzzyMatcher]:
+        if self.library_index and self._fuzzy_matcher_dirty:
+            self._fuzzy_matcher_dirty = False
+            self.fuzzy_matcher = FuzzyMatcher(
+                self.library_path,
+                self.library_index.get_vex_files(recursive=True),
+            )
+
+        return self.fuzzy_matcher
+
+    def _update_results(self) -> None:
+        self.results_list_widget.clear()
+
+        fuzzy_matcher = self._get_fuzzy_matcher()
+
+        if not fuzzy_matcher:
+            return
+
+        file_paths = fuzzy_matcher.match(
+            self.search_line_edit.text(), limit=QuickOpenUI.MAX_RESULTS
+        )
+
+        for file_path in file_paths:
+            relative_path = os.path.relpath(file_path, self.library_path)
+
+            item = QtWidgets.QListWidgetItem()
+            item.setText(os.path.splitext(relative_path)[0])
+            item.setData(QtCore.Qt.UserRole, file_path)
+            self.results_list_widget.addItem(item)
+
+        self.results_list_widget.setCurrentRow(0)
+
+    def _move_current_row(self, offset: int) -> None:
+        count = self.results_list_widget.count()
+
+        if count:
+            row = self.results_list_widget.currentRow() + offset
+            self.results_list_widget.setCurrentRow(max(0, min(row, count - 1)))
+
+    def _apply_current_item(self, insert: bool = False) -> None:
+        item = self.results_list_widget.currentItem()
+
+        if not item:
+            return
+
+        file_path = item.data(QtCore.Qt.UserRole)
+
+        try:
+            with open(file_path, "r") as file_for_read:
+                vex_code = file_for_read.read()
+        except OSError as error:
+            logger.error(f"Could not read {file_path!r}: {error}")
+
+            return
+
+        self.close()
+
+        core.set_vex_code_in_selected_wrangle_nodes(vex_code=vex_code, insert=insert)
+
+    def _results_item_double_clicked_list_widget(
+        self, item: QtWidgets.QListWidgetItem
+    ) -> None:
+
+        self.results_list_widget.setCurrentItem(item)
+        self._apply_current_item()
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if watched is self.search_line_edit and event.type() == QtCore.QEvent.KeyPress:
+            key = event.key()
+
+            if key == QtCore.Qt.Key_Down:
+                self._move_current_row(1)
+
+                return True
+
+            elif key == QtCore.Qt.Key_Up:
+                self._move_current_row(-1)
+
+                return True
+
+            elif key == QtCore.Qt.Key_PageDown:
+                self._move_current_row(10)
+
+                return True
+
+            elif key == QtCore.Qt.Key_PageUp:
+                self._move_current_row(-10)
+
+                return True
+
+            elif key == QtCore.Qt.Key_Return or key == QtCore.Qt.Key_Enter:
+                shift = bool(event.modifiers() & QtCore.Qt.ShiftModifier)
+                self._apply_current_item(insert=shift)
+
+                return True
+
+            elif key == QtCore.Qt.Key_Escape:
+                self.close()
+
+                return True
+
+        return super().eventFilter(watched, event)
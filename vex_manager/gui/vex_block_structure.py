@@ -0,0 +1,389 @@
+try:
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+import logging
+import re
+
+from vex_manager.gui.vex_syntax_highlighter import VEXBlockData
+import vex_manager.core.vex_lexer as vex_lexer
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+BRACKET_PAIRS = {"(": ")", "[": "]", "{": "}"}
+CLOSING_BRACKETS = {closer: opener for opener, closer in BRACKET_PAIRS.items()}
+
+FOLD_BRACKET = "{"
+
+NO_BRACKET_DEPTHS = (0, 0, 0)
+
+BRACKET_REG_EXP = re.compile(r"[()\[\]{}]")
+
+# Lines without these can not hide brackets in comments or strings.
+LEXED_CHARS_REG_EXP = re.compile(r"[\"'/]")
+
+# Brackets further apart are not matched, nor folded, about 20 ms.
+MAX_MATCH_BLOCKS = 5000
+
+
+def get_bracket_depths(
+    brackets: tuple[tuple[int, str], ...],
+) -> dict[str, tuple[int, int, int]]:
+
+    # For each pair in the block, the opened minus closed brackets and the
+    # lowest it gets reading forward, and the closed minus opened and the
+    # lowest reading backward. A search skips blocks that can not close it.
+    bracket_depths = {}
+    chars = [char for _, char in brackets]
+
+    for opener, closer in BRACKET_PAIRS.items():
+        if opener not in chars and closer not in chars:
+            continue
+
+        depth = min_prefix_depth = 0
+
+        for char in chars:
+            if char == opener:
+                depth += 1
+            elif char == closer:
+                depth -= 1
+                min_prefix_depth = min(min_prefix_depth, depth)
+
+        suffix_depth = min_suffix_depth = 0
+
+        for char in reversed(chars):
+            if char == closer:
+                suffix_depth += 1
+            elif char == opener:
+                suffix_depth -= 1
+                min_suffix_depth = min(min_suffix_depth, suffix_depth)
+
+        bracket_depths[opener] = (depth, min_prefix_depth, min_suffix_depth)
+
+    return bracket_depths
+
+
+class VEXBlockStructure(QtCore.QObject):
+
+    def __init__(self, text_document: QtGui.QTextDocument) -> None:
+        super().__init__(text_document)
+
+        self.text_document = text_document
+
+        self.text_document.contentsChange.connect(self._contents_changed)
+
+    def _get_block_data(self, block: QtGui.QTextBlock) -> VEXBlockData:
+        block_data = block.userData()
+
+        if not isinstance(block_data, VEXBlockData):
+            # Large documents highlight far blocks in idle time, the data is
+            # updated, not replaced, when they are.
+            block_data = VEXBlockData(0, -1, -1)
+            block.setUserData(block_data)
+
+        return block_data
+
+    def _contents_changed(
+        self, position: int, chars_removed: int, chars_added: int
+    ) -> None:
+
+        # Set as a whole, none of the blocks have any data yet.
+        if not position and chars_added >= self.text_document.characterCount() - 1:
+            return
+
+        block = self.text_document.findBlock(position)
+        last_block_number = self.text_document.findBlock(
+            position + chars_added
+        ).blockNumber()
+
+        # Only the edited blocks are looked at again, the rest keep their
+        # brackets unless the state they start with changes.
+        while block.isValid() and block.blockNumber() <= last_block_number:
+            if not block.isVisible():
+                self.unfold(self.get_fold_header(block))
+
+            block_data = block.userData()
+
+            if isinstance(block_data, VEXBlockData):
+                block_data.brackets = None
+
+                if block_data.folded_block_count:
+                    self.unfold(block)
+
+            block = block.next()
+
+    def _get_bracket_data(self, block: QtGui.QTextBlock) -> VEXBlockData:
+        block_data = self._get_block_data(block)
+        entry_state = max(vex_lexer.DEFAULT_STATE, block.previous().userState())
+
+        if (
+            block_data.brackets is not None
+            and block_data.bracket_entry_state == entry_state
+        ):
+            return block_data
+
+        text = block.text()
+
+        if entry_state == vex_lexer.DEFAULT_STATE and not LEXED_CHARS_REG_EXP.search(
+            text
+        ):
+            brackets = tuple(
+                (match.start(), match.group())
+                for match in BRACKET_REG_EXP.finditer(text)
+            )
+        else:
+            tokens, _ = vex_lexer.tokenize(text, entry_state)
+
+            brackets = tuple(
+                (start, text[start])
+                for start, _, kind in tokens
+                if kind == vex_lexer.PUNCTUATION and BRACKET_REG_EXP.match(text[start])
+            )
+
+        block_data.brackets = brackets
+        block_data.bracket_depths = get_bracket_depths(brackets)
+        block_data.bracket_entry_state = entry_state
+
+        return block_data
+
+    def get_brackets(self, block: QtGui.QTextBlock) -> tuple[tuple[int, str], ...]:
+        return self._get_bracket_data(block).brackets
+
+    def _find_closer(
+        self, block: QtGui.QTextBlock, offset: int, opener: str, depth: int
+    ) -> int:
+
+        # Forward, from the offset in the first block.
+        closer = BRACKET_PAIRS[opener]
+
+        for i in range(MAX_MATCH_BLOCKS):
+            if not block.isValid():
+                break
+
+            block_data = self._get_bracket_data(block)
+
+            delta, min_prefix_depth, _ = block_data.bracket_depths.get(
+                opener, NO_BRACKET_DEPTHS
+            )
+
+            if offset is None and depth + min_prefix_depth > 0:
+                depth += delta
+            else:
+                for bracket_offset, char in block_data.brackets:
+                    if offset is not None and bracket_offset < offset:
+                        continue
+
+                    if char == opener:
+                        depth += 1
+                    elif char == closer:
+                        depth -= 1
+
+                        if not depth:
+                            return block.position() + bracket_offset
+
+            block = block.next()
+            offset = None
+
+        return -1
+
+    def _find_opener(
+        self, block: QtGui.QTextBlock, offset: int, opener: str, depth: int
+    ) -> int:
+
+        # Backward, from before the offset in the first block.
+        closer = BRACKET_PAIRS[opener]
+
+        for i in range(MAX_MATCH_BLOCKS):
+            if not block.isValid():
+                break
+
+            block_data = self._get_bracket_data(block)
+
+            delta, _, min_suffix_depth = block_data.bracket_depths.get(
+                opener, NO_BRACKET_DEPTHS
+            )
+
+            if offset is None and depth + min_suffix_depth > 0:
+                depth -= delta
+            else:
+                for bracket_offset, char in reversed(block_data.brackets):
+                    if offset is not None and bracket_offset >= offset:
+                        continue
+
+                    if char == closer:
+                        depth += 1
+                    elif char == opener:
+                        depth -= 1
+
+                        if not depth:
+                            return block.position() + bracket_offset
+
+            block = block.previous()
+            offset = None
+
+        return -1
+
+    def find_matching_bracket(self, position: int) -> int:
+        block = self.text_document.findBlock(position)
+
+        if not block.isValid():
+            return -1
+
+        offset = position - block.position()
+        char = dict(self.get_brackets(block)).get(offset)
+
+        if char in BRACKET_PAIRS:
+            return self._find_closer(block, offset, char, 0)
+
+        if char in CLOSING_BRACKETS:
+            return self._find_opener(block, offset + 1, CLOSING_BRACKETS[char], 0)
+
+        return -1
+
+    def find_enclosing_bracket(self, position: int, opener: str = FOLD_BRACKET) -> int:
+        block = self.text_document.findBlock(position)
+
+        if not block.isValid():
+            return -1
+
+        return self._find_opener(block, position - block.position(), opener, 1)
+
+    def get_fold_end(self, block: QtGui.QTextBlock) -> QtGui.QTextBlock:
+        # Folded from the first brace left open in the block, like the one in
+        # "} else {", to the block that closes it.
+        closer = BRACKET_PAIRS[FOLD_BRACKET]
+        open_offsets = []
+
+        for offset, char in self.get_brackets(block):
+            if char == FOLD_BRACKET:
+                open_offsets.append(offset)
+            elif char == closer and open_offsets:
+                open_offsets.pop()
+
+        if open_offsets:
+            position = self._find_closer(block, open_offsets[0], FOLD_BRACKET, 0)
+
+            if position >= 0:
+                return self.text_document.findBlock(position)
+
+        return QtGui.QTextBlock()
+
+    def get_fold_header(self, block: QtGui.QTextBlock) -> QtGui.QTextBlock:
+        # Folds hide the blocks right after their header.
+        while block.isValid() and not block.isVisible():
+            block = block.previous()
+
+        return block
+
+    def is_folded(self, block: QtGui.QTextBlock) -> bool:
+        block_data = block.userData()
+
+        return isinstance(block_data, VEXBlockData) and bool(
+            block_data.folded_block_count
+        )
+
+    def get_folded_block_count(self, block: QtGui.QTextBlock) -> int:
+        block_data = block.userData()
+
+        if isinstance(block_data, VEXBlockData):
+            return block_data.folded_block_count
+
+        return 0
+
+    def _mark_dirty(self, first_block: QtGui.QTextBlock, block_count: int) -> None:
+        last_block = self.text_document.findBlockByNumber(
+            first_block.blockNumber() + block_count
+        )
+
+        if not last_block.isValid():
+            last_block = self.text_document.lastBlock()
+
+        position = first_block.position()
+
+        self.text_document.markContentsDirty(
+            position, last_block.position() + last_block.length() - position
+        )
+
+    def fold(self, block: QtGui.QTextBlock) -> bool:
+        if not block.isValid() or self.is_folded(block):
+            return False
+
+        fold_end = self.get_fold_end(block)
+
+        # The closing line stays visible.
+        block_count = fold_end.blockNumber() - block.blockNumber() - 1
+
+        if not fold_end.isValid() or block_count < 1:
+            return False
+
+        hidden_block = block.next()
+
+        for i in range(block_count):
+            hidden_block.setVisible(False)
+            hidden_block = hidden_block.next()
+
+        self._get_block_data(block).folded_block_count = block_count
+        self._mark_dirty(block, block_count)
+
+        return True
+
+    def fold_at(self, position: int) -> bool:
+        block = self.text_document.findBlock(position)
+
+        if self.fold(block):
+            return True
+
+        bracket_position = self.find_enclosing_bracket(position)
+
+        if bracket_position < 0:
+            return False
+
+        return self.fold(self.text_document.findBlock(bracket_position))
+
+    def unfold(self, block: QtGui.QTextBlock) -> bool:
+        block_count = self.get_folded_block_count(block)
+
+        if not block_count:
+            return False
+
+        block.userData().folded_block_count = 0
+
+        # Folds inside are opened too.
+        hidden_block = block.next()
+
+        for i in range(block_count):
+            if not hidden_block.isValid():
+                break
+
+            hidden_block.setVisible(True)
+
+            block_data = hidden_block.userData()
+
+            if isinstance(block_data, VEXBlockData):
+                block_data.folded_block_count = 0
+
+            hidden_block = hidden_block.next()
+
+        self._mark_dirty(block, block_count)
+
+        return True
+
+    def unfold_at(self, position: int) -> bool:
+        block = self.get_fold_header(self.text_document.findBlock(position))
+
+        if self.unfold(block):
+            return True
+
+        bracket_position = self.find_enclosing_bracket(position)
+
+        while bracket_position >= 0:
+            if self.unfold(self.text_document.findBlock(bracket_position)):
+                return True
+
+            bracket_position = self.find_enclosing_bracket(bracket_position)
+
+        return False
@@ -0,0 +1,299 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+from collections import Counter
+import threading
+import logging
+import heapq
+import time
+import re
+
+import vex_manager.core.vex_lexer as vex_lexer
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+MIN_PREFIX_LENGTH = 2
+MAX_COMPLETIONS = 20
+
+# Names declared in the snippet come before names used across the library.
+DOCUMENT_WEIGHT = 1000000
+
+# Milliseconds after the last edit before declared names are collected.
+UPDATE_DELAY = 300
+
+# Longer documents are not parsed whole after each edit, about 40 ms.
+FULL_UPDATE_BLOCK_COUNT = 1000
+
+# Seconds before the library usage counts are read again.
+LIBRARY_WEIGHTS_MAX_AGE = 60.0
+
+PREFIX_REG_EXP = re.compile(r"(@\w*|[A-Za-z_]\w*)$")
+
+NO_COMPLETION_KINDS = frozenset(
+    (vex_lexer.COMMENT, vex_lexer.MULTI_LINE_COMMENT, vex_lexer.STRING)
+)
+
+
+class VEXCompleter(QtWidgets.QCompleter):
+    library_weights_loaded = QtCore.Signal(str, dict)
+
+    def __init__(self, text_edit: QtWidgets.QPlainTextEdit) -> None:
+        super().__init__(text_edit)
+
+        self.text_edit = text_edit
+
+        self.vex_syntaxis_trie = core.get_vex_syntaxis_trie()
+        self.document_trie = core.CompletionTrie()
+
+        self.library_path = ""
+
+        self._document_words = Counter()
+        self._library_weights = {}
+        self._library_weights_time = 0.0
+        self._library_weights_loading = False
+
+        self._dirty_positions = None
+        self._prefix = ""
+
+        self.string_list_model = QtCore.QStringListModel(self)
+
+        self.setModel(self.string_list_model)
+        self.setWidget(text_edit)
+        self.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(QtCore.Qt.CaseSensitive)
+        self.setMaxVisibleItems(10)
+
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_DELAY)
+
+        self._create_connections()
+
+    def _create_connections(self) -> None:
+        self.activated[str].connect(self._insert_completion)
+        self.library_weights_loaded.connect(self._library_weights_loaded)
+
+        self.text_edit.contents_changed.connect(self._contents_changed)
+        self.text_edit.document_changed.connect(self._document_changed)
+        self._update_timer.timeout.connect(self.update_document_words)
+
+    def _contents_changed(self, position: int, removed: int, added: int) -> None:
+        end = position + added
+
+        if self._dirty_positions:
+            first, last = self._dirty_positions
+            position, end = min(first, position), max(last, end)
+
+        self._dirty_positions = (position, end)
+        self._update_timer.start()
+
+    def _document_changed(self, text_document: QtGui.QTextDocument) -> None:
+        # Names are collected again from the whole document.
+        self.clear_document_words()
+        self._contents_changed(0, 0, text_document.characterCount())
+
+    def _insert_completion(self, completion: str) -> None:
+        text_cursor = self.text_edit.textCursor()
+        text_cursor.movePosition(
+            QtGui.QTextCursor.Left, QtGui.QTextCursor.KeepAnchor, len(self._prefix)
+        )
+        text_cursor.insertText(completion)
+
+        self.text_edit.setTextCursor(text_cursor)
+
+    def _load_library_weights(self, library_path: str) -> None:
+        try:
+            weights = core.get_symbol_index(library_path).get_symbol_counts()
+        except Exception:
+            logger.exception(f"Failed to read the symbol counts of {library_path!r}.")
+
+            weights = {}
+
+        self.library_weights_loaded.emit(library_path, weights)
+
+    def _library_weights_loaded(self, library_path: str, weights: dict) -> None:
+        self._library_weights_loading = False
+
+        # The library may have changed while the counts were read.
+        if library_path == self.library_path:
+            self._library_weights = weights
+            self._library_weights_time = time.monotonic()
+
+    def _update_library_weights(self) -> None:
+        if (
+            not self.library_path
+            or self._library_weights_loading
+            or time.monotonic() - self._library_weights_time < LIBRARY_WEIGHTS_MAX_AGE
+        ):
+            return
+
+        # Reading the index can take a while on large libraries.
+        self._library_weights_loading = True
+
+        threading.Thread(
+            target=self._load_library_weights, args=(self.library_path,), daemon=True
+        ).start()
+
+    def _get_prefix(self) -> str:
+        text_cursor = self.text_edit.textCursor()
+
+        if text_cursor.hasSelection():
+            return ""
+
+        block = text_cursor.block()
+        line_text = block.text()[: text_cursor.positionInBlock()]
+
+        match = PREFIX_REG_EXP.search(line_text)
+
+        if not match:
+            return ""
+
+        # Lexed from the state the previous line ended with, names in comments
+        # and strings are not completed.
+        tokens, _ = vex_lexer.tokenize(line_text, max(0, block.previous().userState()))
+
+        if tokens:
+            start, length, kind = tokens[-1]
+
+            if kind in NO_COMPLETION_KINDS and start + length >= len(line_text):
+                return ""
+
+        return match.group()
+
+    def get_completions(self, prefix: str) -> list[str]:
+        # Only the words below the prefix in the tries are ranked, a few
+        # hundred at most once the prefix is long enough to complete.
+        words = {word for word, _ in self.vex_syntaxis_trie.get_words(prefix)}
+        document_words = {word for word, _ in self.document_trie.get_words(prefix)}
+        weights = self._library_weights
+
+        words.update(document_words)
+        words.discard(prefix)
+
+        return heapq.nsmallest(
+            MAX_COMPLETIONS,
+            words,
+            key=lambda word: (
+                -weights.get(word, 0)
+                - (DOCUMENT_WEIGHT if word in document_words else 0),
+                len(word),
+                word,
+            ),
+        )
+
+    def complete_at_cursor(self, min_prefix_length: int = MIN_PREFIX_LENGTH) -> None:
+        prefix = self._get_prefix()
+
+        # "@" alone lists attributes.
+        if not prefix.startswith("@") and len(prefix) < min_prefix_length:
+            self.popup().hide()
+
+            return
+
+        self._update_library_weights()
+
+        completions = self.get_completions(prefix)
+
+        if not completions:
+            self.popup().hide()
+
+            return
+
+        self._prefix = prefix
+        self.string_list_model.setStringList(completions)
+
+        popup = self.popup()
+        popup.setCurrentIndex(self.completionModel().index(0, 0))
+
+        rect = self.text_edit.cursorRect()
+        rect.setWidth(
+            popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width()
+        )
+
+        self.complete(rect)
+
+    def update_document_words(self) -> None:
+        self._update_timer.stop()
+
+        if not self._dirty_positions:
+            return
+
+        document = self.text_edit.document()
+        first, last = self._dirty_positions
+        self._dirty_positions = None
+
+        if document.blockCount() < FULL_UPDATE_BLOCK_COUNT:
+            words = core.get_declared_words(document.toPlainText())
+
+            removed_words = self._document_words.keys() - words.keys()
+            added_words = words.keys() - self._document_words.keys()
+
+            for word, _ in removed_words:
+                self.document_trie.remove(word)
+
+            for word, kind in added_words:
+                self.document_trie.add(word, kind)
+
+            self._document_words = words
+
+            return
+
+        # Long documents only learn the names of the edited lines, names that
+        # were deleted stay until the text is set again.
+        first_block = document.findBlock(first)
+        last_block = document.findBlock(last)
+
+        if last_block.blockNumber() - first_block.blockNumber() > (
+            FULL_UPDATE_BLOCK_COUNT
+        ):
+            first_block = self.text_edit.textCursor().block()
+            last_block = document.findBlockByNumber(
+                first_block.blockNumber() + FULL_UPDATE_BLOCK_COUNT
+            )
+
+        text_cursor = QtGui.QTextCursor(first_block)
+        text_cursor.setPosition(
+            (last_block if last_block.isValid() else document.lastBlock()).position(),
+            QtGui.QTextCursor.KeepAnchor,
+        )
+        text_cursor.movePosition(
+            QtGui.QTextCursor.EndOfBlock, QtGui.QTextCursor.KeepAnchor
+        )
+
+        vex_code = text_cursor.selectedText().replace("\u2029", "\n")
+
+        added_words = [
+            (word, kind)
+            for word, kind in core.get_declared_words(vex_code)
+            if word not in self.document_trie
+        ]
+
+        for word, kind in added_words:
+            self.document_trie.add(word, kind)
+            self._document_words[(word, kind)] = 1
+
+    def clear_document_words(self) -> None:
+        self._update_timer.stop()
+        self._dirty_positions = None
+
+        self.document_trie = core.CompletionTrie()
+        self._document_words = Counter()
+
+    def set_library_path(self, library_path: str) -> None:
+        if library_path == self.library_path:
+            return
+
+        self.library_path = library_path
+
+        self._library_weights = {}
+        self._library_weights_time = 0.0
+
+        self._update_library_weights()
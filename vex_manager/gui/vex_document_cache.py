@@ -0,0 +1,198 @@
+try:
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+from collections import OrderedDict
+from typing import Optional
+import logging
+import os
+
+from vex_manager.gui.vex_file_worker import VEXDocumentStateWriterSignals
+from vex_manager.gui.vex_file_worker import VEXDocumentStateWriter
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+MAX_DOCUMENTS = 8
+
+# Roughly what a character costs once laid out and highlighted.
+BYTES_PER_CHARACTER = 40
+MAX_DOCUMENTS_SIZE = 256 * 1024 * 1024
+
+
+class VEXDocument:
+
+    def __init__(self, file_path: str, text_document: QtGui.QTextDocument) -> None:
+        self.file_path = file_path
+        self.text_document = text_document
+
+        # Moves with the edits, where the user left it when shown again.
+        self.text_cursor = QtGui.QTextCursor(text_document)
+        self.scroll_value = 0
+
+        # Unsaved edits written aside in the background, for after a crash.
+        self.recovery_journal = core.RecoveryJournal(file_path)
+
+    def get_size(self) -> int:
+        return self.text_document.characterCount() * BYTES_PER_CHARACTER
+
+    def is_modified(self) -> bool:
+        return self.text_document.isModified()
+
+
+class VEXDocumentCache(QtCore.QObject):
+
+    def __init__(
+        self,
+        max_documents: int = MAX_DOCUMENTS,
+        max_size: int = MAX_DOCUMENTS_SIZE,
+        thread_pool: Optional[QtCore.QThreadPool] = None,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+
+        super().__init__(parent)
+
+        self.max_documents = max_documents
+        self.max_size = max_size
+
+        # Least recently shown first.
+        self._documents = OrderedDict()
+
+        # Shared with the journal writes, a single thread keeps them in order
+        # so a journal written earlier can not come back after a release.
+        if thread_pool is None:
+            thread_pool = QtCore.QThreadPool(self)
+            thread_pool.setMaxThreadCount(1)
+
+        self.thread_pool = thread_pool
+
+        self.vex_document_state_writer_signals = VEXDocumentStateWriterSignals(self)
+        self.vex_document_state_writer_signals.written.connect(self._state_written)
+
+        # States not written yet, by key, read instead of the ones on disk.
+        self._write_id = 0
+        self._pending_states = {}
+
+    def _get_key(self, file_path: str) -> str:
+        return os.path.normpath(file_path)
+
+    def _get_size(self) -> int:
+        return sum(document.get_size() for document in self._documents.values())
+
+    def _evict(self) -> None:
+        # The most recent one is shown, it always stays.
+        while len(self._documents) > 1 and (
+            len(self._documents) > self.max_documents
+            or self._get_size() > self.max_size
+        ):
+            _, document = self._documents.popitem(last=False)
+
+            self.release(document)
+
+    def _state_written(self, write_id: int, file_path: str) -> None:
+        key = self._get_key(file_path)
+        pending_state = self._pending_states.get(key)
+
+        if pending_state and pending_state[0] == write_id:
+            del self._pending_states[key]
+
+    def _write_state(
+        self,
+        file_path: str,
+        state: Optional[dict],
+        recovery_journal: Optional[core.RecoveryJournal] = None,
+    ) -> None:
+
+        self._write_id += 1
+        self._pending_states[self._get_key(file_path)] = (self._write_id, state)
+
+        self.thread_pool.start(
+            VEXDocumentStateWriter(
+                self._write_id,
+                file_path,
+                state,
+                self.vex_document_state_writer_signals,
+                recovery_journal,
+            )
+        )
+
+    def release(self, document: VEXDocument) -> None:
+        # Cold documents leave their cursor and unsaved edits on disk, their
+        # undo history goes with them.
+        state = {
+            "file_path": self._get_key(document.file_path),
+            "cursor_position": document.text_cursor.position(),
+            "anchor_position": document.text_cursor.anchor(),
+            "scroll_value": document.scroll_value,
+            "content": (
+                document.text_document.toPlainText() if document.is_modified() else None
+            ),
+        }
+
+        self._write_state(document.file_path, state, document.recovery_journal)
+
+        logger.debug(f"{document.file_path!r} released.")
+
+        document.text_document.deleteLater()
+
+    def load_state(self, file_path: str) -> Optional[dict]:
+        pending_state = self._pending_states.get(self._get_key(file_path))
+
+        if pending_state:
+            return pending_state[1]
+
+        return core.load_document_state(file_path)
+
+    def remove_state(self, file_path: str) -> None:
+        self._write_state(file_path, None)
+
+    def get(self, file_path: str) -> Optional[VEXDocument]:
+        key = self._get_key(file_path)
+        document = self._documents.get(key)
+
+        if document:
+            self._documents.move_to_end(key)
+
+        return document
+
+    def peek(self, file_path: str) -> Optional[VEXDocument]:
+        return self._documents.get(self._get_key(file_path))
+
+    def add(self, document: VEXDocument) -> None:
+        key = self._get_key(document.file_path)
+        previous_document = self._documents.pop(key, None)
+
+        if previous_document and previous_document is not document:
+            previous_document.text_document.deleteLater()
+
+        self._documents[key] = document
+
+        self._evict()
+
+    def remove(self, file_path: str) -> Optional[VEXDocument]:
+        return self._documents.pop(self._get_key(file_path), None)
+
+    def rename(self, file_path: str, new_file_path: str) -> None:
+        document = self.remove(file_path)
+
+        if document:
+            document.file_path = new_file_path
+            self._documents[self._get_key(new_file_path)] = document
+
+    def set_limits(
+        self, max_documents: int, max_size: int = MAX_DOCUMENTS_SIZE
+    ) -> None:
+        self.max_documents = max(1, max_documents)
+        self.max_size = max_size
+
+        self._evict()
+
+    def __contains__(self, file_path: str) -> bool:
+        return self._get_key(file_path) in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
@@ -1,14 +1,29 @@
 try:
     from PySide6 import QtWidgets
     from PySide6 import QtCore
+    from PySide6 import QtGui
 except ImportError:
     from PySide2 import QtWidgets
     from PySide2 import QtCore
+    from PySide2 import QtGui
 
 from pathlib import Path
+from typing import Optional
+import threading
 import logging
+import json
 import os
 
+from vex_manager.gui.vex_document_cache import VEXDocumentCache
+from vex_manager.gui.vex_document_cache import VEXDocument
+from vex_manager.gui.vex_document_cache import MAX_DOCUMENTS
+from vex_manager.gui.vex_file_worker import VEXFileWorkerSignals
+from vex_manager.gui.vex_file_worker import VEXFileLoader
+from vex_manager.gui.vex_file_worker import VEXFileSaver
+from vex_manager.gui.vex_file_worker import VEXJournalWriter
+from vex_manager.gui.vex_file_worker import LARGE_FILE_SIZE
+from vex_manager.gui.vex_large_file_viewer import VEXLargeFileViewer
+from vex_manager.gui.vex_outline_widget import VEXOutlineWidget
 from vex_manager.gui.vex_plain_text_edit import VEXPlainTextEdit
 import vex_manager.utils as utils
 import vex_manager.core as core
@@ -16,8 +31,12 @@ import vex_manager.core as core
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
+# Milliseconds from the first unsaved edit to the recovery journal write.
+JOURNAL_DELAY = 1000
+
 
 class VEXEditorWidget(QtWidgets.QWidget):
+    PREFERENCES_PATH = utils.get_preferences_path()
 
     def __init__(self) -> None:
         super().__init__()
@@ -26,25 +45,105 @@ class VEXEditorWidget(QtWidgets.QWidget):
         self.base_name = ""
         self.library_path = ""
 
+        # Journal writes never wait behind a load nor hold up typing.
+        self.journal_thread_pool = QtCore.QThreadPool(self)
+        self.journal_thread_pool.setMaxThreadCount(1)
+
+        # Recently shown snippets stay open, with their undo history.
+        self.vex_document_cache = VEXDocumentCache(
+            thread_pool=self.journal_thread_pool, parent=self
+        )
+        self._document = None
+
+        self._load_request_id = 0
+        self._load_cancelled = None
+        self._pending_saves = 0
+
+        # Large snippets the user chose to load whole anyway.
+        self._full_edit_file_paths = set()
+
+        # A single thread keeps loads and saves in the order they were made.
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.vex_file_worker_signals = VEXFileWorkerSignals(self)
+
+        self._journal_timer = QtCore.QTimer(self)
+        self._journal_timer.setSingleShot(True)
+        self._journal_timer.setInterval(JOURNAL_DELAY)
+
         self._create_widgets()
         self._create_layouts()
         self._create_connections()
+        self.load_preferences()
 
     def _create_widgets(self) -> None:
+        self.tab_bar = QtWidgets.QTabBar()
+        self.tab_bar.setDocumentMode(True)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.setMovable(True)
+        self.tab_bar.setTabsClosable(True)
+        self.tab_bar.setUsesScrollButtons(True)
+        self.tab_bar.setElideMode(QtCore.Qt.ElideRight)
+
         self.name_line_edit = QtWidgets.QLineEdit()
 
         self.vex_plain_text_editor = VEXPlainTextEdit()
 
+        # Shown without a snippet.
+        self.empty_text_document = self.vex_plain_text_editor.create_document(self)
+        self.vex_plain_text_editor.set_document(self.empty_text_document)
+
+        self.large_file_label = QtWidgets.QLabel()
+
+        self.edit_anyway_push_button = QtWidgets.QPushButton("Edit Anyway")
+
+        self.vex_large_file_viewer = VEXLargeFileViewer()
+
+        self.large_file_widget = QtWidgets.QWidget()
+
+        self.editor_stacked_widget = QtWidgets.QStackedWidget()
+
+        self.vex_outline_widget = VEXOutlineWidget(self.vex_plain_text_editor)
+
         self.save_changes_push_button = QtWidgets.QPushButton("Save Changes")
 
         self.replace_code_push_button = QtWidgets.QPushButton("Replace Code")
 
         self.insert_code_push_button = QtWidgets.QPushButton("Insert Code")
 
+        self.select_usages_push_button = QtWidgets.QPushButton("Select Usages")
+        self.select_usages_push_button.setToolTip(
+            "Select the nodes in the scene whose code is this snippet.\n"
+            "Shift+click to also select the nodes it was inserted in."
+        )
+
     def _create_layouts(self) -> None:
         main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.tab_bar)
         main_layout.addWidget(self.name_line_edit)
-        main_layout.addWidget(self.vex_plain_text_editor)
+
+        large_file_layout = QtWidgets.QVBoxLayout(self.large_file_widget)
+        large_file_layout.setContentsMargins(QtCore.QMargins())
+        large_file_layout.setSpacing(3)
+
+        layout = QtWidgets.QHBoxLayout()
+        layout.addWidget(self.large_file_label, 1)
+        layout.addWidget(self.edit_anyway_push_button)
+        large_file_layout.addLayout(layout)
+        large_file_layout.addWidget(self.vex_large_file_viewer)
+
+        self.editor_stacked_widget.addWidget(self.vex_plain_text_editor)
+        self.editor_stacked_widget.addWidget(self.large_file_widget)
+
+        splitter = QtWidgets.QSplitter()
+        splitter.addWidget(self.editor_stacked_widget)
+        splitter.addWidget(self.vex_outline_widget)
+        splitter.setCollapsible(0, False)
+        splitter.setCollapsible(1, True)
+        splitter.setStretchFactor(0, 1)
+        main_layout.addWidget(splitter)
+
         main_layout.addWidget(self.save_changes_push_button)
         main_layout.setContentsMargins(QtCore.QMargins())
         main_layout.setSpacing(3)
@@ -52,9 +151,12 @@ class VEXEditorWidget(QtWidgets.QWidget):
         layout = QtWidgets.QHBoxLayout()
         layout.addWidget(self.replace_code_push_button)
         layout.addWidget(self.insert_code_push_button)
+        layout.addWidget(self.select_usages_push_button)
         main_layout.addLayout(layout)
 
     def _create_connections(self) -> None:
+        self.tab_bar.currentChanged.connect(self._current_changed_tab_bar)
+        self.tab_bar.tabCloseRequested.connect(self._tab_close_requested_tab_bar)
         self.name_line_edit.editingFinished.connect(
             self._name_editing_finished_line_edit
         )
@@ -67,48 +169,413 @@ class VEXEditorWidget(QtWidgets.QWidget):
         self.insert_code_push_button.clicked.connect(
             self._insert_code_clicked_push_button
         )
+        self.select_usages_push_button.clicked.connect(
+            self._select_usages_clicked_push_button
+        )
+        self.edit_anyway_push_button.clicked.connect(
+            self._edit_anyway_clicked_push_button
+        )
+        self.vex_plain_text_editor.modificationChanged.connect(
+            self._modification_changed_plain_text_edit
+        )
+        self.vex_plain_text_editor.contents_changed.connect(
+            self._contents_changed_plain_text_edit
+        )
+        self._journal_timer.timeout.connect(self._journal_timeout)
+        self.vex_file_worker_signals.loaded.connect(self._vex_file_loaded)
+        self.vex_file_worker_signals.large_file_found.connect(self._vex_file_large)
+        self.vex_file_worker_signals.saved.connect(self._vex_file_saved)
+
+    def _load_preferences(self) -> None:
+        settings = {}
+
+        if os.path.exists(VEXEditorWidget.PREFERENCES_PATH):
+            with open(VEXEditorWidget.PREFERENCES_PATH, "r") as file_for_read:
+                settings = json.load(file_for_read)
+
+        self.max_open_documents = settings.get("max_open_documents", MAX_DOCUMENTS)
+
+    def _current_changed_tab_bar(self, index: int) -> None:
+        file_path = self.tab_bar.tabData(index) if index >= 0 else ""
+
+        if file_path and file_path != self.file_path:
+            self.set_file_path(file_path)
+            self.display_code()
+
+    def _tab_close_requested_tab_bar(self, index: int) -> None:
+        file_path = self.tab_bar.tabData(index)
+
+        if file_path == self.file_path:
+            next_index = index + 1 if index + 1 < self.tab_bar.count() else index - 1
+
+            self.set_file_path(
+                self.tab_bar.tabData(next_index) if next_index >= 0 else ""
+            )
+            self.display_code()
+
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.removeTab(self._find_tab(file_path))
+        self.tab_bar.blockSignals(False)
+
+        document = self.vex_document_cache.remove(file_path)
+
+        if not document:
+            return
+
+        # Unsaved edits are kept aside, opening the snippet again shows them.
+        if document.is_modified():
+            self.vex_document_cache.release(document)
+        else:
+            document.text_document.deleteLater()
+            self.vex_document_cache.remove_state(file_path)
+
+            self._write_journal(document)
+
+    def _modification_changed_plain_text_edit(self, modified: bool) -> None:
+        self._update_pending_state()
+
+        if self.file_path:
+            self._update_tab(self.file_path, modified)
+
+    def _contents_changed_plain_text_edit(
+        self, position: int, removed: int, added: int
+    ) -> None:
+
+        # Not restarted, typing without a pause is still journaled.
+        if not self._journal_timer.isActive():
+            self._journal_timer.start()
+
+    def _journal_timeout(self) -> None:
+        self._write_journal(self._document)
 
     def _name_editing_finished_line_edit(self) -> None:
         name = self.name_line_edit.text()
 
-        if utils.is_valid_file_name(name):
-            if os.path.exists(self.library_path):
-                self.file_path = core.rename_vex_file(self.file_path, name)
-        else:
+        if not utils.is_valid_file_name(name):
             logger.error(f"Invalid file name {name!r}")
 
+            return
+
+        if not os.path.exists(self.library_path):
+            return
+
+        file_path = self.file_path
+        new_file_path = core.rename_vex_file(file_path, name)
+
+        if new_file_path == file_path:
+            return
+
+        self.vex_document_cache.rename(file_path, new_file_path)
+        core.rename_document_state(file_path, new_file_path)
+
+        if self._document:
+            self._document.file_path = new_file_path
+            self._document.recovery_journal.rename(new_file_path)
+
+        index = self._find_tab(file_path)
+        self.file_path = new_file_path
+        self.base_name = Path(new_file_path).stem
+
+        if index >= 0:
+            self.tab_bar.setTabData(index, new_file_path)
+            self.tab_bar.setTabToolTip(index, new_file_path)
+            self._update_tab(new_file_path, self.is_modified())
+
     def _save_changes_clicked_push_button(self) -> None:
-        if self.file_path:
-            if os.path.exists(self.file_path):
-                self._save_file()
-            else:
-                logger.error(f"{self.file_path!r} does not exist.")
+        if self.file_path and self.is_modified():
+            self._save_file()
 
     def _replace_code_clicked_push_button(self) -> None:
-        core.set_vex_code_in_selected_wrangle_node(
+        core.set_vex_code_in_selected_wrangle_nodes(
             vex_code=self.vex_plain_text_editor.toPlainText()
         )
 
     def _insert_code_clicked_push_button(self) -> None:
-        core.set_vex_code_in_selected_wrangle_node(
+        core.set_vex_code_in_selected_wrangle_nodes(
             vex_code=self.vex_plain_text_editor.toPlainText(), insert=True
         )
 
+    def _select_usages_clicked_push_button(self) -> None:
+        modifiers = QtWidgets.QApplication.keyboardModifiers()
+
+        core.select_nodes_using_vex_code(
+            self.vex_plain_text_editor.toPlainText(),
+            inserted=bool(modifiers & QtCore.Qt.ShiftModifier),
+        )
+
+    def _edit_anyway_clicked_push_button(self) -> None:
+        if not self.file_path:
+            return
+
+        self._full_edit_file_paths.add(os.path.normpath(self.file_path))
+
+        self.display_code()
+
     def _save_file(self) -> None:
-        with open(self.file_path, "w") as file_to_write:
-            content = self.vex_plain_text_editor.toPlainText()
-            file_to_write.write(content)
+        content = self.vex_plain_text_editor.toPlainText()
 
-        self.name_line_edit.setText(self.base_name)
+        # Edits made while saving mark the document as modified again.
+        self.vex_plain_text_editor.document().setModified(False)
 
-        logger.debug(f"{self.file_path!r} saved.")
+        self._pending_saves += 1
+        self._update_pending_state()
 
-    def display_code(self) -> None:
-        if os.path.exists(self.file_path):
-            with open(self.file_path) as file_for_read:
-                self.vex_plain_text_editor.setPlainText(file_for_read.read())
+        self.thread_pool.start(
+            VEXFileSaver(self.file_path, content, self.vex_file_worker_signals)
+        )
+
+    def _vex_file_saved(self, file_path: str, success: bool) -> None:
+        self._pending_saves -= 1
+        self._update_pending_state()
+
+        document = self.vex_document_cache.peek(file_path)
+
+        if success:
+            # Unsaved edits kept aside are not needed anymore.
+            self.vex_document_cache.remove_state(file_path)
+
+            if document:
+                self._write_journal(document)
         else:
-            self.vex_plain_text_editor.setPlainText("")
+            if document:
+                document.text_document.setModified(True)
+
+                self._update_tab(file_path, True)
+
+        if file_path == self.file_path and success:
+            self.name_line_edit.setText(self.base_name)
+
+    def _vex_file_loaded(
+        self, request_id: int, file_path: str, content: str, exists: bool
+    ) -> None:
+
+        # Results of files the user already switched away from are dropped.
+        if request_id != self._load_request_id:
+            return
+
+        self._load_cancelled = None
+        self._update_pending_state()
+
+        if not exists:
+            self.name_line_edit.setText("")
+
+        self.vex_plain_text_editor.setPlainText(content)
+        self.vex_plain_text_editor.document().setModified(False)
+
+        self._restore_view(self.vex_document_cache.load_state(file_path))
+        self.vex_document_cache.add(self._document)
+
+    def _vex_file_large(self, request_id: int, file_path: str) -> None:
+        if request_id != self._load_request_id:
+            return
+
+        self._load_cancelled = None
+
+        # Read from disk as it scrolls, nothing is loaded in the editor.
+        if self.vex_large_file_viewer.set_file_path(file_path):
+            size = self.vex_large_file_viewer.mapped_vex_file.size
+
+            self.vex_large_file_viewer.set_font_and_colors(
+                self.vex_plain_text_editor.font,
+                self.vex_plain_text_editor.color_scheme,
+                self.vex_plain_text_editor.tab_size,
+            )
+            self.large_file_label.setText(
+                f"{Path(file_path).name} is {size / (1024 * 1024):.1f} MB, "
+                "it is shown read-only."
+            )
+            self.editor_stacked_widget.setCurrentWidget(self.large_file_widget)
+
+        self._update_pending_state()
+
+    def _find_tab(self, file_path: str) -> int:
+        file_path = os.path.normpath(file_path)
+
+        for i in range(self.tab_bar.count()):
+            if os.path.normpath(self.tab_bar.tabData(i)) == file_path:
+                return i
+
+        return -1
+
+    def _update_tab(self, file_path: str, modified: bool) -> None:
+        index = self._find_tab(file_path)
+
+        if index >= 0:
+            base_name = Path(file_path).stem
+            self.tab_bar.setTabText(index, f"{base_name}*" if modified else base_name)
+
+    def _select_tab(self, file_path: str) -> None:
+        index = self._find_tab(file_path)
+
+        self.tab_bar.blockSignals(True)
+
+        if index < 0:
+            index = self.tab_bar.addTab(Path(file_path).stem)
+            self.tab_bar.setTabData(index, file_path)
+            self.tab_bar.setTabToolTip(index, file_path)
+
+        self.tab_bar.setCurrentIndex(index)
+        self.tab_bar.blockSignals(False)
+
+    def _write_journal(self, document: Optional[VEXDocument]) -> None:
+        if not document:
+            return
+
+        # The text is copied here, compared and written in the background.
+        content = (
+            document.text_document.toPlainText() if document.is_modified() else None
+        )
+
+        self.journal_thread_pool.start(
+            VEXJournalWriter(document.recovery_journal, content)
+        )
+
+    def _set_document(self, document: Optional[VEXDocument]) -> None:
+        previous_document = self._document
+
+        # Edits not journaled yet are written before leaving.
+        if self._journal_timer.isActive():
+            self._journal_timer.stop()
+            self._write_journal(previous_document)
+
+        if previous_document:
+            previous_document.text_cursor = self.vex_plain_text_editor.textCursor()
+            previous_document.scroll_value = (
+                self.vex_plain_text_editor.verticalScrollBar().value()
+            )
+
+        self._document = document
+
+        if not document:
+            self.vex_plain_text_editor.set_document(self.empty_text_document)
+
+            return
+
+        self.vex_plain_text_editor.set_document(document.text_document)
+        self.vex_plain_text_editor.setTextCursor(document.text_cursor)
+        self.vex_plain_text_editor.verticalScrollBar().setValue(document.scroll_value)
+
+        # Left while it was loading, it is read again when shown.
+        if (
+            previous_document
+            and previous_document is not document
+            and self.vex_document_cache.peek(previous_document.file_path)
+            is not previous_document
+        ):
+            previous_document.text_document.deleteLater()
+
+    def _restore_view(self, state: Optional[dict]) -> None:
+        if not state:
+            return
+
+        last_position = self.vex_plain_text_editor.document().characterCount() - 1
+
+        text_cursor = self.vex_plain_text_editor.textCursor()
+        text_cursor.setPosition(min(state["anchor_position"], last_position))
+        text_cursor.setPosition(
+            min(state["cursor_position"], last_position), QtGui.QTextCursor.KeepAnchor
+        )
+
+        self.vex_plain_text_editor.setTextCursor(text_cursor)
+        self.vex_plain_text_editor.verticalScrollBar().setValue(state["scroll_value"])
+
+    def _close_large_file(self) -> None:
+        # Mapped files can not be renamed nor deleted on Windows.
+        self.vex_large_file_viewer.close_file()
+        self.editor_stacked_widget.setCurrentWidget(self.vex_plain_text_editor)
+
+    def _is_loading(self) -> bool:
+        return self._load_cancelled is not None
+
+    def _is_large_file_shown(self) -> bool:
+        return self.editor_stacked_widget.currentWidget() is self.large_file_widget
+
+    def _update_pending_state(self) -> None:
+        loading = self._is_loading() or self._is_large_file_shown()
+
+        self.vex_plain_text_editor.setReadOnly(loading)
+        self.vex_plain_text_editor.setPlaceholderText(
+            f"Loading {self.base_name}..." if self._is_loading() else ""
+        )
+        self.name_line_edit.setEnabled(not loading)
+        self.replace_code_push_button.setEnabled(not loading)
+        self.insert_code_push_button.setEnabled(not loading)
+        self.select_usages_push_button.setEnabled(not loading)
+
+        self.save_changes_push_button.setEnabled(not loading and self.is_modified())
+        self.save_changes_push_button.setText(
+            "Saving..." if self._pending_saves else "Save Changes"
+        )
+
+    def display_code(self) -> None:
+        if self._load_cancelled:
+            self._load_cancelled.set()
+
+        self._load_request_id += 1
+
+        self._close_large_file()
+
+        if not self.file_path:
+            self._load_cancelled = None
+            self._set_document(None)
+            self._update_pending_state()
+
+            return
+
+        self._select_tab(self.file_path)
+
+        # Shown again as it was left, without reading or highlighting it.
+        document = self.vex_document_cache.get(self.file_path)
+
+        if document:
+            self._load_cancelled = None
+            self._set_document(document)
+            self._update_pending_state()
+
+            return
+
+        self._set_document(
+            VEXDocument(
+                self.file_path, self.vex_plain_text_editor.create_document(self)
+            )
+        )
+
+        state = self.vex_document_cache.load_state(self.file_path)
+
+        if state and state["content"] is not None:
+            self._load_cancelled = None
+            self._update_pending_state()
+
+            self.vex_plain_text_editor.setPlainText(state["content"])
+            self.vex_plain_text_editor.document().setModified(True)
+
+            self._restore_view(state)
+            self.vex_document_cache.add(self._document)
+
+            return
+
+        self._load_cancelled = threading.Event()
+        self._update_pending_state()
+
+        full_edit = os.path.normpath(self.file_path) in self._full_edit_file_paths
+
+        self.thread_pool.start(
+            VEXFileLoader(
+                self._load_request_id,
+                self.file_path,
+                self._load_cancelled,
+                self.vex_file_worker_signals,
+                0 if full_edit else LARGE_FILE_SIZE,
+            )
+        )
+
+    def is_modified(self) -> bool:
+        return self.vex_plain_text_editor.document().isModified()
+
+    def load_preferences(self) -> None:
+        self._load_preferences()
+
+        self.vex_document_cache.set_limits(self.max_open_documents)
 
     def get_current_file_path(self) -> str:
         return self.file_path
@@ -120,17 +587,16 @@ class VEXEditorWidget(QtWidgets.QWidget):
         path = Path(file_path)
         path_suffix = path.suffix
 
+        # Missing files are reported by the loader, stat calls on a slow share
+        # would block the UI.
         if path_suffix:
             self.file_path = file_path
-
-            if os.path.exists(file_path):
-                self.base_name = path.stem
-                self.name_line_edit.setText(self.base_name)
-            else:
-                self.name_line_edit.setText("")
+            self.base_name = path.stem
+            self.name_line_edit.setText(self.base_name)
         else:
             self.name_line_edit.setText("")
             self.file_path = ""
 
     def set_library_path(self, library_path: str) -> None:
         self.library_path = library_path
+        self.vex_plain_text_editor.vex_completer.set_library_path(library_path)
@@ -0,0 +1,212 @@
+try:
+    from PySide6 import QtCore
+except ImportError:
+    from PySide2 import QtCore
+
+from typing import Optional
+import threading
+import logging
+import os
+
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Larger snippets are shown read-only from disk unless asked for whole.
+LARGE_FILE_SIZE = 2 * 1024 * 1024
+
+
+class VEXFileWorkerSignals(QtCore.QObject):
+    loaded = QtCore.Signal(int, str, str, bool)
+    large_file_found = QtCore.Signal(int, str)
+    saved = QtCore.Signal(str, bool)
+
+
+class VEXFileLoader(QtCore.QRunnable):
+
+    def __init__(
+        self,
+        request_id: int,
+        file_path: str,
+        cancelled: threading.Event,
+        signals: VEXFileWorkerSignals,
+        max_size: int = 0,
+    ) -> None:
+
+        super().__init__()
+
+        self.request_id = request_id
+        self.file_path = file_path
+        self.cancelled = cancelled
+        self.signals = signals
+        self.max_size = max_size
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+    def run(self) -> None:
+        if self.is_cancelled():
+            return
+
+        if self.max_size:
+            try:
+                size = os.path.getsize(self.file_path)
+            except OSError:
+                size = 0
+
+            # Missing files are reported below.
+            if size > self.max_size:
+                self.signals.large_file_found.emit(self.request_id, self.file_path)
+
+                return
+
+        content_cache = core.get_content_cache()
+        content = content_cache.get(self.file_path)
+
+        if content is not None:
+            self.signals.loaded.emit(self.request_id, self.file_path, content, True)
+
+            return
+
+        chunks = []
+
+        try:
+            stat_result = os.stat(self.file_path)
+
+            with open(self.file_path, "rb") as file_for_read:
+                while True:
+                    chunk = file_for_read.read(READ_CHUNK_SIZE)
+
+                    if not chunk:
+                        break
+
+                    # The user switched files, stop reading the old one.
+                    if self.is_cancelled():
+                        return
+
+                    chunks.append(chunk)
+        except FileNotFoundError:
+            self.signals.loaded.emit(self.request_id, self.file_path, "", False)
+
+            return
+        except OSError as error:
+            logger.error(f"Could not read {self.file_path!r}: {error}")
+            self.signals.loaded.emit(self.request_id, self.file_path, "", False)
+
+            return
+
+        if self.is_cancelled():
+            return
+
+        content = b"".join(chunks).decode("utf-8", errors="replace")
+        content_cache.put(self.file_path, content, stat_result)
+
+        self.signals.loaded.emit(self.request_id, self.file_path, content, True)
+
+
+class VEXFileSaver(QtCore.QRunnable):
+
+    def __init__(
+        self, file_path: str, content: str, signals: VEXFileWorkerSignals
+    ) -> None:
+
+        super().__init__()
+
+        self.file_path = file_path
+        self.content = content
+        self.signals = signals
+
+    def run(self) -> None:
+        if os.path.exists(self.file_path):
+            success = core.save_vex_file(self.file_path, self.content)
+        else:
+            success = False
+
+            logger.error(f"{self.file_path!r} does not exist.")
+
+        self.signals.saved.emit(self.file_path, success)
+
+
+class VEXJournalWriter(QtCore.QRunnable):
+
+    def __init__(
+        self, recovery_journal: core.RecoveryJournal, content: Optional[str]
+    ) -> None:
+
+        super().__init__()
+
+        self.recovery_journal = recovery_journal
+        self.content = content
+
+    def run(self) -> None:
+        # Nothing left to recover once the edits are saved or undone.
+        if self.content is None:
+            self.recovery_journal.remove()
+        else:
+            self.recovery_journal.write(self.content)
+
+
+class VEXDocumentStateWriterSignals(QtCore.QObject):
+    written = QtCore.Signal(int, str)
+
+
+class VEXDocumentStateWriter(QtCore.QRunnable):
+
+    def __init__(
+        self,
+        write_id: int,
+        file_path: str,
+        state: Optional[dict],
+        signals: VEXDocumentStateWriterSignals,
+        recovery_journal: Optional[core.RecoveryJournal] = None,
+    ) -> None:
+
+        super().__init__()
+
+        self.write_id = write_id
+        self.file_path = file_path
+        self.state = state
+        self.signals = signals
+        self.recovery_journal = recovery_journal
+
+    def run(self) -> None:
+        if self.state is None:
+            core.remove_document_state(self.file_path)
+        else:
+            core.save_document_state(
+                self.file_path,
+                self.state["cursor_position"],
+                self.state["anchor_position"],
+                self.state["scroll_value"],
+                self.state["content"],
+            )
+
+        # The state holds the unsaved edits now.
+        if self.recovery_journal:
+            self.recovery_journal.remove()
+
+        self.signals.written.emit(self.write_id, self.file_path)
+
+
+class VEXFilePrefetcher(QtCore.QRunnable):
+
+    def __init__(self, file_paths: list[str], cancelled: threading.Event) -> None:
+        super().__init__()
+
+        self.file_paths = file_paths
+        self.cancelled = cancelled
+
+    def run(self) -> None:
+        content_cache = core.get_content_cache()
+
+        for file_path in self.file_paths:
+            if self.cancelled.is_set():
+                return
+
+            try:
+                content_cache.read(file_path)
+            except OSError as error:
+                logger.debug(f"Could not prefetch {file_path!r}: {error}")
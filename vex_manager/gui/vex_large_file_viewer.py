@@ -0,0 +1,272 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+from collections import OrderedDict
+import logging
+
+from vex_manager.gui.vex_syntax_highlighter import VEXSyntaxHighlighter
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+# Milliseconds between looks at how far the line index got.
+INDEX_POLL_INTERVAL = 100
+
+TEXT_LAYOUT_CACHE_SIZE = 512
+
+TEXT_MARGIN = 4
+
+
+class VEXLargeFileViewer(QtWidgets.QAbstractScrollArea):
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.mapped_vex_file = None
+
+        self.tab_size = 4
+
+        # Lines are laid out when scrolled into view, the last ones are kept.
+        self._text_layouts = OrderedDict()
+        self._max_line_width = 0
+
+        self._selection_anchor = -1
+        self._selection_cursor = -1
+
+        # Without a document, it only lends its colors and token cache.
+        self.vex_syntax_highlighter = VEXSyntaxHighlighter(self)
+
+        self._index_timer = QtCore.QTimer(self)
+        self._index_timer.setInterval(INDEX_POLL_INTERVAL)
+
+        self.setFocusPolicy(QtCore.Qt.StrongFocus)
+
+        self._create_connections()
+
+    def _create_connections(self) -> None:
+        self._index_timer.timeout.connect(self._update_line_count)
+
+    def _get_line_height(self) -> int:
+        return self.fontMetrics().lineSpacing()
+
+    def _get_visible_line_count(self) -> int:
+        return self.viewport().height() // self._get_line_height() + 1
+
+    def _get_line_at(self, y: int) -> int:
+        line = self.verticalScrollBar().value() + y // self._get_line_height()
+
+        return max(0, min(line, self._get_line_count() - 1))
+
+    def _get_line_count(self) -> int:
+        return self.mapped_vex_file.line_count if self.mapped_vex_file else 0
+
+    def _get_text_layout(self, text: str, state: int) -> QtGui.QTextLayout:
+        key = (text, state)
+        text_layout = self._text_layouts.get(key)
+
+        if text_layout:
+            self._text_layouts.move_to_end(key)
+
+            return text_layout
+
+        format_ranges, _ = self.vex_syntax_highlighter.get_format_ranges(text, state)
+
+        text_option = QtGui.QTextOption()
+        text_option.setWrapMode(QtGui.QTextOption.NoWrap)
+        text_option.setTabStopDistance(
+            self.fontMetrics().horizontalAdvance(" ") * self.tab_size
+        )
+
+        text_layout = QtGui.QTextLayout(text, self.font())
+        text_layout.setTextOption(text_option)
+        text_layout.setFormats(format_ranges)
+        text_layout.beginLayout()
+        text_line = text_layout.createLine()
+        text_layout.endLayout()
+
+        if text_line.isValid() and text_line.naturalTextWidth() > self._max_line_width:
+            self._max_line_width = int(text_line.naturalTextWidth())
+            self._update_scroll_bars()
+
+        self._text_layouts[key] = text_layout
+
+        if len(self._text_layouts) > TEXT_LAYOUT_CACHE_SIZE:
+            self._text_layouts.popitem(last=False)
+
+        return text_layout
+
+    def _get_selected_lines(self) -> tuple[int, int]:
+        if self._selection_anchor < 0:
+            return -1, -1
+
+        return (
+            min(self._selection_anchor, self._selection_cursor),
+            max(self._selection_anchor, self._selection_cursor),
+        )
+
+    def _update_line_count(self) -> None:
+        self._update_scroll_bars()
+
+        if not self.mapped_vex_file or self.mapped_vex_file.is_indexed:
+            self._index_timer.stop()
+
+        self.viewport().update()
+
+    def _update_scroll_bars(self) -> None:
+        visible_line_count = self._get_visible_line_count()
+
+        vertical_scroll_bar = self.verticalScrollBar()
+        vertical_scroll_bar.setRange(
+            0, max(0, self._get_line_count() - visible_line_count + 1)
+        )
+        vertical_scroll_bar.setPageStep(visible_line_count)
+
+        horizontal_scroll_bar = self.horizontalScrollBar()
+        horizontal_scroll_bar.setRange(
+            0, max(0, self._max_line_width + 2 * TEXT_MARGIN - self.viewport().width())
+        )
+        horizontal_scroll_bar.setPageStep(self.viewport().width())
+
+    def copy(self) -> None:
+        first_line, last_line = self._get_selected_lines()
+
+        if first_line < 0 or not self.mapped_vex_file:
+            return
+
+        QtWidgets.QApplication.clipboard().setText(
+            self.mapped_vex_file.get_text(first_line, last_line)
+        )
+
+    def close_file(self) -> None:
+        self._index_timer.stop()
+
+        if self.mapped_vex_file:
+            self.mapped_vex_file.close()
+
+        self.mapped_vex_file = None
+        self._text_layouts.clear()
+        self._max_line_width = 0
+        self._selection_anchor = self._selection_cursor = -1
+
+        self.viewport().update()
+
+    def get_file_path(self) -> str:
+        return self.mapped_vex_file.file_path if self.mapped_vex_file else ""
+
+    def set_file_path(self, file_path: str) -> bool:
+        # Mapped again only when the file changed since.
+        if (
+            self.mapped_vex_file
+            and self.mapped_vex_file.file_path == file_path
+            and not self.mapped_vex_file.is_stale()
+        ):
+            return True
+
+        self.close_file()
+
+        self.mapped_vex_file = core.open_mapped_vex_file(file_path)
+
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+
+        self._update_line_count()
+
+        if self.mapped_vex_file and not self.mapped_vex_file.is_indexed:
+            self._index_timer.start()
+
+        return self.mapped_vex_file is not None
+
+    def set_font_and_colors(
+        self,
+        font: QtGui.QFont,
+        color_scheme: dict[str, tuple[float, float, float]],
+        tab_size: int,
+    ) -> None:
+
+        self.setFont(font)
+        self.tab_size = tab_size
+        self.vex_syntax_highlighter.set_vex_systax_highlighter_colors(color_scheme)
+
+        self._text_layouts.clear()
+        self._max_line_width = 0
+        self._update_scroll_bars()
+        self.viewport().update()
+
+    def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
+        key = event.key()
+        control = bool(event.modifiers() & QtCore.Qt.ControlModifier)
+        vertical_scroll_bar = self.verticalScrollBar()
+
+        if event.matches(QtGui.QKeySequence.Copy):
+            self.copy()
+        elif key == QtCore.Qt.Key_Home and control:
+            vertical_scroll_bar.setValue(0)
+        elif key == QtCore.Qt.Key_End and control:
+            vertical_scroll_bar.setValue(vertical_scroll_bar.maximum())
+        else:
+            super().keyPressEvent(event)
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        if event.buttons() & QtCore.Qt.LeftButton and self._selection_anchor >= 0:
+            self._selection_cursor = self._get_line_at(event.pos().y())
+            self.viewport().update()
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        if event.button() != QtCore.Qt.LeftButton or not self._get_line_count():
+            super().mousePressEvent(event)
+
+            return
+
+        # Whole lines are selected, shift extends the selection.
+        line = self._get_line_at(event.pos().y())
+
+        if event.modifiers() & QtCore.Qt.ShiftModifier and self._selection_anchor >= 0:
+            self._selection_cursor = line
+        else:
+            self._selection_anchor = self._selection_cursor = line
+
+        self.viewport().update()
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+
+        if not self.mapped_vex_file:
+            return
+
+        line_height = self._get_line_height()
+        first_line = self.verticalScrollBar().value()
+        first_selected_line, last_selected_line = self._get_selected_lines()
+        x = TEXT_MARGIN - self.horizontalScrollBar().value()
+
+        lines = self.mapped_vex_file.get_lines(
+            first_line, self._get_visible_line_count()
+        )
+
+        for i, (text, state) in enumerate(lines):
+            line_number = first_line + i
+            y = i * line_height
+
+            if first_selected_line <= line_number <= last_selected_line:
+                painter.fillRect(
+                    0,
+                    y,
+                    self.viewport().width(),
+                    line_height,
+                    self.palette().highlight(),
+                )
+
+            text_layout = self._get_text_layout(text, state)
+            text_layout.draw(painter, QtCore.QPointF(x, y))
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+
+        self._update_scroll_bars()
@@ -18,6 +18,7 @@ from vex_manager.gui.file_explorer_widget import FileExplorerWidget
 from vex_manager.gui.vex_editor_widget import VEXEditorWidget
 from vex_manager.gui.preferences_ui import PreferencesUI
 import vex_manager.utils as utils
+import vex_manager.core as core
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
@@ -33,7 +34,9 @@ class VEXManagerUI(QtWidgets.QWidget):
 
     @classmethod
     def display(cls) -> None:
-        if not cls.dialog_instance:
+        is_first_display = not cls.dialog_instance
+
+        if is_first_display:
             cls.dialog_instance = VEXManagerUI()
 
         if cls.dialog_instance.isHidden():
@@ -42,6 +45,10 @@ class VEXManagerUI(QtWidgets.QWidget):
             cls.dialog_instance.raise_()
             cls.dialog_instance.activateWindow()
 
+        # Journals left by an earlier session hold edits that were never saved.
+        if is_first_display:
+            cls.dialog_instance._recover_unsaved_edits()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -138,6 +145,7 @@ class VEXManagerUI(QtWidgets.QWidget):
         self._load_preferences()
         self._update()
 
+        self.vex_editor_widget.load_preferences()
         self.vex_editor_widget.vex_plain_text_editor.set_font_and_colors()
 
     def _file_explorer_double_clicked_widget(self, file_path: str) -> None:
@@ -145,6 +153,36 @@ class VEXManagerUI(QtWidgets.QWidget):
         self.vex_editor_widget.set_file_path(self.current_vex_file_path)
         self.vex_editor_widget.display_code()
 
+    def _recover_unsaved_edits(self) -> None:
+        # Journals of sessions still running hold their live edits.
+        journal_paths = core.get_orphaned_recovery_journal_paths()
+
+        if not journal_paths:
+            return
+
+        result = hou.ui.displayCustomConfirmation(
+            f"{len(journal_paths)} snippet(s) had unsaved edits when Houdini last "
+            "closed. Do you want to recover them?",
+            buttons=("Yes", "No"),
+            close_choice=1,
+            default_choice=0,
+            suppress=hou.confirmType.NoConfirmType,
+            title="Recover Unsaved Edits",
+        )
+
+        if result != 0:
+            for journal_path in journal_paths:
+                core.remove_recovery_journal(journal_path)
+
+            return
+
+        # Opened with the recovered edits, still unsaved.
+        for journal_path in journal_paths:
+            file_path = core.restore_recovery_journal(journal_path)
+
+            if file_path:
+                self._file_explorer_double_clicked_widget(file_path)
+
     def _update(self) -> None:
         if self.file_explorer_widget.get_library_path() != self.library_path:
             self.file_explorer_widget.set_library_path(self.library_path)
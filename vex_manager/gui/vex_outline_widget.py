@@ -0,0 +1,198 @@
+try:
+    from PySide6 import QtWidgets
+    from PySide6 import QtCore
+    from PySide6 import QtGui
+except ImportError:
+    from PySide2 import QtWidgets
+    from PySide2 import QtCore
+    from PySide2 import QtGui
+
+import logging
+
+import vex_manager.core.vex_parser as vex_parser
+import vex_manager.core as core
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+# Milliseconds after the last edit before the outline is updated.
+UPDATE_DELAY = 500
+
+LINE_ROLE = QtCore.Qt.UserRole
+
+
+class VEXOutlineWorkerSignals(QtCore.QObject):
+    updated = QtCore.Signal(int, object)
+
+
+class VEXOutlineWorker(QtCore.QRunnable):
+
+    def __init__(
+        self,
+        request_id: int,
+        vex_code: str,
+        outline_table: core.VEXOutlineTable,
+        signals: VEXOutlineWorkerSignals,
+    ) -> None:
+
+        super().__init__()
+
+        self.request_id = request_id
+        self.vex_code = vex_code
+        self.outline_table = outline_table
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            root = self.outline_table.update(self.vex_code)
+        except Exception:
+            logger.exception("Failed to update the outline.")
+
+            return
+
+        self.signals.updated.emit(self.request_id, root)
+
+
+class VEXOutlineWidget(QtWidgets.QWidget):
+
+    def __init__(self, text_edit: QtWidgets.QPlainTextEdit) -> None:
+        super().__init__()
+
+        self.text_edit = text_edit
+
+        self.outline_table = core.VEXOutlineTable()
+
+        self._request_id = 0
+        self._is_updating = False
+        self._is_dirty = False
+
+        # Updates run one after the other, each one reuses what the last one
+        # parsed.
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.vex_outline_worker_signals = VEXOutlineWorkerSignals(self)
+
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_DELAY)
+
+        self._create_widgets()
+        self._create_layouts()
+        self._create_connections()
+
+    def _create_widgets(self) -> None:
+        self.outline_tree_widget = QtWidgets.QTreeWidget()
+        self.outline_tree_widget.setHeaderHidden(True)
+        self.outline_tree_widget.setUniformRowHeights(True)
+
+    def _create_layouts(self) -> None:
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.outline_tree_widget)
+        main_layout.setContentsMargins(QtCore.QMargins())
+        main_layout.setSpacing(3)
+
+    def _create_connections(self) -> None:
+        self.outline_tree_widget.itemActivated.connect(
+            self._outline_item_activated_tree_widget
+        )
+        self.outline_tree_widget.itemClicked.connect(
+            self._outline_item_activated_tree_widget
+        )
+        self.text_edit.contents_changed.connect(self._contents_changed)
+        self.text_edit.document_changed.connect(self._document_changed)
+        self.vex_outline_worker_signals.updated.connect(self._outline_updated)
+        self._update_timer.timeout.connect(self.update_outline)
+
+    def _contents_changed(self, position: int, removed: int, added: int) -> None:
+        self._update_timer.start()
+
+    def _document_changed(self, text_document: QtGui.QTextDocument) -> None:
+        # Another snippet, outlined without waiting.
+        self.update_outline()
+
+    def _outline_item_activated_tree_widget(
+        self, item: QtWidgets.QTreeWidgetItem
+    ) -> None:
+
+        self.go_to_line(item.data(0, LINE_ROLE))
+
+    def _outline_updated(self, request_id: int, root: core.VEXOutlineItem) -> None:
+        self._is_updating = False
+
+        # Edits made during the update are outlined by the next one.
+        if self._is_dirty:
+            self.update_outline()
+
+            return
+
+        if request_id == self._request_id:
+            self._populate(root)
+
+    @staticmethod
+    def _get_item_text(item: core.VEXOutlineItem) -> str:
+        if item.kind == vex_parser.FUNCTION:
+            return f"{item.type_name} {item.name}()"
+
+        if item.kind == vex_parser.STRUCT:
+            return f"struct {item.name}"
+
+        return item.name
+
+    def _populate(self, root: core.VEXOutlineItem) -> None:
+        # Rebuilt whole, lines move with most edits, scrolled back after.
+        scroll_bar = self.outline_tree_widget.verticalScrollBar()
+        scroll_value = scroll_bar.value()
+
+        self.outline_tree_widget.setUpdatesEnabled(False)
+        self.outline_tree_widget.clear()
+
+        items = [(self.outline_tree_widget.invisibleRootItem(), root)]
+
+        while items:
+            parent_tree_item, parent_item = items.pop()
+
+            for item in parent_item.children:
+                tree_item = QtWidgets.QTreeWidgetItem(parent_tree_item)
+                tree_item.setText(0, self._get_item_text(item))
+                tree_item.setToolTip(0, f"Line {item.line}")
+                tree_item.setData(0, LINE_ROLE, item.line)
+
+                if item.children:
+                    items.append((tree_item, item))
+
+        self.outline_tree_widget.expandAll()
+        self.outline_tree_widget.setUpdatesEnabled(True)
+
+        scroll_bar.setValue(scroll_value)
+
+    def go_to_line(self, line: int) -> None:
+        block = self.text_edit.document().findBlockByNumber(line - 1)
+
+        if not block.isValid():
+            return
+
+        self.text_edit.setTextCursor(QtGui.QTextCursor(block))
+        self.text_edit.centerCursor()
+        self.text_edit.setFocus()
+
+    def update_outline(self) -> None:
+        self._update_timer.stop()
+
+        if self._is_updating:
+            self._is_dirty = True
+
+            return
+
+        self._is_updating = True
+        self._is_dirty = False
+        self._request_id += 1
+
+        self.thread_pool.start(
+            VEXOutlineWorker(
+                self._request_id,
+                self.text_edit.toPlainText(),
+                self.outline_table,
+                self.vex_outline_worker_signals,
+            )
+        )
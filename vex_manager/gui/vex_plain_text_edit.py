@@ -11,26 +11,41 @@ import hou
 
 import logging
 import json
+import html
 import os
 
+from vex_manager.gui.vex_syntax_highlighter import LARGE_DOCUMENT_BLOCK_COUNT
+from vex_manager.gui.vex_completer import VEXCompleter
 from vex_manager.gui.vex_syntax_highlighter import VEXSyntaxHighlighter
+from vex_manager.gui.vex_block_structure import VEXBlockStructure
 from vex_manager.config import ColorScheme
 from vex_manager.config import VEXSyntaxis
+import vex_manager.core.vex_parser as vex_parser
 import vex_manager.utils as utils
+import vex_manager.core as core
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
 
 class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
+    # The document shown changes with set_document, these follow it.
+    contents_changed = QtCore.Signal(int, int, int)
+    document_changed = QtCore.Signal(QtGui.QTextDocument)
+
     PREFERENCES_PATH = utils.get_preferences_path()
 
+    LATENCY_METRICS_ENVIRONMENT_VARIABLE = "VEX_MANAGER_LATENCY_METRICS"
+
+    MAX_TOOL_TIP_SIGNATURES = 8
+
     def __init__(self) -> None:
         super().__init__()
 
         self.font = QtGui.QFont()
 
         self.auto_indent = True
+        self.auto_complete = True
         self.insert_closing_brackets = True
         self.insert_closing_quotes = True
 
@@ -40,17 +55,35 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
         self.font_family = ""
         self.font_size = 8
 
+        # Off by default, set VEX_MANAGER_LATENCY_METRICS=1 to log slow keys.
+        self.key_latency_metrics = None
+        self.key_to_paint_latency_metrics = None
+
+        # Opened at the first lookup.
+        self.signature_index = None
+        self._is_signature_help_visible = False
+
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
         self.setWordWrapMode(QtGui.QTextOption.NoWrap)
 
         self.vex_syntax_highlighter = VEXSyntaxHighlighter(self.document())
+        self.vex_block_structure = VEXBlockStructure(self.document())
+        self.vex_completer = VEXCompleter(self)
 
         self._create_connections()
         self._load_preferences()
         self.set_font_and_colors()
 
+        self.set_latency_metrics_enabled(
+            os.environ.get(VEXPlainTextEdit.LATENCY_METRICS_ENVIRONMENT_VARIABLE)
+            == "1"
+        )
+
     def _create_connections(self) -> None:
+        self.document().contentsChange.connect(self.contents_changed)
+        self.cursorPositionChanged.connect(self._unfold_cursor_block)
         self.cursorPositionChanged.connect(self._highlight_current_line)
+        self.updateRequest.connect(self._update_visible_blocks)
 
     def _decrease_font_size(self) -> None:
         point_size = self.font.pointSize()
@@ -66,52 +99,141 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
         event: QtGui.QKeyEvent,
     ) -> None:
 
-        if current_line_text.strip() == "":
-            if current_line_text and text_cursor.atBlockEnd():
-                delete_block = len(current_line_text) % self.tab_size
+        if (
+            current_line_text
+            and current_line_text.strip() == ""
+            and text_cursor.atBlockEnd()
+            and not text_cursor.hasSelection()
+        ):
+            delete_block = len(current_line_text) % self.tab_size
 
-                if delete_block == 0:
-                    delete_block = self.tab_size
+            if delete_block == 0:
+                delete_block = self.tab_size
 
-                for i in range(delete_block):
-                    super().keyPressEvent(event)
-            else:
-                super().keyPressEvent(event)
+            # One edit, undone at once.
+            text_cursor.beginEditBlock()
+
+            for i in range(delete_block):
+                text_cursor.deletePreviousChar()
+
+            text_cursor.endEditBlock()
+
+            self.setTextCursor(text_cursor)
         else:
             super().keyPressEvent(event)
 
-    @staticmethod
-    def _display_help(text_cursor: QtGui.QTextCursor) -> None:
+    def _display_help(
+        self, text_cursor: QtGui.QTextCursor, open_help_browser: bool = False
+    ) -> None:
+
         text_cursor.select(QtGui.QTextCursor.WordUnderCursor)
         word_under_cursor = text_cursor.selectedText()
 
+        # The offline summary is instant, the help browser shows the rest.
+        if not open_help_browser:
+            tool_tip = self._get_signature_tool_tip(word_under_cursor)
+
+            if tool_tip:
+                self._show_tool_tip_at_cursor(tool_tip)
+
+                return
+
         if word_under_cursor in VEXSyntaxis.VEX_FUNCTIONS:
             desktop = hou.ui.curDesktop()
             desktop.displayHelpPath(f"/vex/functions/{word_under_cursor}")
 
-    def _handle_cursor_behavior(self, char: str) -> bool:
+    def _get_char(self, position: int) -> str:
+        # Looked up in the document, toPlainText() copies all of it.
+        if 0 <= position < self.document().characterCount():
+            return self.document().characterAt(position)
+
+        return ""
+
+    @staticmethod
+    def _format_signature(signature: str, argument: int) -> str:
+        start = signature.find("(")
+        end = signature.rfind(")")
+
+        if argument < 0 or start < 0 or end < start:
+            return html.escape(signature)
+
+        arguments = [
+            html.escape(text) for text in signature[start + 1 : end].split(",")
+        ]
+
+        if argument < len(arguments):
+            arguments[argument] = f"<b>{arguments[argument]}</b>"
+
+        return (
+            f"{html.escape(signature[: start + 1])}"
+            f"{','.join(arguments)}"
+            f"{html.escape(signature[end:])}"
+        )
+
+    def _get_signature_tool_tip(self, name: str, argument: int = -1) -> str:
+        if not name:
+            return ""
+
+        if self.signature_index is None:
+            self.signature_index = core.get_signature_index()
+
+        signature = self.signature_index.get_signature(name)
+
+        if not signature:
+            return ""
+
+        summary, signatures = signature
+
+        lines = [
+            f"<code>{self._format_signature(function_signature, argument)}</code>"
+            for function_signature in signatures[
+                : VEXPlainTextEdit.MAX_TOOL_TIP_SIGNATURES
+            ]
+        ]
+
+        if summary:
+            lines.append(html.escape(summary))
+
+        return "<br>".join(lines)
+
+    def _show_tool_tip_at_cursor(self, tool_tip: str) -> None:
+        position = self.viewport().mapToGlobal(self.cursorRect().bottomLeft())
+
+        QtWidgets.QToolTip.showText(position, tool_tip, self.viewport())
+
+    def _update_signature_help(self) -> None:
         text_cursor = self.textCursor()
-        text_cursor_selected_text = text_cursor.selectedText()
+        block = text_cursor.block()
 
-        if not text_cursor_selected_text:
-            cursor_position = text_cursor.position()
+        # Calls are looked for in the current line only.
+        name, argument = vex_parser.get_call_argument(
+            block.text()[: text_cursor.positionInBlock()],
+            max(0, block.previous().userState()),
+        )
+        tool_tip = self._get_signature_tool_tip(name, argument)
 
-            if cursor_position:
-                plain_text = self.toPlainText()
+        if tool_tip and not self.vex_completer.popup().isVisible():
+            self._show_tool_tip_at_cursor(tool_tip)
+            self._is_signature_help_visible = True
+        elif self._is_signature_help_visible:
+            QtWidgets.QToolTip.hideText()
+            self._is_signature_help_visible = False
 
-                if cursor_position < len(plain_text):
-                    text_at_cursor = self.toPlainText()[cursor_position]
+    def _handle_cursor_behavior(self, char: str) -> bool:
+        text_cursor = self.textCursor()
 
-                    if text_at_cursor == char:
-                        text_cursor = self.textCursor()
-                        text_cursor.movePosition(
-                            QtGui.QTextCursor.Right,
-                            QtGui.QTextCursor.MoveAnchor,
-                            1
-                        )
-                        self.setTextCursor(text_cursor)
+        if not text_cursor.hasSelection():
+            cursor_position = text_cursor.position()
 
-                        return True
+            if cursor_position and self._get_char(cursor_position) == char:
+                text_cursor.movePosition(
+                    QtGui.QTextCursor.Right,
+                    QtGui.QTextCursor.MoveAnchor,
+                    1
+                )
+                self.setTextCursor(text_cursor)
+
+                return True
 
         return False
 
@@ -126,8 +248,109 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
 
         extra_selections.append(selection)
 
+        for position in self._get_matching_bracket_positions():
+            selection = QtWidgets.QTextEdit.ExtraSelection()
+            selection.format.setBackground(QtGui.QColor(80, 80, 80))
+            selection.cursor = QtGui.QTextCursor(self.document())
+            selection.cursor.setPosition(position)
+            selection.cursor.movePosition(
+                QtGui.QTextCursor.Right, QtGui.QTextCursor.KeepAnchor
+            )
+
+            extra_selections.append(selection)
+
         self.setExtraSelections(extra_selections)
 
+    def _get_matching_bracket_positions(self) -> tuple[int, ...]:
+        position = self.textCursor().position()
+
+        # The bracket after the cursor, or else the one before it.
+        for bracket_position in (position, position - 1):
+            if bracket_position < 0:
+                continue
+
+            matching_position = self.vex_block_structure.find_matching_bracket(
+                bracket_position
+            )
+
+            if matching_position >= 0:
+                return bracket_position, matching_position
+
+        return ()
+
+    def _unfold_cursor_block(self) -> None:
+        # Moves into folds, like find or undo, open them.
+        block = self.textCursor().block()
+
+        while not block.isVisible():
+            if not self.vex_block_structure.unfold(
+                self.vex_block_structure.get_fold_header(block)
+            ):
+                break
+
+    def fold(self) -> bool:
+        return self.vex_block_structure.fold_at(self.textCursor().position())
+
+    def unfold(self) -> bool:
+        return self.vex_block_structure.unfold_at(self.textCursor().position())
+
+    def _paint_fold_markers(self) -> None:
+        painter = QtGui.QPainter(self.viewport())
+        painter.setPen(self.palette().color(QtGui.QPalette.Mid))
+
+        font_metrics = self.fontMetrics()
+        marker_width = font_metrics.horizontalAdvance(" ... ")
+
+        content_offset = self.contentOffset()
+        viewport_height = self.viewport().height()
+
+        block = self.firstVisibleBlock()
+
+        while block.isValid():
+            geometry = self.blockBoundingGeometry(block).translated(content_offset)
+
+            if geometry.top() > viewport_height:
+                break
+
+            folded_block_count = self.vex_block_structure.get_folded_block_count(block)
+
+            if folded_block_count:
+                layout = block.layout()
+                line = layout.lineAt(layout.lineCount() - 1)
+
+                rect = QtCore.QRectF(
+                    geometry.left()
+                    + line.naturalTextWidth()
+                    + font_metrics.horizontalAdvance(" "),
+                    geometry.top() + line.y(),
+                    marker_width,
+                    line.height(),
+                )
+
+                painter.drawRect(rect)
+                painter.drawText(rect, QtCore.Qt.AlignCenter, "...")
+
+                # Hidden blocks are skipped, not walked.
+                block = self.document().findBlockByNumber(
+                    block.blockNumber() + folded_block_count + 1
+                )
+            else:
+                block = block.next()
+
+        painter.end()
+
+    def _update_visible_blocks(self) -> None:
+        first_visible_block_number = self.firstVisibleBlock().blockNumber()
+
+        viewport_bottom_left = QtCore.QPoint(0, self.viewport().height() - 1)
+        last_visible_block_number = self.cursorForPosition(
+            viewport_bottom_left
+        ).blockNumber()
+
+        self.vex_syntax_highlighter.set_visible_blocks(
+            first_visible_block_number, last_visible_block_number
+        )
+
     def _increase_font_size(self) -> None:
         point_size = self.font.pointSize()
 
@@ -146,25 +369,23 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
         cursor_position = text_cursor.position() - 1
 
         if cursor_position >= 0:
-            text_at_cursor = self.toPlainText()[cursor_position]
+            indent = "".ljust(leading_space)
 
-            if text_at_cursor in ["{", "(", "["]:
-                self.insertPlainText("\n\n")
-                self.insertPlainText("".ljust(leading_space))
+            # One edit, undone at once and highlighted once.
+            text_cursor.beginEditBlock()
 
-                text_cursor.movePosition(
-                    QtGui.QTextCursor.Up,
-                    QtGui.QTextCursor.MoveAnchor,
-                    1
-                )
-                self.setTextCursor(text_cursor)
-
-                leading_space += self.tab_size
+            if self._get_char(cursor_position) in ["{", "(", "["]:
+                text_cursor.insertText("\n".ljust(leading_space + self.tab_size + 1))
+                position = text_cursor.position()
 
+                text_cursor.insertText(f"\n{indent}")
+                text_cursor.setPosition(position)
             else:
-                super().keyPressEvent(event)
+                text_cursor.insertText(f"\n{indent}")
+
+            text_cursor.endEditBlock()
 
-            self.insertPlainText("".ljust(leading_space))
+            self.setTextCursor(text_cursor)
         else:
             super().keyPressEvent(event)
 
@@ -182,14 +403,12 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
         else:
             matching_delimiter = ""
 
-        self.insertPlainText(delimiter)
-        self.insertPlainText(matching_delimiter)
-
         text_cursor = self.textCursor()
+        text_cursor.insertText(f"{delimiter}{matching_delimiter}")
         text_cursor.movePosition(
             QtGui.QTextCursor.Left,
             QtGui.QTextCursor.MoveAnchor,
-            1
+            len(matching_delimiter)
         )
         self.setTextCursor(text_cursor)
 
@@ -201,6 +420,7 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
                 settings = json.load(file_for_read)
 
         self.auto_indent = settings.get("auto_indent", True)
+        self.auto_complete = settings.get("auto_complete", True)
         self.insert_closing_brackets = settings.get("insert_closing_brackets", True)
         self.insert_closing_quotes = settings.get("insert_closing_quotes", True)
 
@@ -228,18 +448,185 @@ class VEXPlainTextEdit(QtWidgets.QPlainTextEdit):
 
         self.vex_syntax_highlighter.set_vex_systax_highlighter_colors(self.color_scheme)
 
+    def create_document(self, parent: QtCore.QObject) -> QtGui.QTextDocument:
+        # Each document keeps its own highlighter and brackets, switching back
+        # to one shows it as it was left, without highlighting it again.
+        text_document = QtGui.QTextDocument(parent)
+        text_document.setDocumentLayout(
+            QtWidgets.QPlainTextDocumentLayout(text_document)
+        )
+        text_document.setDefaultFont(super().font())
+
+        vex_syntax_highlighter = VEXSyntaxHighlighter(text_document)
+        vex_syntax_highlighter.set_vex_systax_highlighter_colors(self.color_scheme)
+
+        VEXBlockStructure(text_document)
+
+        return text_document
+
+    def set_document(self, text_document: QtGui.QTextDocument) -> None:
+        if text_document is self.document():
+            return
+
+        vex_syntax_highlighter = text_document.findChild(VEXSyntaxHighlighter)
+        vex_block_structure = text_document.findChild(VEXBlockStructure)
+
+        if not vex_syntax_highlighter or not vex_block_structure:
+            logger.error("The document was not created by the editor.")
+
+            return
+
+        # Preferences may have changed while it was not shown.
+        if vex_syntax_highlighter.color_scheme != self.color_scheme:
+            vex_syntax_highlighter.set_vex_systax_highlighter_colors(self.color_scheme)
+
+        if text_document.defaultFont() != super().font():
+            text_document.setDefaultFont(super().font())
+
+        self.document().contentsChange.disconnect(self.contents_changed)
+
+        # Set first, the cursor of the new document matches brackets with them.
+        self.vex_syntax_highlighter = vex_syntax_highlighter
+        self.vex_block_structure = vex_block_structure
+
+        self.setDocument(text_document)
+
+        text_document.contentsChange.connect(self.contents_changed)
+
+        self._update_visible_blocks()
+        self.document_changed.emit(text_document)
+
+    def setPlainText(self, text: str) -> None:
+        # Decided before the text is set, large documents skip the synchronous
+        # highlight of every block.
+        self.vex_syntax_highlighter.set_large_document(
+            text.count("\n") >= LARGE_DOCUMENT_BLOCK_COUNT
+        )
+
+        self.vex_completer.clear_document_words()
+
+        super().setPlainText(text)
+
+        self._update_visible_blocks()
+
+    def set_latency_metrics_enabled(self, enabled: bool) -> None:
+        if enabled:
+            self.key_latency_metrics = utils.LatencyMetrics("Key press")
+            self.key_to_paint_latency_metrics = utils.LatencyMetrics(
+                "Key press to paint"
+            )
+        else:
+            self.key_latency_metrics = None
+            self.key_to_paint_latency_metrics = None
+
+    def get_latency_metrics(self) -> dict[str, dict[str, float]]:
+        if not self.key_latency_metrics:
+            return {}
+
+        return {
+            "key_press": self.key_latency_metrics.get_summary(),
+            "key_press_to_paint": self.key_to_paint_latency_metrics.get_summary(),
+        }
+
+    def viewportEvent(self, event: QtCore.QEvent) -> bool:
+        if event.type() != QtCore.QEvent.ToolTip:
+            return super().viewportEvent(event)
+
+        text_cursor = self.cursorForPosition(event.pos())
+        text_cursor.select(QtGui.QTextCursor.WordUnderCursor)
+
+        tool_tip = self._get_signature_tool_tip(text_cursor.selectedText())
+
+        if tool_tip:
+            QtWidgets.QToolTip.showText(event.globalPos(), tool_tip, self.viewport())
+        else:
+            QtWidgets.QToolTip.hideText()
+            event.ignore()
+
+        return True
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        self._paint_fold_markers()
+
+        if self.key_to_paint_latency_metrics:
+            self.key_to_paint_latency_metrics.stop()
+
     def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
+        if not self.key_latency_metrics:
+            self._key_press(event)
+
+            return
+
+        # Handling includes highlighting the edit, painting happens later.
+        self.key_latency_metrics.start()
+
+        if not self.key_to_paint_latency_metrics.is_started():
+            self.key_to_paint_latency_metrics.start()
+
+        self._key_press(event)
+
+        self.key_latency_metrics.stop()
+
+    def _key_press(self, event: QtGui.QKeyEvent) -> None:
         key = event.key()
         modifiers = event.modifiers()
 
-        ctrl = modifiers & QtCore.Qt.ControlModifier != 0
+        ctrl = bool(modifiers & QtCore.Qt.ControlModifier)
+        shift = bool(modifiers & QtCore.Qt.ShiftModifier)
+
+        if self.vex_completer.popup().isVisible() and key in (
+            QtCore.Qt.Key_Return,
+            QtCore.Qt.Key_Enter,
+            QtCore.Qt.Key_Tab,
+            QtCore.Qt.Key_Backtab,
+            QtCore.Qt.Key_Escape,
+        ):
+            # Left to the completer, it inserts or closes the popup.
+            event.ignore()
+
+            return
+
+        if key == QtCore.Qt.Key_Space and ctrl:
+            self.vex_completer.complete_at_cursor(min_prefix_length=0)
+
+            return
+
+        # Ctrl+Shift+[ and Ctrl+Shift+], "{" and "}" on some layouts.
+        if ctrl and shift:
+            if key in (QtCore.Qt.Key_BracketLeft, QtCore.Qt.Key_BraceLeft):
+                self.fold()
+
+                return
+
+            if key in (QtCore.Qt.Key_BracketRight, QtCore.Qt.Key_BraceRight):
+                self.unfold()
+
+                return
+
+        self._handle_key(event, key, ctrl, shift)
+
+        text = event.text()
+
+        if self.vex_completer.popup().isVisible() or (
+            self.auto_complete and text and (text.isalnum() or text in "_@")
+        ):
+            self.vex_completer.complete_at_cursor()
+
+        if self._is_signature_help_visible or text in ("(", ","):
+            self._update_signature_help()
+
+    def _handle_key(
+        self, event: QtGui.QKeyEvent, key: QtCore.Qt.Key, ctrl: bool, shift: bool
+    ) -> None:
 
         text_cursor = self.textCursor()
         block = text_cursor.block()
         current_line_text = block.text()
 
         if key == QtCore.Qt.Key_F1:
-            self._display_help(text_cursor)
+            self._display_help(text_cursor, open_help_browser=shift)
 
             return
 
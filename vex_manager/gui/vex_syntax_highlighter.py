@@ -5,33 +5,98 @@ except ImportError:
     from PySide2 import QtCore
     from PySide2 import QtGui
 
+from collections import OrderedDict
+from typing import Optional
 import logging
-import re
+import time
 
-from vex_manager.config import VEXSyntaxis
+import vex_manager.core.vex_lexer as vex_lexer
 
 
 logger = logging.getLogger(f"vex_manager.{__name__}")
 
+MULTI_LINE_COMMENT_STATE = vex_lexer.MULTI_LINE_COMMENT_STATE
+
+LARGE_DOCUMENT_BLOCK_COUNT = 5000
+VISIBLE_BLOCK_MARGIN = 20
+HIGHLIGHT_SLICE_TIME = 0.008
+
+TOKEN_CACHE_SIZE = 8192
+
+# Lexer token kinds to color scheme names, the rest use the plain color.
+TOKEN_KINDS = {
+    vex_lexer.COMMENT: "comments",
+    vex_lexer.MULTI_LINE_COMMENT: "multi_line_comment",
+    vex_lexer.STRING: "strings",
+    vex_lexer.NUMBER: "numbers",
+    vex_lexer.ATTRIBUTE: "references",
+    vex_lexer.KEYWORD: "keywords",
+    vex_lexer.TYPE: "types",
+    vex_lexer.FUNCTION: "functions",
+}
+
+
+def get_tokens(
+    text: str, previous_state: int
+) -> tuple[tuple[tuple[int, int, str], ...], int]:
+
+    lexer_tokens, state = vex_lexer.tokenize(text, previous_state)
+
+    tokens = [(0, len(text), "plain")]
+    tokens.extend(
+        (start, length, TOKEN_KINDS[kind])
+        for start, length, kind in lexer_tokens
+        if kind in TOKEN_KINDS
+    )
+
+    return tuple(tokens), state
+
+
+class VEXBlockData(QtGui.QTextBlockUserData):
+
+    def __init__(self, text_hash: int, entry_state: int, generation: int) -> None:
+        super().__init__()
+
+        self.text_hash = text_hash
+        self.entry_state = entry_state
+        self.generation = generation
+
+        # Kept by VEXBlockStructure.
+        self.brackets = None
+        self.bracket_depths = {}
+        self.bracket_entry_state = -1
+        self.folded_block_count = 0
+
 
 class VEXSyntaxHighlighter(QtGui.QSyntaxHighlighter):
 
     def __init__(self, parent: QtCore.QObject) -> None:
         super().__init__(parent)
 
-        keywords = "|".join(VEXSyntaxis.KEYWORDS)
-        data_types = "|".join(VEXSyntaxis.DATA_TYPES)
-        vex_functions = "|".join(VEXSyntaxis.VEX_FUNCTIONS)
+        self.text_document = self.document()
+
+        # Large documents are detached from QSyntaxHighlighter, which would
+        # highlight every block before showing any. The visible blocks are
+        # highlighted right away and the rest in idle time slices.
+        self._large_document = False
+        self._generation = 0
+        self._first_visible_block_number = 0
+        self._last_visible_block_number = 0
+        self._next_block_number = 0
 
-        self.numbers_reg_exp = re.compile(r"\b\d+(\.\d+)?\b")
-        self.functions_reg_exp = re.compile(rf"\b({vex_functions})\b")
-        self.keywords_reg_exp = re.compile(rf"\b({keywords})\b")
-        self.types_reg_exp = re.compile(rf"\b({data_types})\b")
-        self.references_reg_exp = re.compile(r"[\w]*@[\w-]+")
-        self.strings_reg_exp = re.compile(r'(["\'])((?:\\.|[^"\\])*)\1')
-        self.comments_reg_exp = re.compile(r"//.*")
-        self.comment_start_reg_exp = re.compile(r"/\*")
-        self.comment_end_reg_exp = re.compile(r"\*/")
+        self._highlight_timer = QtCore.QTimer(self)
+        self._highlight_timer.setInterval(0)
+        self._highlight_timer.timeout.connect(self._highlight_slice)
+
+        # Snippets repeat many lines, like braces and boilerplate. Tokens are
+        # cached by kind so they survive theme changes, the format ranges
+        # built from them only until the colors change.
+        self._token_cache = OrderedDict()
+        self._format_range_cache = OrderedDict()
+
+        # Kept to tell when a document opened in the background needs the
+        # colors set since.
+        self.color_scheme = {}
 
         self.plain_text_char_format = QtGui.QTextCharFormat()
         self.numbers_text_char_format = QtGui.QTextCharFormat()
@@ -43,9 +108,23 @@ class VEXSyntaxHighlighter(QtGui.QSyntaxHighlighter):
         self.comments_text_char_format = QtGui.QTextCharFormat()
         self.multi_line_comment_text_char_format = QtGui.QTextCharFormat()
 
+        self.text_char_formats = {
+            "plain": self.plain_text_char_format,
+            "numbers": self.numbers_text_char_format,
+            "functions": self.functions_text_char_format,
+            "keywords": self.keywords_text_char_format,
+            "types": self.types_text_char_format,
+            "references": self.references_text_char_format,
+            "strings": self.strings_text_char_format,
+            "comments": self.comments_text_char_format,
+            "multi_line_comment": self.multi_line_comment_text_char_format,
+        }
+
     def set_vex_systax_highlighter_colors(
         self, color_scheme: dict[str, tuple[float, float, float]]
     ) -> None:
+        self.color_scheme = color_scheme
+
         self.plain_text_char_format.setForeground(QtGui.QColor(*color_scheme["plain"]))
 
         self.numbers_text_char_format.setForeground(
@@ -78,84 +157,282 @@ class VEXSyntaxHighlighter(QtGui.QSyntaxHighlighter):
             QtGui.QColor(*color_scheme["comments"])
         )
 
-        self.rehighlight()
+        self._generation += 1
+        self._format_range_cache.clear()
+
+        if self._large_document:
+            self._schedule_highlight(0)
+        else:
+            self.rehighlight()
+
+    def is_large_document(self) -> bool:
+        return self._large_document
+
+    def is_highlighting(self) -> bool:
+        return self._highlight_timer.isActive()
+
+    def clear_token_cache(self) -> None:
+        self._token_cache.clear()
+        self._format_range_cache.clear()
+
+    def set_large_document(self, large_document: bool) -> None:
+        if large_document == self._large_document:
+            return
 
-    def _set_vex_syntax_highlighter(
-        self,
-        reg_exp: re.Pattern[str],
-        text: str,
-        text_char_format: QtGui.QTextCharFormat,
+        self._large_document = large_document
+
+        if large_document:
+            self.setDocument(None)
+            self.text_document.contentsChange.connect(self._contents_changed)
+
+            self._schedule_highlight(0)
+        else:
+            self._highlight_timer.stop()
+            self.text_document.contentsChange.disconnect(self._contents_changed)
+
+            self.setDocument(self.text_document)
+
+    def set_visible_blocks(
+        self, first_visible_block_number: int, last_visible_block_number: int
     ) -> None:
 
-        for match in reg_exp.finditer(text):
-            start = match.start()
-            length = match.end() - match.start()
-            self.setFormat(start, length, text_char_format)
+        if (first_visible_block_number, last_visible_block_number) == (
+            self._first_visible_block_number,
+            self._last_visible_block_number,
+        ):
+            return
 
-    def highlightBlock(self, text: str) -> None:
-        self.setFormat(0, len(text), self.plain_text_char_format)
+        self._first_visible_block_number = first_visible_block_number
+        self._last_visible_block_number = last_visible_block_number
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.numbers_reg_exp,
-            text=text,
-            text_char_format=self.numbers_text_char_format,
-        )
+        # Scrolled to blocks that may not be highlighted yet.
+        if self._large_document and not self._highlight_timer.isActive():
+            self._highlight_timer.start()
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.functions_reg_exp,
-            text=text,
-            text_char_format=self.functions_text_char_format,
+    def _is_visible(self, block_number: int) -> bool:
+        return (
+            self._first_visible_block_number - VISIBLE_BLOCK_MARGIN
+            <= block_number
+            <= self._last_visible_block_number + VISIBLE_BLOCK_MARGIN
         )
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.keywords_reg_exp,
-            text=text,
-            text_char_format=self.keywords_text_char_format,
+    def _get_visible_blocks(self) -> list[QtGui.QTextBlock]:
+        first_block_number = max(
+            0, self._first_visible_block_number - VISIBLE_BLOCK_MARGIN
         )
+        block = self.text_document.findBlockByNumber(first_block_number)
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.types_reg_exp,
-            text=text,
-            text_char_format=self.types_text_char_format,
-        )
+        blocks = []
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.references_reg_exp,
-            text=text,
-            text_char_format=self.references_text_char_format,
-        )
+        while block.isValid() and self._is_visible(block.blockNumber()):
+            blocks.append(block)
+            block = block.next()
+
+        return blocks
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.strings_reg_exp,
-            text=text,
-            text_char_format=self.strings_text_char_format,
+    def _needs_highlight(self, block: QtGui.QTextBlock) -> bool:
+        block_data = block.userData()
+
+        return (
+            not isinstance(block_data, VEXBlockData)
+            or block_data.generation != self._generation
+            or block_data.entry_state != block.previous().userState()
+            or block_data.text_hash != hash(block.text())
         )
 
-        self._set_vex_syntax_highlighter(
-            reg_exp=self.comments_reg_exp,
-            text=text,
-            text_char_format=self.comments_text_char_format,
+    def _get_tokens(
+        self, text: str, previous_state: int
+    ) -> tuple[tuple[tuple[int, int, str], ...], int]:
+
+        key = (text, previous_state)
+        tokens = self._token_cache.get(key)
+
+        if tokens:
+            self._token_cache.move_to_end(key)
+
+            return tokens
+
+        tokens = get_tokens(text, previous_state)
+        self._token_cache[key] = tokens
+
+        if len(self._token_cache) > TOKEN_CACHE_SIZE:
+            self._token_cache.popitem(last=False)
+
+        return tokens
+
+    def _schedule_highlight(self, block_number: int) -> None:
+        self._next_block_number = min(self._next_block_number, block_number)
+
+        if not self._highlight_timer.isActive():
+            self._highlight_timer.start()
+
+    def _get_block_data(
+        self, block: QtGui.QTextBlock, text: str, entry_state: int
+    ) -> Optional[VEXBlockData]:
+
+        block_data = block.userData()
+
+        if isinstance(block_data, VEXBlockData):
+            block_data.text_hash = hash(text)
+            block_data.entry_state = entry_state
+            block_data.generation = self._generation
+
+            return None
+
+        return VEXBlockData(hash(text), entry_state, self._generation)
+
+    def _get_format_ranges(
+        self, text: str, previous_state: int
+    ) -> tuple[list[QtGui.QTextLayout.FormatRange], int]:
+
+        key = (text, previous_state)
+        format_ranges = self._format_range_cache.get(key)
+
+        if format_ranges:
+            self._format_range_cache.move_to_end(key)
+
+            return format_ranges
+
+        tokens, state = self._get_tokens(text, previous_state)
+
+        ranges = []
+
+        for start, length, kind in tokens:
+            format_range = QtGui.QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = self.text_char_formats[kind]
+
+            ranges.append(format_range)
+
+        format_ranges = (ranges, state)
+        self._format_range_cache[key] = format_ranges
+
+        if len(self._format_range_cache) > TOKEN_CACHE_SIZE:
+            self._format_range_cache.popitem(last=False)
+
+        return format_ranges
+
+    def get_format_ranges(
+        self, text: str, previous_state: int
+    ) -> tuple[list[QtGui.QTextLayout.FormatRange], int]:
+
+        # For text shown without a document, like large files.
+        return self._get_format_ranges(text, previous_state)
+
+    def _highlight_detached_block(self, block: QtGui.QTextBlock) -> None:
+        text = block.text()
+        entry_state = block.previous().userState()
+
+        format_ranges, state = self._get_format_ranges(text, entry_state)
+
+        block.layout().setFormats(format_ranges)
+        block.setUserState(state)
+
+        block_data = self._get_block_data(block, text, entry_state)
+
+        if block_data:
+            block.setUserData(block_data)
+
+    def _mark_dirty(
+        self, first_block: QtGui.QTextBlock, last_block: QtGui.QTextBlock
+    ) -> None:
+
+        # Once per run of blocks, every call relayouts and repaints.
+        position = first_block.position()
+
+        self.text_document.markContentsDirty(
+            position, last_block.position() + last_block.length() - position
         )
 
-        self.setCurrentBlockState(0)
+    def _highlight_slice(self) -> None:
+        if not self._large_document:
+            self._highlight_timer.stop()
+
+            return
 
-        start_index = 0
+        end_time = time.perf_counter() + HIGHLIGHT_SLICE_TIME
+
+        highlighted_blocks = [
+            block
+            for block in self._get_visible_blocks()
+            if self._needs_highlight(block)
+        ]
+
+        for block in highlighted_blocks:
+            self._highlight_detached_block(block)
+
+        if highlighted_blocks:
+            self._mark_dirty(highlighted_blocks[0], highlighted_blocks[-1])
+
+        block = self.text_document.findBlockByNumber(self._next_block_number)
+        first_block = None
+        last_block = None
+
+        while block.isValid() and time.perf_counter() < end_time:
+            if self._needs_highlight(block):
+                self._highlight_detached_block(block)
+
+                first_block = first_block or block
+                last_block = block
+
+            block = block.next()
+
+        if first_block:
+            self._mark_dirty(first_block, last_block)
+
+        if block.isValid():
+            self._next_block_number = block.blockNumber()
+        else:
+            self._next_block_number = self.text_document.blockCount()
+            self._highlight_timer.stop()
+
+    def _contents_changed(
+        self, position: int, chars_removed: int, chars_added: int
+    ) -> None:
+
+        block = self.text_document.findBlock(position)
+
+        if not block.isValid():
+            return
+
+        last_block_number = self.text_document.findBlock(
+            position + chars_added
+        ).blockNumber()
+
+        self._schedule_highlight(block.blockNumber())
+
+        # Edits in view are highlighted while typing, and so are the blocks
+        # in view after them while the state they start with changes.
+        first_block = block
+        last_block = None
+
+        while block.isValid() and self._is_visible(block.blockNumber()):
+            state = block.userState()
+
+            self._highlight_detached_block(block)
+            last_block = block
+
+            if block.blockNumber() >= last_block_number and block.userState() == state:
+                break
+
+            block = block.next()
+
+        if last_block:
+            self._mark_dirty(first_block, last_block)
+
+    def highlightBlock(self, text: str) -> None:
+        entry_state = self.previousBlockState()
+        tokens, state = self._get_tokens(text, entry_state)
 
-        if self.previousBlockState() != 1:
-            start_index = text.find("/*")
+        text_char_formats = self.text_char_formats
 
-        while start_index >= 0:
-            match = self.comment_end_reg_exp.match(text, start_index)
-            end_index = match.capturedStart()
+        for start, length, kind in tokens:
+            self.setFormat(start, length, text_char_formats[kind])
 
-            if end_index == -1:
-                self.setCurrentBlockState(1)
-                comment_length = len(text) - start_index
-            else:
-                comment_length = end_index - start_index + match.capturedLength()
+        self.setCurrentBlockState(state)
 
-            self.setFormat(
-                start_index, comment_length, self.multi_line_comment_text_char_format
-            )
+        block_data = self._get_block_data(self.currentBlock(), text, entry_state)
 
-            start_index = text.find("/*", start_index + comment_length)
+        if block_data:
+            self.setCurrentBlockUserData(block_data)
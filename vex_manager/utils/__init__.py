@@ -1,2 +1,11 @@
 from vex_manager.utils.utils import is_valid_file_name
+from vex_manager.utils.utils import get_content_hash
+from vex_manager.utils.utils import get_houdini_user_path
 from vex_manager.utils.utils import get_preferences_path
+from vex_manager.utils.utils import get_library_index_path
+from vex_manager.utils.utils import get_signature_index_path
+from vex_manager.utils.utils import get_document_states_path
+from vex_manager.utils.utils import get_recovery_journals_path
+from vex_manager.utils.utils import get_node_types_path
+
+from vex_manager.utils.latency_metrics import LatencyMetrics
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Optional
+import logging
+import time
+
+
+logger = logging.getLogger(f"vex_manager.{__name__}")
+
+MAX_SAMPLES = 1000
+REPORT_INTERVAL = 200
+
+# 60 Hz, typing slower than a frame is noticeable.
+FRAME_TIME = 1.0 / 60.0
+
+
+class LatencyMetrics:
+
+    def __init__(self, name: str, max_samples: int = MAX_SAMPLES) -> None:
+        self.name = name
+
+        self._samples = deque(maxlen=max_samples)
+        self._count = 0
+        self._start_time = None
+
+    def start(self) -> None:
+        self._start_time = time.perf_counter()
+
+    def stop(self) -> Optional[float]:
+        if self._start_time is None:
+            return None
+
+        latency = time.perf_counter() - self._start_time
+        self._start_time = None
+
+        self.add_sample(latency)
+
+        return latency
+
+    def is_started(self) -> bool:
+        return self._start_time is not None
+
+    def add_sample(self, latency: float) -> None:
+        self._samples.append(latency)
+        self._count += 1
+
+        if latency > FRAME_TIME:
+            logger.debug(f"{self.name} took {latency * 1000:.1f} ms.")
+
+        if not self._count % REPORT_INTERVAL:
+            logger.debug(self.get_report())
+
+    def get_summary(self) -> dict[str, float]:
+        if not self._samples:
+            return {}
+
+        samples = sorted(self._samples)
+
+        def get_percentile(percentile: float) -> float:
+            return samples[min(len(samples) - 1, int(len(samples) * percentile))]
+
+        return {
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p50": get_percentile(0.5),
+            "p95": get_percentile(0.95),
+            "p99": get_percentile(0.99),
+            "max": samples[-1],
+            "over_frame": sum(sample > FRAME_TIME for sample in samples),
+        }
+
+    def get_report(self) -> str:
+        summary = self.get_summary()
+
+        if not summary:
+            return f"{self.name}: no samples."
+
+        return (
+            f"{self.name}: {summary['count']} samples, "
+            f"mean {summary['mean'] * 1000:.2f} ms, "
+            f"p50 {summary['p50'] * 1000:.2f} ms, "
+            f"p95 {summary['p95'] * 1000:.2f} ms, "
+            f"p99 {summary['p99'] * 1000:.2f} ms, "
+            f"max {summary['max'] * 1000:.2f} ms, "
+            f"{summary['over_frame']} over a frame."
+        )
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._count = 0
+        self._start_time = None
@@ -1,5 +1,4 @@
-import hou
-
+import hashlib
 import os
 import re
 
@@ -11,12 +10,65 @@ def is_valid_file_name(file_name: str) -> bool:
     return bool(match)
 
 
-def get_preferences_path() -> str:
+def get_content_hash(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
+def get_houdini_user_path() -> str:
+    # Imported here, vex_manager.core is also used outside of Houdini.
+    import hou
+
     home_path = os.path.expandvars("$HOME")
     houdini_version = hou.applicationVersionString()
     major, minor, patch = houdini_version.split(".")
     houdini_folder_path = os.path.join(home_path, f"houdini{major}.{minor}")
 
+    return houdini_folder_path
+
+
+def get_preferences_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
     preferences_path = os.path.join(houdini_folder_path, "vexmanagerpreferences.json")
 
     return preferences_path
+
+
+def get_library_index_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
+    library_index_path = os.path.join(houdini_folder_path, "vexmanagerlibrary.db")
+
+    return library_index_path
+
+
+def get_signature_index_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
+    signature_index_path = os.path.join(houdini_folder_path, "vexmanagersignatures.idx")
+
+    return signature_index_path
+
+
+def get_document_states_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
+    document_states_path = os.path.join(houdini_folder_path, "vexmanagerdocuments")
+
+    return document_states_path
+
+
+def get_recovery_journals_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
+    recovery_journals_path = os.path.join(houdini_folder_path, "vexmanagerrecovery")
+
+    return recovery_journals_path
+
+
+def get_node_types_path() -> str:
+    houdini_folder_path = get_houdini_user_path()
+
+    node_types_path = os.path.join(houdini_folder_path, "vexmanagernodetypes.json")
+
+    return node_types_path